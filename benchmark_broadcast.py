@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Broadcast throughput benchmark against a local fake Bot API server.
+No real Telegram calls - the fake server answers sendMessage after a fixed delay.
+
+Usage: python benchmark_broadcast.py [--chats 150] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from aiohttp import web
+
+FAKE_TOKEN = "123456:FAKE"
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Broadcast engine benchmark')
+    parser.add_argument('--chats', type=int, default=150, help='Subscriber chats per run')
+    parser.add_argument('--latency', type=float, default=0.05, help='Fake Bot API latency (seconds)')
+    parser.add_argument('--port', type=int, default=8765)
+    return parser.parse_args()
+
+async def start_fake_bot_api(port, latency, stats):
+    async def send_message(request):
+        data = await request.post() if request.content_type != 'application/json' else await request.json()
+        stats['requests'] += 1
+        await asyncio.sleep(latency)
+        return web.json_response({
+            "ok": True,
+            "result": {
+                "message_id": stats['requests'],
+                "date": int(time.time()),
+                "chat": {"id": int(data['chat_id']), "type": "group", "title": "bench"},
+                "text": data['text'],
+            }
+        })
+
+    app = web.Application()
+    app.router.add_post(f'/bot{FAKE_TOKEN}/sendMessage', send_message)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+async def run_benchmark(args):
+    from src import bot
+    from src.broadcast import BroadcastEngine
+
+    stats = {'requests': 0}
+    runner = await start_fake_bot_api(args.port, args.latency, stats)
+    chat_ids = [str(-1000000 - i) for i in range(args.chats)]
+
+    async def send(text, chat_id, parse_mode, label):
+        return await bot.send_to_chat(text, chat_id, parse_mode, timeout=30, label=label)
+
+    print(f"🧪 Broadcast benchmark: {args.chats} chats, fake Bot API latency {args.latency * 1000:.0f}ms")
+    print("=" * 60)
+
+    # Baseline: the old strictly sequential loop
+    start = time.monotonic()
+    for chat_id in chat_ids:
+        await bot.send_to_chat("sequential run", chat_id, label=f"chat {chat_id}")
+    elapsed = time.monotonic() - start
+    print(f"  sequential loop          {elapsed:6.2f}s  {args.chats / elapsed:7.1f} msg/s")
+
+    for workers, rate in [(4, 0), (16, 0), (64, 0), (16, 25)]:
+        engine = BroadcastEngine(send, workers=workers, global_rate=rate, per_chat_interval=0)
+        text = f"engine run {workers}/{rate}"
+        start = time.monotonic()
+        results = await engine.broadcast({'he': chat_ids}, {'he': text})
+        elapsed = time.monotonic() - start
+        sent = sum(1 for success in results['he'].values() if success)
+        rate_label = f"rate {rate:.0f}/s" if rate else "no rate cap"
+        print(f"  engine {workers:3d} workers, {rate_label:12s} {elapsed:6.2f}s  {sent / elapsed:7.1f} msg/s ({sent}/{args.chats} sent)")
+        for task in engine.worker_tasks:
+            task.cancel()
+
+    print("=" * 60)
+    print(f"📊 Fake Bot API handled {stats['requests']} requests")
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    os.environ["TELEGRAM_BOT_TOKEN"] = FAKE_TOKEN
+    os.environ["TELEGRAM_API_BASE_URL"] = f"http://127.0.0.1:{args.port}/bot"
+    os.environ["DELIVERY_LEDGER_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_ledger.db")
+    os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+    asyncio.run(run_benchmark(args))
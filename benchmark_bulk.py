@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Load test of news ingestion: single-item POST /webhook/news vs POST /webhook/bulk.
+Runs the real webhook server against a local fake Bot API and a fake LLM that
+blocks for a fixed time per call (like the real synchronous OpenRouter client).
+
+Usage: python benchmark_bulk.py [--items 64] [--llm-latency 0.2] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+
+from aiohttp import ClientSession, web
+
+FAKE_TOKEN = "123456:FAKE"
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Bulk webhook load test')
+    parser.add_argument('--items', type=int, default=64, help='News items per run')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='Fake LLM call latency (seconds)')
+    parser.add_argument('--bot-latency', type=float, default=0.02, help='Fake Bot API latency (seconds)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel single-item posters')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--bot-port', type=int, default=8767)
+    return parser.parse_args()
+
+async def start_fake_bot_api(port, latency, stats):
+    async def send_message(request):
+        data = await request.post() if request.content_type != 'application/json' else await request.json()
+        stats['sends'] += 1
+        await asyncio.sleep(latency)
+        return web.json_response({
+            "ok": True,
+            "result": {
+                "message_id": stats['sends'],
+                "date": int(time.time()),
+                "chat": {"id": int(data['chat_id']), "type": "group", "title": "bench"},
+                "text": data['text'],
+            }
+        })
+
+    app = web.Application()
+    app.router.add_post(f'/bot{FAKE_TOKEN}/sendMessage', send_message)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+def make_fake_completion(latency, stats):
+    def fake_completion(prompt, model_list_name="default", response_format=None):
+        stats['llm_calls'] += 1
+        time.sleep(latency)  # Blocks like the real synchronous client (called from worker threads)
+        # Echo the input back so every message is unique and nothing is deduplicated
+        schema = response_format["json_schema"]
+        if schema["name"] == "news_summary":
+            return json.dumps({"summary": re.search(r'<NEWS>\n(.*)\n</NEWS>', prompt, re.DOTALL).group(1)})
+        if schema["name"] == "translation":
+            return json.dumps({"translation": re.search(r'<TEXT>\n(.*)\n</TEXT>', prompt, re.DOTALL).group(1) + " (translated)"})
+        if schema["name"] == "multi_translation":
+            text = re.search(r'<TEXT>\n(.*)\n</TEXT>', prompt, re.DOTALL).group(1)
+            return json.dumps({code: f"{text} ({code})" for code in schema["schema"]["properties"]})
+        codes = schema["schema"]["properties"]["items"]["items"]["required"]
+        texts = re.findall(r'^\[\d+\]\n(.*)$', prompt, re.MULTILINE)
+        return json.dumps({"items": [{code: f"{text} ({code})" for code in codes} for text in texts]})
+    return fake_completion
+
+async def run_single(session, url, texts, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(i, text):
+        async with semaphore:
+            async with session.post(f"{url}/webhook/news?sync=1", json={"text": text, "message_id": f"single_{i}"}) as response:
+                return (await response.json()).get("success", False)
+
+    results = await asyncio.gather(*[post(i, text) for i, text in enumerate(texts)])
+    return sum(1 for success in results if success)
+
+async def run_bulk(session, url, texts):
+    body = "\n".join(json.dumps({"type": "news", "text": text, "message_id": f"bulk_{i}"}) for i, text in enumerate(texts))
+    sent = 0
+    async with session.post(f"{url}/webhook/bulk", data=body, headers={"Content-Type": "application/x-ndjson"}) as response:
+        async for line in response.content:
+            result = json.loads(line)
+            if result.get("status") == "sent":
+                sent += 1
+    return sent
+
+async def run_benchmark(args):
+    from src import bot, llm_handler
+
+    stats = {'sends': 0, 'llm_calls': 0}
+    # Every LLM call (Telethon news path and multi-language translation) goes through llm_handler.get_completion
+    llm_handler.get_completion = make_fake_completion(args.llm_latency, stats)
+    bot_runner = await start_fake_bot_api(args.bot_port, args.bot_latency, stats)
+    server_runner = await bot.start_webhook_server()
+    url = f"http://127.0.0.1:{args.port}"
+
+    print(f"🧪 Bulk load test: {args.items} news items, LLM {args.llm_latency * 1000:.0f}ms/call, "
+          f"Bot API {args.bot_latency * 1000:.0f}ms")
+    print("=" * 60)
+    async with ClientSession() as session:
+        for name, runner in [
+            (f"single POST x{args.concurrency}", lambda texts: run_single(session, url, texts, args.concurrency)),
+            ("bulk NDJSON", lambda texts: run_bulk(session, url, texts)),
+        ]:
+            texts = [f"{name} news item {i}" for i in range(args.items)]
+            stats['llm_calls'] = stats['sends'] = 0
+            start = time.monotonic()
+            sent = await runner(texts)
+            elapsed = time.monotonic() - start
+            print(f"  {name:20s} {elapsed:6.2f}s  {sent / elapsed:7.1f} items/s  "
+                  f"({sent}/{args.items} sent, {stats['llm_calls']} LLM calls, {stats['sends']} sends)")
+    print("=" * 60)
+
+    await server_runner.cleanup()
+    await bot_runner.cleanup()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    os.environ["PORT"] = str(args.port)
+    os.environ["TELEGRAM_BOT_TOKEN"] = FAKE_TOKEN
+    os.environ["TELEGRAM_API_BASE_URL"] = f"http://127.0.0.1:{args.bot_port}/bot"
+    os.environ["TELEGRAM_CHAT_ID_HEBREW"] = "-1001"
+    os.environ["TELEGRAM_CHAT_ID_ENGLISH"] = "-1002"
+    os.environ["TELEGRAM_CHAT_ID_SPANISH"] = "-1003"
+    os.environ["DELIVERY_LEDGER_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_ledger.db")
+    os.environ["SUBSCRIBERS_FILE"] = os.path.join(tempfile.mkdtemp(), "bench_subscribers.json")
+    # Never the real API, even if a call slipped past the fake
+    os.environ["OPENROUTER_API_KEY"] = "benchmark"
+    os.environ["OPENROUTER_BASE_URL"] = "http://127.0.0.1:9/api/v1"
+    asyncio.run(run_benchmark(args))
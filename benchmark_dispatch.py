@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark of per-update handler overhead with many registered source channels.
+Uses synthetic Telethon updates - no network, no Telegram account needed.
+
+Compares one events.NewMessage(chats=...) handler per channel (the old setup,
+where Telethon runs every handler's filter for every update) against the
+single raw handler that dispatches through the channel registry dict.
+
+Usage: python benchmark_dispatch.py [--channels 100] [--updates 20000]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from telethon import events, types
+from telethon.utils import get_peer_id
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Channel dispatch benchmark')
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--updates', type=int, default=20000)
+    return parser.parse_args()
+
+def make_updates(channel_ids, count):
+    now = datetime.now(timezone.utc)
+    updates = []
+    for i in range(count):
+        # Every 4th update comes from a channel we don't monitor
+        channel_id = channel_ids[i % len(channel_ids)] if i % 4 else 999999999
+        message = types.Message(
+            id=i + 1, peer_id=types.PeerChannel(channel_id), date=now, message=f"synthetic update {i}"
+        )
+        updates.append(types.UpdateNewChannelMessage(message=message, pts=i, pts_count=1))
+    return updates
+
+async def dispatch(builders, update):
+    """Mirrors the builder loop in Telethon's _dispatch_update."""
+    built = {}
+    for builder, callback in builders:
+        builder_type = type(builder)
+        if builder_type not in built:
+            built[builder_type] = builder_type.build(update)
+        event = built[builder_type]
+        if not event:
+            continue
+        if not builder.filter(event):
+            continue
+        await callback(event)
+
+async def run_benchmark(args):
+    from src import bot
+    from src.channels import register_channel, dispatch_table, registered_channels
+
+    channel_ids = [1000000 + i for i in range(args.channels)]
+    registered_channels.clear()
+    dispatch_table.clear()
+    for i, channel_id in enumerate(channel_ids):
+        channel = register_channel(f"bench_channel_{i}", 'alert' if i % 10 == 0 else 'news', 'en')
+        dispatch_table[get_peer_id(types.PeerChannel(channel_id))] = channel
+
+    handled = {'count': 0}
+
+    async def count_handled(*_args, **_kwargs):
+        handled['count'] += 1
+
+    bot.enqueue_channel_message = count_handled
+
+    # Old setup: one filtered NewMessage handler per channel
+    per_channel_builders = []
+    for channel_id in channel_ids:
+        builder = events.NewMessage(chats=channel_id)
+        builder.chats = {get_peer_id(types.PeerChannel(channel_id))}
+        builder.resolved = True
+        per_channel_builders.append((builder, count_handled))
+
+    # New setup: a single raw handler
+    raw_builder = events.Raw(types=[types.UpdateNewChannelMessage, types.UpdateNewMessage])
+    raw_builder.resolved = True
+    raw_builders = [(raw_builder, bot.dispatch_channel_update)]
+
+    print(f"🧪 Dispatch benchmark: {args.channels} channels, {args.updates} synthetic updates")
+    print("=" * 60)
+    for name, builders in [("per-channel NewMessage handlers", per_channel_builders), ("single raw handler + dict", raw_builders)]:
+        updates = make_updates(channel_ids, args.updates)
+        handled['count'] = 0
+        start = time.perf_counter()
+        for update in updates:
+            await dispatch(builders, update)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:34s} {elapsed * 1e6 / args.updates:8.2f} µs/update ({handled['count']} handled)")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(parse_arguments()))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Translation latency and LLM calls vs number of output languages.
+
+Runs the real translate_text_to_languages against a fake LLM that blocks like
+the synchronous OpenRouter client. A call costs a fixed latency plus a share
+per language it writes, since output tokens dominate generation time. Compared
+for each language count:
+    per-language   one call per language, all in parallel (the default)
+    chunked        --per-call languages per call, chunks in parallel (TRANSLATION_LANGUAGES_PER_CALL)
+    single call    every language in one call
+
+Usage: python benchmark_languages.py [--max-languages 8] [--per-call 3] [--llm-latency 0.5] [--per-language 0.3]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+
+EXTRA_CODES = ['de', 'it', 'pt', 'ja', 'zh']  # Beyond the registry, to see the trend
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Translation latency vs language count')
+    parser.add_argument('--max-languages', type=int, default=8, help='Largest number of target languages')
+    parser.add_argument('--per-call', type=int, default=3, help='Languages per call in chunked mode')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Fixed fake LLM latency per call (seconds)')
+    parser.add_argument('--per-language', type=float, default=0.3, help='Extra latency per language written (seconds)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per configuration (median reported)')
+    return parser.parse_args()
+
+def make_fake_completion(args, stats):
+    def fake_completion(prompt, model_list_name="default", response_format=None):
+        schema = response_format["json_schema"]
+        text = re.search(r'<TEXT>\n(.*)\n</TEXT>', prompt, re.DOTALL).group(1)
+        if schema["name"] == "translation":
+            languages = ["translation"]
+        else:
+            languages = list(schema["schema"]["properties"])
+        stats['llm_calls'] += 1
+        time.sleep(args.llm_latency + args.per_language * len(languages))  # The real client blocks too
+        return json.dumps({key: f"{text} ({key})" for key in languages})
+    return fake_completion
+
+async def measure(translate, text, targets, per_call, stats, runs):
+    timings = []
+    for _ in range(runs):
+        stats['llm_calls'] = 0
+        start = time.monotonic()
+        translations = await translate(text, 'he', targets, languages_per_call=per_call)
+        timings.append(time.monotonic() - start)
+        assert set(translations) == set(targets), f"missing {set(targets) - set(translations)}"
+    return sorted(timings)[len(timings) // 2], stats['llm_calls']
+
+async def run_benchmark(args):
+    from src import llm_handler
+    from src.languages import LANGUAGES
+
+    stats = {'llm_calls': 0}
+    llm_handler.get_completion = make_fake_completion(args, stats)
+    codes = [code for code in LANGUAGES if code != 'he'] + EXTRA_CODES
+
+    print(f"🧪 Translation benchmark: LLM {args.llm_latency * 1000:.0f}ms/call + "
+          f"{args.per_language * 1000:.0f}ms per language written, {args.per_call} languages per chunk")
+    print("=" * 72)
+    print(f"  {'languages':>9s}  {'per-language':>18s}  {'chunked':>18s}  {'single call':>18s}")
+    for count in range(1, min(args.max_languages, len(codes)) + 1):
+        targets = codes[:count]
+        row = []
+        for per_call in (1, args.per_call, count):
+            elapsed, calls = await measure(
+                llm_handler.translate_text_to_languages, "Test news summary", targets, per_call, stats, args.runs
+            )
+            row.append(f"{elapsed:6.2f}s {calls:2d} calls")
+        print(f"  {count:9d}  {row[0]:>18s}  {row[1]:>18s}  {row[2]:>18s}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+    asyncio.run(run_benchmark(args))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Throughput of multi-process mode vs processing worker count.
+
+Starts a fake OpenAI-compatible LLM server and a fake Bot API in this process,
+then for each worker count runs a fresh bot (webhook ingest + N processing
+workers + 1 delivery process; 0 = single process) in a child process and
+pushes news through POST /webhook/news?sync=1. The real OpenAI client blocks
+its event loop for every call, so one process handles one call at a time.
+
+Usage: python benchmark_multiprocess.py [--workers 0,1,2,4] [--items 48] [--llm-latency 0.1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from aiohttp import ClientSession, web
+
+FAKE_TOKEN = "123456:FAKE"
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Multi-process mode throughput benchmark')
+    parser.add_argument('--workers', default='0,1,2,4', help='Comma-separated worker counts (0 = single process)')
+    parser.add_argument('--items', type=int, default=48, help='News items per run')
+    parser.add_argument('--llm-latency', type=float, default=0.1, help='Fake LLM call latency (seconds)')
+    parser.add_argument('--bot-latency', type=float, default=0.02, help='Fake Bot API latency (seconds)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Parallel posters')
+    parser.add_argument('--port', type=int, default=8768)
+    parser.add_argument('--llm-port', type=int, default=8769)
+    parser.add_argument('--bot-port', type=int, default=8770)
+    parser.add_argument('--run', type=int, default=None, help=argparse.SUPPRESS)  # Child mode: one worker count
+    return parser.parse_args()
+
+# --- Fake servers (parent process) ---
+
+def fake_llm_content(prompt, schema_name):
+    # Echo the input back so every message is unique and nothing is deduplicated
+    if schema_name == "news_summary":
+        return json.dumps({"summary": re.search(r'<NEWS>\n(.*)\n</NEWS>', prompt, re.DOTALL).group(1)})
+    if schema_name == "translation":
+        return json.dumps({"translation": re.search(r'<TEXT>\n(.*)\n</TEXT>', prompt, re.DOTALL).group(1) + " (translated)"})
+    return json.dumps({})
+
+async def start_fake_servers(args, stats):
+    async def chat_completions(request):
+        body = await request.json()
+        stats['llm_calls'] += 1
+        await asyncio.sleep(args.llm_latency)
+        schema_name = (body.get("response_format") or {}).get("json_schema", {}).get("name", "text")
+        return web.json_response({
+            "id": f"fake-{stats['llm_calls']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": fake_llm_content(body["messages"][0]["content"], schema_name)},
+            }],
+        })
+
+    async def send_message(request):
+        data = await request.post() if request.content_type != 'application/json' else await request.json()
+        stats['sends'] += 1
+        await asyncio.sleep(args.bot_latency)
+        return web.json_response({
+            "ok": True,
+            "result": {
+                "message_id": stats['sends'],
+                "date": int(time.time()),
+                "chat": {"id": int(data['chat_id']), "type": "group", "title": "bench"},
+                "text": data['text'],
+            }
+        })
+
+    runners = []
+    for port, routes in [
+        (args.llm_port, [('/v1/chat/completions', chat_completions)]),
+        (args.bot_port, [(f'/bot{FAKE_TOKEN}/sendMessage', send_message)]),
+    ]:
+        app = web.Application()
+        for path, handler in routes:
+            app.router.add_post(path, handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        runners.append(runner)
+    return runners
+
+async def run_parent(args):
+    stats = {'llm_calls': 0, 'sends': 0}
+    runners = await start_fake_servers(args, stats)
+    print(f"🧪 Multi-process benchmark: {args.items} news items, LLM {args.llm_latency * 1000:.0f}ms/call, "
+          f"Bot API {args.bot_latency * 1000:.0f}ms")
+    print("=" * 60)
+    baseline = None
+    for workers in [int(count) for count in args.workers.split(',')]:
+        stats['llm_calls'] = stats['sends'] = 0
+        child = await asyncio.create_subprocess_exec(
+            sys.executable, __file__, '--run', str(workers), '--items', str(args.items),
+            '--concurrency', str(args.concurrency), '--port', str(args.port),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=child_environment(args)
+        )
+        result = None
+        async for line in child.stdout:
+            if line.startswith(b'RESULT '):
+                result = json.loads(line[7:])
+        await child.wait()
+        if not result or not result['sent']:
+            print(f"  {workers} workers: run failed")
+            continue
+        rate = result['sent'] / result['elapsed']
+        baseline = baseline or rate
+        label = "single process" if workers == 0 else f"{workers} workers"
+        print(f"  {label:16s} {result['elapsed']:6.2f}s  {rate:6.1f} items/s  x{rate / baseline:.1f}  "
+              f"({result['sent']}/{args.items} sent, {stats['llm_calls']} LLM calls, {stats['sends']} sends)")
+    print("=" * 60)
+    for runner in runners:
+        await runner.cleanup()
+
+def child_environment(args):
+    env = dict(os.environ)
+    run_dir = tempfile.mkdtemp()
+    env.update({
+        "PORT": str(args.port),
+        "OPENROUTER_API_KEY": "benchmark",
+        "OPENROUTER_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+        "YOUR_SITE_URL": "http://localhost",
+        "YOUR_SITE_NAME": "benchmark",
+        "TELEGRAM_BOT_TOKEN": FAKE_TOKEN,
+        "TELEGRAM_API_BASE_URL": f"http://127.0.0.1:{args.bot_port}/bot",
+        "TELEGRAM_CHAT_ID_HEBREW": "-1001",
+        "TELEGRAM_CHAT_ID_ENGLISH": "-1002",
+        "TELEGRAM_CHAT_ID_SPANISH": "-1003",
+        "DELIVERY_LEDGER_PATH": os.path.join(run_dir, "ledger.db"),
+        "TASK_QUEUE_PATH": os.path.join(run_dir, "tasks.db"),
+        "SUBSCRIBERS_FILE": os.path.join(run_dir, "subscribers.json"),
+    })
+    return env
+
+# --- One bot under load (child process) ---
+
+async def run_child(args):
+    from src import bot
+    from src.multiprocess import start_role_processes, stop_role_processes
+    from src.work_queue import start_workers
+
+    workers = args.run
+    if workers:
+        start_role_processes(workers)
+        start_workers(scale=workers)
+    server_runner = await bot.start_webhook_server()
+    url = f"http://127.0.0.1:{args.port}"
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def post(session, i):
+        async with semaphore:
+            async with session.post(f"{url}/webhook/news?sync=1", json={
+                "text": f"run {workers} news item {i}", "message_id": f"item_{i}", "source_lang": "en"
+            }) as response:
+                return (await response.json()).get("success", False)
+
+    async with ClientSession() as session:
+        if workers:
+            # Let the child processes start up before the clock runs
+            await post(session, "warmup")
+        start = time.monotonic()
+        results = await asyncio.gather(*[post(session, i) for i in range(args.items)])
+        elapsed = time.monotonic() - start
+    print("RESULT " + json.dumps({"sent": sum(1 for success in results if success), "elapsed": elapsed}), flush=True)
+
+    await server_runner.cleanup()
+    stop_role_processes()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if args.run is not None:
+        asyncio.run(run_child(args))
+    else:
+        asyncio.run(run_parent(args))
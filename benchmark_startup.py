@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Cold start: module import time and time to the first handled event.
+
+Import time comes from `python -X importtime` in a fresh interpreter for each
+entry point (the bot and the helper scripts' imports). Time to first event
+starts the real bot (main.py) against the fake LLM server and Bot API of
+benchmark_multiprocess.py and posts to /webhook/news?sync=1 until a news item
+is handled end to end.
+
+Usage: python benchmark_startup.py [--runs 3] [--top 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from aiohttp import ClientSession, ClientError
+
+from benchmark_multiprocess import start_fake_servers, child_environment
+
+ENTRY_POINTS = {
+    "bot (src.main)": "import src.main",
+    "test_rss_feeds.py": "import src.news_fetcher, src.config, src.llm_handler",
+    "debug_config.py": "import src.config",
+}
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Cold start benchmark')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters per measurement')
+    parser.add_argument('--top', type=int, default=8, help='Heaviest top-level imports to list')
+    parser.add_argument('--timeout', type=float, default=60, help='Give up on the first event after this many seconds')
+    parser.add_argument('--llm-latency', type=float, default=0.1, help='Fake LLM call latency (seconds)')
+    parser.add_argument('--bot-latency', type=float, default=0.02, help='Fake Bot API latency (seconds)')
+    parser.add_argument('--port', type=int, default=8771)
+    parser.add_argument('--llm-port', type=int, default=8772)
+    parser.add_argument('--bot-port', type=int, default=8773)
+    return parser.parse_args()
+
+def bot_environment(args):
+    env = child_environment(args)
+    run_dir = os.path.dirname(env["TASK_QUEUE_PATH"])
+    env.update({
+        "JOURNAL_PATH": os.path.join(run_dir, "rss_journal.jsonl"),
+        "CHANNEL_STATE_PATH": os.path.join(run_dir, "channel_state.json"),
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+# --- Import time ---
+
+def measure_imports(statement, env):
+    """Total import microseconds, and self time per top-level package, for one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            continue  # Header line
+        if not name.startswith("  "):
+            total += int(cumulative)  # Nested imports are already in their parent's cumulative time
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+    return total, packages
+
+def report_imports(args, env):
+    print("📦 Import time (-X importtime, median of fresh interpreters)")
+    for label, statement in ENTRY_POINTS.items():
+        runs = [measure_imports(statement, env) for _ in range(args.runs)]
+        print(f"  {label:20s} {statistics.median(total for total, _ in runs) / 1000:8.1f} ms")
+        if label.startswith("bot"):
+            heaviest = sorted(runs[-1][1].items(), key=lambda item: item[1], reverse=True)[:args.top]
+            for package, micros in heaviest:
+                print(f"      {package:30s} {micros / 1000:8.1f} ms")
+
+# --- Time to first handled event ---
+
+async def first_event_once(args, env):
+    url = f"http://127.0.0.1:{args.port}/webhook/news?sync=1"
+    start = time.monotonic()
+    bot = await asyncio.create_subprocess_exec(
+        sys.executable, "main.py", stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    listening = {}
+
+    async def read_output():
+        async for line in bot.stdout:
+            text = line.decode(errors="replace")
+            if "listening" in text and "after start" in text:
+                listening[text.split("⏱️")[-1].split(" listening")[0].strip()] = time.monotonic() - start
+
+    reader = asyncio.create_task(read_output())
+    first_event = None
+    try:
+        async with ClientSession() as session:
+            while time.monotonic() - start < args.timeout:
+                try:
+                    async with session.post(url, json={
+                        "text": f"startup news {start}", "message_id": f"startup_{start}", "source_lang": "en"
+                    }) as response:
+                        if (await response.json()).get("success"):
+                            first_event = time.monotonic() - start
+                            break
+                except (ClientError, ValueError):
+                    pass  # Not listening yet
+                await asyncio.sleep(0.01)
+    finally:
+        bot.terminate()
+        await bot.wait()
+        reader.cancel()
+    return first_event, listening
+
+async def report_first_event(args, env):
+    runners = await start_fake_servers(args, {'llm_calls': 0, 'sends': 0})
+    print(f"⏱️  Time to first handled event (main.py, LLM {args.llm_latency * 1000:.0f}ms/call, "
+          f"Bot API {args.bot_latency * 1000:.0f}ms)")
+    try:
+        for run in range(1, args.runs + 1):
+            first_event, listening = await first_event_once(args, env)
+            if first_event is None:
+                print(f"  run {run}: no event handled within {args.timeout:.0f}s")
+                continue
+            webhook = listening.get("Webhook server")
+            print(f"  run {run}: webhook listening {webhook or float('nan'):.2f}s, "
+                  f"first news item handled {first_event:.2f}s after spawn")
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    env = bot_environment(args)
+    print("🧪 Startup benchmark")
+    print("=" * 60)
+    report_imports(args, env)
+    print()
+    asyncio.run(report_first_event(args, env))
+    print("=" * 60)
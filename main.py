@@ -10,6 +10,8 @@ def parse_arguments():
                        help='Run in development/test mode (show translations in console without sending to Telegram)')
     parser.add_argument('--debug', action='store_true',
                        help='Enable debug mode with verbose logging')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Run LLM work in N worker processes plus a delivery process (default: PROCESS_WORKERS, 0 = single process)')
     return parser.parse_args()
 
 if __name__ == "__main__":
@@ -26,4 +28,4 @@ if __name__ == "__main__":
         print("-" * 60)
     
     # Run the main function with dev mode flag
-    asyncio.run(main(dev_mode=args.dev, debug_mode=args.debug))
\ No newline at end of file
+    asyncio.run(main(dev_mode=args.dev, debug_mode=args.debug, workers=args.workers))
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Delta translation of alerts against a short history of recent alerts.
+
+An alert is split into segments: plain lines, area names and individual towns
+(the date/time in the header is kept verbatim). Segments already translated
+in a recent alert are reused, only the new ones go to the LLM, and the final
+message is reassembled line by line.
+
+The segment path is only taken when at least one segment is already known.
+Other alerts, including the first one, get the full curated alert prompt, and
+that translation is aligned line by line with the original to fill the history.
+"""
+import time
+from collections import deque
+
+from src.alert_merge import AREA_PREFIX, DATE_TIME_PATTERN
+from src.config import ALERT_HISTORY_SIZE
+
+history = {}  # lang -> deque of {segment: translation} for recent alerts
+delta_stats = {
+    "alerts": 0,
+    "segments_total": 0,
+    "segments_reused": 0,
+    "llm_calls_skipped": 0,
+    "latency_saved": 0.0,
+    "full_latency_avg": 0.0,  # Moving average of alerts translated with no reuse
+}
+
+def split_segments(text):
+    """
+    Returns (layout, segments). layout has one entry per line: None for a blank
+    line, else (joiner, parts) where a part is a segment index or a literal string.
+    """
+    layout = []
+    segments = []
+    in_area = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            layout.append(None)
+            in_area = False
+            continue
+
+        if stripped.startswith(AREA_PREFIX):
+            in_area = True
+            pieces, joiner = [stripped], ' '
+        elif in_area:
+            pieces, joiner = [town.strip() for town in stripped.split(',') if town.strip()], ', '
+        else:
+            pieces, joiner = [stripped], ' '
+
+        parts = []
+        for piece in pieces:
+            match = DATE_TIME_PATTERN.search(piece)
+            if match:
+                before = piece[:match.start()].strip()
+                if before:
+                    parts.append(len(segments))
+                    segments.append(before)
+                parts.append(piece[match.start():])  # Date/time stays as-is
+            else:
+                parts.append(len(segments))
+                segments.append(piece)
+        layout.append((joiner, parts))
+    return layout, segments
+
+def assemble(layout, segments, translations):
+    lines = []
+    for entry in layout:
+        if entry is None:
+            lines.append('')
+            continue
+        joiner, parts = entry
+        lines.append(joiner.join(
+            translations[segments[part]] if isinstance(part, int) else part for part in parts
+        ))
+    return '\n'.join(lines)
+
+def lookup_segment(lang, segment):
+    for translations in reversed(history.get(lang, ())):
+        if segment in translations:
+            return translations[segment]
+    return None
+
+def has_known_segments(alert_text, target_lang):
+    """True if a recent alert already translated at least one segment of this one."""
+    if not history.get(target_lang):
+        return False
+    _, segments = split_segments(alert_text)
+    return any(lookup_segment(target_lang, segment) is not None for segment in segments)
+
+def _align_line(entry, segments, line):
+    """{segment: translation} for one line of a full translation, or {} if it doesn't line up."""
+    joiner, parts = entry
+    text = line.strip()
+    for literal in (part for part in parts if not isinstance(part, int)):
+        if literal not in text:
+            return {}
+        text = text.replace(literal, '').strip()
+    indexes = [part for part in parts if isinstance(part, int)]
+    pieces = [piece.strip() for piece in text.split(',')] if len(indexes) > 1 else [text]
+    if len(pieces) != len(indexes) or not all(pieces):
+        return {}
+    return {segments[index]: piece for index, piece in zip(indexes, pieces)}
+
+def remember_translation(alert_text, target_lang, translated_text, elapsed=None):
+    """
+    Adds the segments of a full alert translation to the history, for the
+    lines where the translation has the original's shape (same lines, same
+    number of towns). Returns the number of segments learned.
+    """
+    if elapsed is not None:
+        previous = delta_stats["full_latency_avg"]
+        delta_stats["full_latency_avg"] = elapsed if not previous else previous * 0.8 + elapsed * 0.2
+    layout, segments = split_segments(alert_text)
+    lines = translated_text.strip().splitlines()
+    if len(lines) != len(layout):
+        return 0
+    translations = {}
+    for entry, line in zip(layout, lines):
+        if entry is not None:
+            translations.update(_align_line(entry, segments, line))
+    if translations:
+        history.setdefault(target_lang, deque(maxlen=ALERT_HISTORY_SIZE)).append(translations)
+    return len(translations)
+
+async def translate_alert_delta(alert_text, target_lang, translate_segments):
+    """
+    translate_segments(segments, target_lang) -> list of translations or None.
+    Returns the assembled translation, or None so the caller can fall back.
+    """
+    start = time.monotonic()
+    layout, segments = split_segments(alert_text)
+    translations = {}
+    missing = []
+    for segment in segments:
+        if segment in translations or segment in missing:
+            continue
+        known = lookup_segment(target_lang, segment)
+        if known is not None:
+            translations[segment] = known
+        else:
+            missing.append(segment)
+
+    if missing:
+        translated = await translate_segments(missing, target_lang)
+        if not translated or len(translated) != len(missing):
+            return None
+        translations.update(zip(missing, translated))
+
+    history.setdefault(target_lang, deque(maxlen=ALERT_HISTORY_SIZE)).append(translations)
+
+    elapsed = time.monotonic() - start
+    unique = len(translations)
+    reused = unique - len(missing)
+    delta_stats["alerts"] += 1
+    delta_stats["segments_total"] += unique
+    delta_stats["segments_reused"] += reused
+    if not missing:
+        delta_stats["llm_calls_skipped"] += 1
+    if delta_stats["full_latency_avg"]:
+        delta_stats["latency_saved"] += max(0.0, delta_stats["full_latency_avg"] - elapsed)
+    print(f"♻️  {target_lang.upper()} alert: reused {reused}/{unique} segments, {len(missing)} sent to LLM")
+
+    return assemble(layout, segments, translations)
+
+def get_delta_stats():
+    total = delta_stats["segments_total"]
+    return {
+        **delta_stats,
+        "reuse_ratio": round(delta_stats["segments_reused"] / total, 3) if total else 0.0,
+        "latency_saved": round(delta_stats["latency_saved"], 2),
+        "full_latency_avg": round(delta_stats["full_latency_avg"], 2),
+    }
@@ -0,0 +1,65 @@
+"""
+Merging of Pikud HaOref alerts that arrive in a burst.
+
+An alert is a header line (type + date/time), optional instruction lines and
+area blocks ("אזור ..." followed by a comma-separated town list). Alerts with
+the same type (header without date/time) are merged into one with the union
+of areas, towns and instruction lines, in first-seen order.
+"""
+import re
+
+AREA_PREFIX = "אזור "
+DATE_TIME_PATTERN = re.compile(r'\(\d{1,2}/\d{1,2}/\d{2,4}\)\s*\d{1,2}:\d{2}')
+
+def parse_alert(text):
+    lines = [line.strip() for line in text.splitlines()]
+    header = next((line for line in lines if line), "")
+    body = []
+    areas = {}  # area -> [towns]
+    current_area = None
+    for line in lines[lines.index(header) + 1:] if header else []:
+        if not line:
+            current_area = None
+        elif line.startswith(AREA_PREFIX):
+            current_area = line
+            areas.setdefault(current_area, [])
+        elif current_area:
+            towns = areas[current_area]
+            for town in line.split(','):
+                town = town.strip()
+                if town and town not in towns:
+                    towns.append(town)
+        else:
+            body.append(line)
+    key = DATE_TIME_PATTERN.sub('', header).strip()
+    return {"header": header, "key": key, "body": body, "areas": areas}
+
+def format_alert(alert):
+    sections = [alert["header"]]
+    if alert["body"]:
+        sections.append("\n".join(alert["body"]))
+    for area, towns in alert["areas"].items():
+        sections.append(f"{area}\n{', '.join(towns)}")
+    return "\n\n".join(sections)
+
+def merge_alerts(texts):
+    """Returns one text per alert type; single alerts are returned unchanged."""
+    groups = {}  # key -> (first text, merged alert, count)
+    for text in texts:
+        alert = parse_alert(text)
+        if not alert["areas"]:
+            # Nothing to union - keep as its own alert
+            groups[f"{alert['key']}#{len(groups)}"] = (text, alert, 1)
+            continue
+        if alert["key"] not in groups:
+            groups[alert["key"]] = (text, alert, 1)
+            continue
+        first_text, merged, count = groups[alert["key"]]
+        merged["header"] = alert["header"]  # Latest time
+        merged["body"].extend(line for line in alert["body"] if line not in merged["body"])
+        for area, towns in alert["areas"].items():
+            merged_towns = merged["areas"].setdefault(area, [])
+            merged_towns.extend(town for town in towns if town not in merged_towns)
+        groups[alert["key"]] = (first_text, merged, count + 1)
+
+    return [first_text if count == 1 else format_alert(merged) for first_text, merged, count in groups.values()]
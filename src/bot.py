@@ -1,12 +1,34 @@
-import telegram
-from src.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS, LANGUAGE_CHAT_IDS, SOURCE_ALERT_CHANNEL, SOURCE_NEWS_CHANNEL, TELEGRAM_API_ID, TELEGRAM_API_HASH, TELEGRAM_SESSION_DATA
+from src.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS, LANGUAGE_CHAT_IDS, SOURCE_NEWS_CHANNEL, TELEGRAM_API_ID, TELEGRAM_API_HASH, TELEGRAM_SESSION_DATA, LANGUAGE_SEND_TIMEOUT, SEND_MAX_ATTEMPTS, DELIVERY_RETRY_MAX_AGE, TELEGRAM_API_BASE_URL, BROADCAST_WORKERS, BROADCAST_GLOBAL_RATE, BROADCAST_PER_CHAT_INTERVAL, CATCHUP_MAX_MESSAGES, CATCHUP_MAX_ALERT_AGE, ALERT_COALESCE_WINDOW, NEWS_ALBUM_WINDOW, NEWS_BURST_WINDOW, WEBHOOK_SYNC_MODE, BULK_MAX_ITEMS, BULK_LLM_BATCH_SIZE, TELETHON_SESSION_MODE
 import asyncio
-from telethon import TelegramClient, events
 from src.llm_handler import translate_alert_to_all_languages, get_language_emoji
-from src.telethon_llm_handler import summarize_and_translate_news_telethon
-import telegram.helpers
+from src.telethon_llm_handler import summarize_and_translate_news_telethon, summarize_and_translate_news_batch_telethon
+from src import delivery_ledger
+from src.broadcast import BroadcastEngine
+from src.subscribers import get_subscriber_chats
+from src.coalescer import Coalescer
+from src.alert_history import get_delta_stats
+from src.alert_merge import merge_alerts
+from src.channels import registered_channels, resolve_channels, get_channel_for_peer
+from src.languages import get_chat_id_key
+from src.language_detect import resolve_source_language, get_channel_language_stats
+from src.telethon_session import get_session, start_session_snapshots, warm_entity_cache
+from src.channel_state import (
+    load_channel_state, run_state_saver, get_last_message_id, claim_message, mark_message_done, claimed_messages,
+    hold_watermark, release_watermark,
+)
+from src.jobs import jobs, create_job, get_job, find_active_job, update_job, run_job, cleanup_jobs
+from src.work_queue import start_workers, enqueue_alert, enqueue_news, get_queue_stats, ALERT_PRIORITY, NEWS_PRIORITY
+from src.multiprocess import remote_task, is_multiprocess, PROCESSING, DELIVERY
+from src import task_queue
+from src.metrics import (
+    TELEGRAM_SEND_SECONDS, ALERT_END_TO_END_SECONDS, DEDUP_CHECKS, QUEUE_DEPTH, DEDUP_ENTRIES, CACHE_HIT_RATIO,
+    register_collector, render_metrics, start_loop_lag_monitor,
+)
+from src.tracing import start_trace, traced, get_current_span, start_trace_exporter
+from src.loop_watchdog import start_loop_watchdog, get_blocking_sites
+from src.circuit_breaker import is_chat_available, seconds_until_available, record_success, record_failure
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 import base64
 import os
 import hashlib
@@ -24,14 +46,36 @@ def is_duplicate_message(text, chat_id):
     global sent_messages
     sent_messages = {k: v for k, v in sent_messages.items() if v > cutoff}
     
-    return key in sent_messages
+    duplicate = key in sent_messages
+    DEDUP_CHECKS.inc(cache="sent_messages", result="hit" if duplicate else "miss")
+    return duplicate
 
 def mark_message_sent(text, chat_id):
     key = hashlib.md5(f"{chat_id}:{text}".encode()).hexdigest()
     sent_messages[key] = time.time()
 
-# Create Telethon client with session management
+telegram_bot = None
+broadcast_engine = None
+alert_coalescer = None
+news_coalescer = None
+news_burst_coalescer = None
+
+def get_bot():
+    global telegram_bot
+    if telegram_bot is None:
+        import telegram
+        if TELEGRAM_API_BASE_URL:
+            telegram_bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN, base_url=TELEGRAM_API_BASE_URL)
+        else:
+            telegram_bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
+    return telegram_bot
+
+# Create Telethon client with session management (telethon is imported on first setup)
 telethon_client = None
+listener_ready = asyncio.Event()  # Set while the Telethon handler is registered and connected
+
+def uses_memory_session():
+    return TELETHON_SESSION_MODE == "memory" and bool(TELEGRAM_SESSION_DATA)
 
 def setup_telethon_client():
     global telethon_client
@@ -41,6 +85,12 @@ def setup_telethon_client():
         return False
     
     try:
+        from telethon import TelegramClient
+        if uses_memory_session():
+            # Restored once and reused by every reconnect, entity cache included
+            telethon_client = TelegramClient(get_session(), TELEGRAM_API_ID, TELEGRAM_API_HASH)
+            return True
+        
         # Create session file from environment variable if it exists
         if TELEGRAM_SESSION_DATA:
             print("🔑 Restoring Telethon session from environment variable...")
@@ -79,14 +129,20 @@ def cleanup_telethon_memory():
     if cleaned_count > 0:
         print(f"🧹 [Telethon] Cleaned {cleaned_count} old messages from memory")
 
-def is_telethon_message_processed(message_id):
+async def is_telethon_message_processed(message_id):
     if not message_id:
         return False
-    return message_id in processed_webhook_messages
+    processed = message_id in processed_webhook_messages or (
+        is_multiprocess() and await asyncio.to_thread(task_queue.is_processed, message_id)
+    )
+    DEDUP_CHECKS.inc(cache="processed_messages", result="hit" if processed else "miss")
+    return processed
 
-def mark_telethon_message_processed(message_id):
+async def mark_telethon_message_processed(message_id):
     if message_id:
         processed_webhook_messages[message_id] = time.time()
+        if is_multiprocess():
+            await asyncio.to_thread(task_queue.mark_processed, message_id)  # Visible to the other processes
 
 async def send_message(text, parse_mode=None):
     # In dev mode, print to console instead of sending to Telegram
@@ -114,16 +170,22 @@ async def send_message(text, parse_mode=None):
         return False
 
     try:
-        bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
-        for chat_id in TELEGRAM_CHAT_IDS:
-            await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
-            print(f"Message sent to chat ID: {chat_id}")
-        return True
+        engine = get_broadcast_engine()
+        futures = [engine.submit(chat_id, text, parse_mode) for chat_id in TELEGRAM_CHAT_IDS]
+        outcomes = await asyncio.gather(*futures)
+        print(f"Message sent to {sum(outcomes)}/{len(TELEGRAM_CHAT_IDS)} chat IDs")
+        return all(outcomes)
     except Exception as e:
         print(f"❌ Failed to send message: {e}")
         return False
 
-async def send_message_to_language_group(text, language_code, parse_mode=None):
+@remote_task(DELIVERY)
+async def send_message_to_language_group(text, language_code, parse_mode=None, timeout=30, scheduled=False):
+    """
+    scheduled=True queues the message on the broadcast engine instead of
+    sending it directly: messages to one chat go out in submission order,
+    paced by the per-chat interval and the global rate limit.
+    """
     # In dev mode, print to console instead of sending to Telegram
     from src.config import DEV_MODE  # Import dynamically to get current value
     if DEV_MODE:
@@ -154,7 +216,7 @@ async def send_message_to_language_group(text, language_code, parse_mode=None):
     chat_id = LANGUAGE_CHAT_IDS.get(language_code)
     if not chat_id:
         print(f"❌ Error: No chat ID configured for language '{language_code}'")
-        print(f"💡 Add TELEGRAM_CHAT_ID_{language_code.upper()} to your .env file")
+        print(f"💡 Add {get_chat_id_key(language_code)} to your .env file")
         return False
     
     # Check for duplicates
@@ -162,45 +224,286 @@ async def send_message_to_language_group(text, language_code, parse_mode=None):
         print(f"🔄 Duplicate message to {language_code.upper()}, skipping")
         return True
     
+    if scheduled:
+        return await get_broadcast_engine().submit(chat_id, text, parse_mode, label=f"{language_code.upper()} group")
+    # Direct sends count against the same bot-wide rate limit as broadcasts
+    await get_broadcast_engine().limiter.acquire()
+    return await send_to_chat(text, chat_id, parse_mode, timeout=timeout, label=f"{language_code.upper()} group")
+
+def _retry_after_seconds(error):
+    retry_after = error.retry_after
+    if hasattr(retry_after, 'total_seconds'):
+        retry_after = retry_after.total_seconds()
+    return float(retry_after)
+
+def _retry_backoff(attempts):
+    return min(30 * 2 ** max(attempts - 1, 0), 600)
+
+def _reconcile_timed_out_send(task, key, chat_id):
+    """Records the real outcome of a send that outlived its deadline."""
+    import telegram.error
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is None:
+        update = (delivery_ledger.mark_sent, key, task.result().message_id)
+        record_success(chat_id)
+        print(f"🧾 [Ledger] Timed-out send to {chat_id} was delivered (message_id: {task.result().message_id})")
+    elif isinstance(error, telegram.error.RetryAfter):
+        # Telegram rejected it, so a resend can't double-post
+        update = (delivery_ledger.schedule_retry, key, f"rate limited: {error}", _retry_after_seconds(error))
+    elif isinstance(error, (telegram.error.BadRequest, telegram.error.Forbidden, telegram.error.ChatMigrated)):
+        update = (delivery_ledger.mark_failed, key, str(error))
+        record_failure(chat_id)
+    else:
+        # Still ambiguous - leave as unknown rather than risk a double post
+        update = (delivery_ledger.mark_unknown, key, f"timeout, then: {error}")
+    task.get_loop().run_in_executor(None, *update)  # Done callbacks run on the event loop
+
+async def _timed_send_attempt(send_task, timeout, chat_id, attempt):
+    start = time.monotonic()
+    outcome = "ok"
     try:
-        bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
-        await asyncio.wait_for(
-            bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode),
-            timeout=30
-        )
-        mark_message_sent(text, chat_id)
-        print(f"📤 Message sent to {language_code.upper()} group (chat ID: {chat_id})")
-        return True
+        # Shield so a late response can still be reconciled after the deadline
+        return await asyncio.wait_for(asyncio.shield(send_task), timeout=timeout)
     except asyncio.TimeoutError:
-        print(f"⏰ Timeout sending to {language_code.upper()}, but may have been delivered")
-        mark_message_sent(text, chat_id)  # Mark sent to prevent retries
-        return False
+        outcome = "deadline"
+        raise
     except Exception as e:
-        print(f"❌ Failed to send {language_code.upper()} message: {e}")
+        outcome = type(e).__name__
+        raise
+    finally:
+        TELEGRAM_SEND_SECONDS.observe(time.monotonic() - start, chat=chat_id, outcome=outcome)
+        get_current_span().set(attempts=attempt, outcome=outcome)
+
+@traced("telegram.send")
+async def send_to_chat(text, chat_id, parse_mode=None, timeout=30, label=None):
+    """
+    Sends one message to one chat through the delivery ledger.
+    Retries transient failures with backoff inside the deadline, then hands
+    leftovers to retry_pending_deliveries. Timeouts are never resent.
+    """
+    import telegram.error
+    label = label or f"chat {chat_id}"
+    key = delivery_ledger.delivery_key(text, chat_id)
+    get_current_span().set(chat=str(chat_id), label=label, bytes=len(text.encode('utf-8')))
+    
+    # Ledger writes commit to sqlite, so they run in worker threads, never on the event loop
+    existing = await asyncio.to_thread(delivery_ledger.begin_delivery, key, chat_id, text, parse_mode, label)
+    if existing and existing['status'] in (delivery_ledger.SENT, delivery_ledger.UNKNOWN) \
+            and existing['updated_at'] > time.time() - 1800:
+        DEDUP_CHECKS.inc(cache="delivery_ledger", result="hit")
+        get_current_span().set(outcome="duplicate")
+        print(f"🔄 Already delivered to {label} ({existing['status']}), skipping")
+        return True
+    DEDUP_CHECKS.inc(cache="delivery_ledger", result="miss")
+    
+    if not is_chat_available(chat_id):
+        wait = seconds_until_available(chat_id)
+        await asyncio.to_thread(delivery_ledger.schedule_retry, key, "circuit open", wait)
+        print(f"🚧 {label} is parked by the circuit breaker, retrying in {wait:.0f}s")
         return False
+    
+    bot = get_bot()
+    deadline = time.monotonic() + timeout
+    reason = "deadline exceeded"
+    
+    for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        
+        await asyncio.to_thread(delivery_ledger.record_attempt, key)
+        send_task = asyncio.ensure_future(
+            bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+        )
+        try:
+            message = await _timed_send_attempt(send_task, remaining, chat_id, attempt)
+        except asyncio.TimeoutError:
+            print(f"⏰ Timeout sending to {label}, but may have been delivered")
+            await asyncio.to_thread(delivery_ledger.mark_unknown, key, "timeout")
+            mark_message_sent(text, chat_id)  # Mark sent to prevent retries
+            send_task.add_done_callback(lambda task: _reconcile_timed_out_send(task, key, chat_id))
+            return False
+        except telegram.error.RetryAfter as e:
+            delay = _retry_after_seconds(e)
+            reason = f"rate limited: {e}"
+        except (telegram.error.Forbidden, telegram.error.ChatMigrated) as e:
+            print(f"❌ Failed to send to {label}: {e}")
+            await asyncio.to_thread(delivery_ledger.mark_failed, key, str(e))
+            record_failure(chat_id)
+            return False
+        except telegram.error.BadRequest as e:
+            print(f"❌ Failed to send to {label}: {e}")
+            await asyncio.to_thread(delivery_ledger.mark_failed, key, str(e))
+            return False
+        except telegram.error.NetworkError as e:
+            # TimedOut or a dropped connection: the request may have reached
+            # Telegram, so don't resend it (BadRequest is a NetworkError too, handled above)
+            print(f"⏰ Network error sending to {label}, but may have been delivered: {e}")
+            await asyncio.to_thread(delivery_ledger.mark_unknown, key, f"network error: {e}")
+            mark_message_sent(text, chat_id)
+            record_failure(chat_id)
+            return False
+        except Exception as e:
+            delay = 2 ** (attempt - 1)
+            reason = str(e)
+        else:
+            await asyncio.to_thread(delivery_ledger.mark_sent, key, message.message_id)
+            mark_message_sent(text, chat_id)
+            record_success(chat_id)
+            print(f"📤 Message sent to {label} (chat ID: {chat_id})")
+            return True
+        
+        print(f"⚠️  Send to {label} failed (attempt {attempt}/{SEND_MAX_ATTEMPTS}): {reason}")
+        if attempt == SEND_MAX_ATTEMPTS or delay >= deadline - time.monotonic():
+            break
+        await asyncio.sleep(delay)
+    
+    # Out of attempts or time: leave it for the background retry job
+    record_failure(chat_id)
+    attempts = (await asyncio.to_thread(delivery_ledger.get_delivery, key))['attempts']
+    await asyncio.to_thread(delivery_ledger.schedule_retry, key, reason, _retry_backoff(attempts))
+    print(f"❌ Failed to send to {label}: {reason} (queued for retry)")
+    return False
 
-async def send_message_to_all_languages(messages_by_language, parse_mode=None):
+@remote_task(DELIVERY)
+async def retry_pending_deliveries():
+    due = await asyncio.to_thread(delivery_ledger.get_due_retries)
+    if not due:
+        return
+    
+    print(f"🔁 [Ledger] Retrying {len(due)} pending deliveries...")
+    for delivery in due:
+        if time.time() - delivery['created_at'] > DELIVERY_RETRY_MAX_AGE:
+            await asyncio.to_thread(
+                delivery_ledger.mark_failed,
+                delivery['key'], f"expired after {delivery['attempts']} attempts: {delivery['reason']}"
+            )
+            print(f"🗑️  [Ledger] Gave up on stale message to {delivery['label']}")
+            continue
+        
+        await send_to_chat(
+            delivery['text'],
+            delivery['chat_id'],
+            delivery['parse_mode'],
+            timeout=LANGUAGE_SEND_TIMEOUT,
+            label=delivery['label']
+        )
+
+async def _timed_language_send(text, lang_code, parse_mode, timeout):
+    start = time.monotonic()
+    try:
+        # Hard guard in case anything before the network call stalls
+        success = await asyncio.wait_for(
+            send_message_to_language_group(text, lang_code, parse_mode, timeout=timeout),
+            timeout=timeout + 1
+        )
+    except asyncio.TimeoutError:
+        print(f"⏰ Deadline exceeded sending to {lang_code.upper()}")
+        success = False
+    except Exception as e:
+        print(f"❌ Failed to send {lang_code.upper()} message: {e}")
+        success = False
+    return success, round(time.monotonic() - start, 3)
+
+async def fan_out_to_language_groups(messages_by_language, parse_mode=None, timeout=None):
+    """
+    Sends every language concurrently, each with its own deadline, so one slow
+    or failing chat can't delay the others.
+    Returns (results, latencies): lang -> success and lang -> seconds.
+    """
+    timeout = timeout or LANGUAGE_SEND_TIMEOUT
     results = {}
+    latencies = {}
     
+    sends = []
     for lang_code, message_text in messages_by_language.items():
         if message_text:  # Only send if there's content
-            success = await send_message_to_language_group(message_text, lang_code, parse_mode)
-            results[lang_code] = success
-            
-            # Small delay between messages to avoid rate limits
-            await asyncio.sleep(1)
+            sends.append((lang_code, _timed_language_send(message_text, lang_code, parse_mode, timeout)))
         else:
             print(f"⚠️  No content for {lang_code.upper()}, skipping")
             results[lang_code] = False
     
+    if sends:
+        outcomes = await asyncio.gather(*[send for _, send in sends])
+        for (lang_code, _), (success, latency) in zip(sends, outcomes):
+            results[lang_code] = success
+            latencies[lang_code] = latency
+    
+    return results, latencies
+
+def get_broadcast_engine():
+    global broadcast_engine
+    if broadcast_engine is None:
+        async def send(text, chat_id, parse_mode, label):
+            return await send_to_chat(text, chat_id, parse_mode, timeout=LANGUAGE_SEND_TIMEOUT, label=label)
+        broadcast_engine = BroadcastEngine(
+            send,
+            workers=BROADCAST_WORKERS,
+            global_rate=BROADCAST_GLOBAL_RATE,
+            per_chat_interval=BROADCAST_PER_CHAT_INTERVAL
+        )
+    return broadcast_engine
+
+async def broadcast_to_subscribers(messages_by_language, content_type, parse_mode=None):
+    """Sends each rendered language message to every subscriber of that language and content type."""
+    chats_by_language = {}
+    for lang_code in messages_by_language:
+        chat_ids = get_subscriber_chats(lang_code, content_type)
+        if chat_ids:
+            chats_by_language[lang_code] = chat_ids
+    if not chats_by_language:
+        return {}
+    
+    from src.config import DEV_MODE  # Import dynamically to get current value
+    if DEV_MODE:
+        for lang_code, chat_ids in chats_by_language.items():
+            print(f"🔧 DEV MODE: {lang_code.upper()} {content_type} would be broadcast to {len(chat_ids)} subscriber chats")
+        return {lang_code: {"sent": len(chat_ids), "failed": 0} for lang_code, chat_ids in chats_by_language.items()}
+    
+    results = await get_broadcast_engine().broadcast(chats_by_language, messages_by_language, parse_mode)
+    summary = {}
+    for lang_code, chat_results in results.items():
+        sent = sum(1 for success in chat_results.values() if success)
+        summary[lang_code] = {"sent": sent, "failed": len(chat_results) - sent}
+        print(f"📣 {lang_code.upper()} {content_type} broadcast: {sent}/{len(chat_results)} subscriber chats")
+    return summary
+
+@remote_task(DELIVERY, priority=lambda messages, content_type, *args, **kwargs: ALERT_PRIORITY if content_type == 'alert' else NEWS_PRIORITY)
+async def deliver_to_destinations(messages_by_language, content_type, parse_mode=None):
+    """
+    Sends rendered messages to the language groups and to subscriber chats concurrently.
+    Returns (results, latencies, subscriber_results).
+    """
+    results = {}
+    group_messages = {}
+    for lang_code, message_text in messages_by_language.items():
+        if lang_code not in LANGUAGE_CHAT_IDS:
+            print(f"⚠️  No chat ID configured for {lang_code.upper()}, skipping")
+            results[lang_code] = False
+            continue
+        group_messages[lang_code] = message_text
+    
+    (group_results, latencies), subscriber_results = await asyncio.gather(
+        fan_out_to_language_groups(group_messages, parse_mode),
+        broadcast_to_subscribers(messages_by_language, content_type, parse_mode)
+    )
+    results.update(group_results)
+    return results, latencies, subscriber_results
+
+async def send_message_to_all_languages(messages_by_language, parse_mode=None):
+    results, _ = await fan_out_to_language_groups(messages_by_language, parse_mode)
     return results
 
+@remote_task(PROCESSING, priority=ALERT_PRIORITY)
+@traced("alert.process")
 async def handle_webhook_alert(alert_text, message_id=None, source="Webhook"):
     if not alert_text:
         return {"success": False, "error": "No alert text provided"}
     
     # Prevent duplicate processing within Telethon/Webhook system
-    if message_id and is_telethon_message_processed(message_id):
+    if message_id and await is_telethon_message_processed(message_id):
         print(f"⚠️  [{source}] Alert {message_id} already processed, skipping")
         return {"success": True, "message": "Already processed"}
     
@@ -217,48 +520,74 @@ async def handle_webhook_alert(alert_text, message_id=None, source="Webhook"):
             print("❌ Alert translation failed")
             return {"success": False, "error": "Translation failed"}
         
-        results = {}
-        # Send to each language group immediately
+        import telegram.helpers
+        messages = {}
         for lang_code, translated_text in translations.items():
-            if lang_code not in LANGUAGE_CHAT_IDS:
-                print(f"⚠️  No chat ID configured for {lang_code.upper()}, skipping")
-                results[lang_code] = False
-                continue
-            
             emoji = get_language_emoji(lang_code)
             
             # Format as emergency alert
-            formatted_message = f"🚨 {emoji} **EMERGENCY ALERT**\n\n{telegram.helpers.escape_markdown(translated_text, version=2)}"
-            
-            success = await send_message_to_language_group(
-                formatted_message, 
-                lang_code, 
-                parse_mode='MarkdownV2'
-            )
-            
-            results[lang_code] = success
+            messages[lang_code] = f"🚨 {emoji} **EMERGENCY ALERT**\n\n{telegram.helpers.escape_markdown(translated_text, version=2)}"
+        
+        # Send to all language groups and subscribers at once
+        results, latencies, subscriber_results = await deliver_to_destinations(
+            messages, 'alert', parse_mode='MarkdownV2'
+        )
+        for lang_code, success in results.items():
+            if lang_code not in latencies:
+                continue
             if success:
-                print(f"✅ Alert sent to {lang_code.upper()} group")
+                print(f"✅ Alert sent to {lang_code.upper()} group ({latencies.get(lang_code, 0):.2f}s)")
             else:
                 print(f"❌ Failed to send alert to {lang_code.upper()} group")
         
         # Mark as processed
         if message_id:
-            mark_telethon_message_processed(message_id)
+            await mark_telethon_message_processed(message_id)
         
         print(f"🚨 [{source}] Emergency alert processing complete")
-        return {"success": True, "results": results}
+        return {"success": True, "results": results, "latencies": latencies, "subscribers": subscriber_results}
         
     except Exception as e:
         print(f"❌ Error processing [{source}] emergency alert: {e}")
         return {"success": False, "error": str(e)}
 
+async def deliver_news_translations(translations, message_id=None, source="Webhook"):
+    """Formats translated news, sends it to every destination and marks the message processed."""
+    import telegram.helpers
+    messages = {}
+    for lang_code, translated_text in translations.items():
+        emoji = get_language_emoji(lang_code)
+        
+        # Format as news update
+        messages[lang_code] = f"📰 {emoji} **NEWS UPDATE**\n\n{telegram.helpers.escape_markdown(translated_text, version=2)}\n\n\\-\\-\\-"
+    
+    # Send to all language groups and subscribers at once
+    results, latencies, subscriber_results = await deliver_to_destinations(
+        messages, 'news', parse_mode='MarkdownV2'
+    )
+    for lang_code, success in results.items():
+        if lang_code not in latencies:
+            continue
+        if success:
+            print(f"✅ News sent to {lang_code.upper()} group ({latencies.get(lang_code, 0):.2f}s)")
+        else:
+            print(f"❌ Failed to send news to {lang_code.upper()} group")
+    
+    # Mark as processed
+    if message_id:
+        await mark_telethon_message_processed(message_id)
+    
+    print(f"📰 [{source}] News processing complete")
+    return {"success": True, "results": results, "latencies": latencies, "subscribers": subscriber_results}
+
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@traced("news.process")
 async def handle_webhook_news(news_text, source_lang_code='es', message_id=None, source="Webhook"):
     if not news_text:
         return {"success": False, "error": "No news text provided"}
     
     # Prevent duplicate processing within Telethon/Webhook system
-    if message_id and is_telethon_message_processed(message_id):
+    if message_id and await is_telethon_message_processed(message_id):
         print(f"⚠️  [{source}] News {message_id} already processed, skipping")
         return {"success": True, "message": "Already processed"}
     
@@ -275,59 +604,280 @@ async def handle_webhook_news(news_text, source_lang_code='es', message_id=None,
             print("❌ News processing failed")
             return {"success": False, "error": "Processing failed"}
         
-        results = {}
-        # Send to each language group
-        for lang_code, translated_text in translations.items():
-            if lang_code not in LANGUAGE_CHAT_IDS:
-                print(f"⚠️  No chat ID configured for {lang_code.upper()}, skipping")
-                results[lang_code] = False
-                continue
-            
-            emoji = get_language_emoji(lang_code)
-            
-            # Format as news update
-            formatted_message = f"📰 {emoji} **NEWS UPDATE**\n\n{telegram.helpers.escape_markdown(translated_text, version=2)}\n\n\\-\\-\\-"
-            
-            success = await send_message_to_language_group(
-                formatted_message, 
-                lang_code, 
-                parse_mode='MarkdownV2'
-            )
-            
-            results[lang_code] = success
-            if success:
-                print(f"✅ News sent to {lang_code.upper()} group")
-            else:
-                print(f"❌ Failed to send news to {lang_code.upper()} group")
-        
-        # Mark as processed
-        if message_id:
-            mark_telethon_message_processed(message_id)
-        
-        print(f"📰 [{source}] News processing complete")
-        return {"success": True, "results": results}
+        return await deliver_news_translations(translations, message_id, source)
         
     except Exception as e:
         print(f"❌ Error processing [{source}] news message: {e}")
         return {"success": False, "error": str(e)}
 
-async def handle_emergency_alert(event):
-    alert_text = event.message.text
-    if not alert_text:
-        return
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@traced("news.batch")
+async def handle_webhook_news_batch(items, source_lang_code='es', source="Bulk"):
+    """
+    Processes (news_text, message_id) pairs of one source language with batched
+    LLM calls, then delivers them in order. Returns one result dict per item.
+    """
+    print(f"\n📰 [{source}] NEWS BATCH: {len(items)} {source_lang_code.upper()} messages")
+    try:
+        batch_translations = await summarize_and_translate_news_batch_telethon(
+            [news_text for news_text, _ in items], source_lang_code
+        )
+    except Exception as e:
+        print(f"❌ Error processing [{source}] news batch: {e}")
+        return [{"success": False, "error": str(e)} for _ in items]
+    
+    results = []
+    for (_, message_id), translations in zip(items, batch_translations):
+        if not translations:
+            results.append({"success": False, "error": "Processing failed"})
+            continue
+        try:
+            results.append(await deliver_news_translations(translations, message_id, source))
+        except Exception as e:
+            print(f"❌ Error delivering [{source}] news message: {e}")
+            results.append({"success": False, "error": str(e)})
+    return results
 
-    source_tag = f"Telethon @{SOURCE_ALERT_CHANNEL}"
-    # No need for message_id - each alert is unique
-    await handle_webhook_alert(alert_text, message_id=None, source=source_tag)
+def observe_alert_latency(message, channel):
+    """Records Telethon message date -> last send for an alert."""
+    if getattr(message, 'date', None):
+        ALERT_END_TO_END_SECONDS.observe(
+            max(0.0, time.time() - message.date.timestamp()), channel=channel['key']
+        )
 
+@register_collector
+def collect_bot_metrics():
+    for kind, stats in get_queue_stats().items():
+        QUEUE_DEPTH.set(stats["depth"], queue=kind)
+    if broadcast_engine is not None:
+        QUEUE_DEPTH.set(broadcast_engine.queue_depth(), queue="broadcast")
+    DEDUP_ENTRIES.set(len(processed_webhook_messages), cache="processed_messages")
+    DEDUP_ENTRIES.set(len(sent_messages), cache="sent_messages")
+    DEDUP_ENTRIES.set(sum(len(claimed) for claimed in claimed_messages.values()), cache="claimed_messages")
+    DEDUP_ENTRIES.set(len(jobs), cache="jobs")
+    CACHE_HIT_RATIO.set(get_delta_stats()["reuse_ratio"], cache="alert_segments")
 
-async def handle_news_channel_message(event, source_lang_code='es'):
-    news_text = event.message.text
-    if not news_text:
+async def process_channel_message(message, channel):
+    # Raw updates carry no client, so use the plain message text
+    text = getattr(message, 'message', None)
+    source_tag = f"Telethon @{channel['key']}"
+    try:
+        if text and channel['kind'] == 'alert':
+            # No need for message_id - each alert is unique (claim_message handles replays)
+            await handle_webhook_alert(text, message_id=None, source=source_tag)
+            observe_alert_latency(message, channel)
+        elif text:
+            await handle_webhook_news(
+                text, resolve_source_language(text, channel['key'], channel['lang']),
+                message_id=f"telethon_{channel['key']}_{message.id}", source=source_tag
+            )
+    finally:
+        # Failures are logged by the worker; a stuck id would hold the catch-up watermark back
+        mark_message_done(channel['key'], message.id)
+
+async def process_news_post(messages, channel):
+    """Handles an album or burst of news fragments as one logical post."""
+    texts = []
+    for message in messages:
+        text = (getattr(message, 'message', None) or '').strip()
+        if text and text not in texts:
+            texts.append(text)
+    try:
+        if texts:
+            text = "\n\n".join(texts)
+            await handle_webhook_news(
+                text, resolve_source_language(text, channel['key'], channel['lang']),
+                message_id=f"telethon_{channel['key']}_{messages[0].id}",
+                source=f"Telethon @{channel['key']}"
+            )
+    finally:
+        mark_messages_done(channel, messages)
+
+def mark_messages_done(channel, messages):
+    for message in messages:
+        mark_message_done(channel['key'], message.id)
+
+async def flush_news_post(key, items):
+    channel = items[0][1]
+    messages = sorted((message for message, _ in items), key=lambda message: message.id)
+    future = await enqueue_news(
+        process_news_post, messages, channel,
+        priority=channel['priority'],
+        label=f"news post @{channel['key']}/{messages[0].id} ({len(messages)} fragments)"
+    )
+    if future is None:
+        mark_messages_done(channel, messages)  # Dropped (queue full), don't hold the watermark back
+
+def get_news_coalescer():
+    global news_coalescer
+    if news_coalescer is None:
+        news_coalescer = Coalescer(NEWS_ALBUM_WINDOW, flush_news_post, name="News post")
+    return news_coalescer
+
+async def process_alert_burst(messages, channel):
+    """Merges a burst of alerts by type and processes each merged alert once."""
+    texts = [message.message for message in messages if getattr(message, 'message', None)]
+    merged_alerts = merge_alerts(texts)
+    if len(merged_alerts) < len(texts):
+        print(f"🧲 Merged {len(texts)} alerts from @{channel['key']} into {len(merged_alerts)}")
+    source_tag = f"Telethon @{channel['key']}"
+    try:
+        await asyncio.gather(*[
+            handle_webhook_alert(text, message_id=None, source=source_tag) for text in merged_alerts
+        ])
+        observe_alert_latency(min(messages, key=lambda message: message.id), channel)
+    finally:
+        mark_messages_done(channel, messages)
+
+async def flush_alert_burst(key, items):
+    channel = items[0][1]
+    messages = [message for message, _ in items]
+    await enqueue_alert(
+        process_alert_burst, messages, channel,
+        priority=channel['priority'],
+        label=f"alert burst @{key} ({len(messages)} messages)"
+    )
+
+def get_alert_coalescer():
+    global alert_coalescer
+    if alert_coalescer is None:
+        alert_coalescer = Coalescer(ALERT_COALESCE_WINDOW, flush_alert_burst, name="Alert burst")
+    return alert_coalescer
+
+def get_news_burst_coalescer():
+    global news_burst_coalescer
+    if news_burst_coalescer is None:
+        news_burst_coalescer = Coalescer(NEWS_BURST_WINDOW, flush_news_post, name="News burst")
+    return news_burst_coalescer
+
+async def enqueue_channel_message(message, channel, label_prefix=""):
+    if channel['kind'] == 'alert' and ALERT_COALESCE_WINDOW > 0:
+        # Hold for at most the window so overlapping alerts are translated once
+        get_alert_coalescer().add(channel['key'], (message, channel))
         return
     
-    source_tag = f"Telethon @{SOURCE_NEWS_CHANNEL}"
-    await handle_webhook_news(news_text, source_lang_code, message_id=f"telethon_{event.message.id}", source=source_tag)
+    if channel['kind'] == 'news':
+        # Album fragments share a grouped_id; NEWS_BURST_WINDOW also joins quick follow-ups
+        grouped_id = getattr(message, 'grouped_id', None)
+        if grouped_id:
+            get_news_coalescer().add(f"{channel['key']}:album:{grouped_id}", (message, channel))
+            return
+        if NEWS_BURST_WINDOW > 0:
+            get_news_burst_coalescer().add(f"{channel['key']}:burst", (message, channel))
+            return
+    
+    enqueue = enqueue_alert if channel['kind'] == 'alert' else enqueue_news
+    future = await enqueue(
+        process_channel_message, message, channel,
+        priority=channel['priority'],
+        label=f"{label_prefix}{channel['kind']} @{channel['key']}/{message.id}"
+    )
+    if future is None:
+        mark_message_done(channel['key'], message.id)  # Dropped (queue full), don't hold the watermark back
+
+def build_missed_alerts_summary(messages):
+    """Collapses stale alerts into one Hebrew summary alert (alerts are always Hebrew)."""
+    lines = [f"⏪ סיכום {len(messages)} התרעות שפורסמו בזמן ניתוק:"]
+    total_length = len(lines[0])
+    for i, message in enumerate(messages):
+        alert_lines = [line.strip() for line in message.message.splitlines() if line.strip()]
+        entry = f"• {message.date.astimezone().strftime('%H:%M')} {' | '.join(alert_lines)[:200]}"
+        if total_length + len(entry) > 3000:
+            lines.append(f"• ועוד {len(messages) - i} התרעות")
+            break
+        lines.append(entry)
+        total_length += len(entry)
+    return "\n".join(lines)
+
+async def catch_up_channel(channel):
+    """Replays messages posted since the last processed id through the normal work queues."""
+    key = channel['key']
+    last_id = get_last_message_id(key)
+    if last_id is None:
+        # First run: start from the channel's current position instead of replaying history
+        latest = await telethon_client.get_messages(channel['entity'], limit=1)
+        if latest:
+            mark_message_done(key, latest[0].id)
+        return
+    
+    stale_alerts = []
+    replayed = 0
+    fetched = 0
+    last_fetched_id = last_id
+    now = datetime.now(timezone.utc)
+    # Live messages finishing meanwhile must not move the watermark over ids this pass hasn't claimed yet
+    hold_watermark(key)
+    try:
+        # iter_messages fetches in pages of 100
+        async for message in telethon_client.iter_messages(channel['entity'], min_id=last_id, reverse=True, limit=CATCHUP_MAX_MESSAGES):
+            fetched += 1
+            last_fetched_id = message.id
+            if not claim_message(key, message.id):
+                continue
+            if not getattr(message, 'message', None):
+                mark_message_done(key, message.id)
+            elif channel['kind'] == 'alert' and (now - message.date).total_seconds() > CATCHUP_MAX_ALERT_AGE:
+                stale_alerts.append(message)
+            else:
+                with trace_channel_message("telethon.catchup", message, channel):
+                    await enqueue_channel_message(message, channel, label_prefix="catch-up ")
+                replayed += 1
+    finally:
+        release_watermark(key)
+    
+    if stale_alerts:
+        print(f"⏪ Collapsing {len(stale_alerts)} stale alerts from @{key} into one summary")
+        with start_trace("telethon.catchup_summary", 'alert', channel=key, messages=len(stale_alerts)):
+            await enqueue_alert(
+                handle_webhook_alert, build_missed_alerts_summary(stale_alerts),
+                None, source=f"Telethon @{key} (catch-up)", label="missed alerts summary"
+            )
+        mark_messages_done(channel, stale_alerts)
+    
+    if replayed or stale_alerts:
+        print(f"⏪ Caught up @{key}: {replayed} replayed, {len(stale_alerts)} summarized")
+    
+    if fetched >= CATCHUP_MAX_MESSAGES:
+        # Oldest first, so anything past the limit is skipped for good once newer messages are done
+        latest = await telethon_client.get_messages(channel['entity'], limit=1)
+        if latest and latest[0].id > last_fetched_id:
+            print(f"⚠️  Catch-up of @{key} stopped at CATCHUP_MAX_MESSAGES={CATCHUP_MAX_MESSAGES}: "
+                  f"up to {latest[0].id - last_fetched_id} messages (ids {last_fetched_id + 1}-{latest[0].id}) were not replayed")
+
+async def catch_up_missed_messages():
+    for channel in registered_channels:
+        try:
+            await catch_up_channel(channel)
+        except Exception as e:
+            print(f"⚠️  Catch-up failed for @{channel['key']}: {e}")
+
+def trace_channel_message(name, message, channel):
+    """Starts the trace for a channel message, noting how late Telethon delivered it."""
+    attributes = {"channel": channel['key'], "message_id": message.id}
+    if getattr(message, 'date', None):
+        attributes["telethon_delay"] = round(time.time() - message.date.timestamp(), 3)
+    return start_trace(name, channel['kind'], **attributes)
+
+async def dispatch_channel_update(update):
+    """Single handler for every source channel: one dict lookup per update."""
+    from telethon import types
+    from telethon.utils import get_peer_id
+    message = update.message
+    if not isinstance(message, types.Message):
+        return
+    channel = get_channel_for_peer(get_peer_id(message.peer_id))
+    if channel is None or not claim_message(channel['key'], message.id):
+        return
+    with trace_channel_message("telethon.update", message, channel):
+        await enqueue_channel_message(message, channel)
+
+state_saver_task = None
+
+def start_state_saver():
+    global state_saver_task
+    if state_saver_task is None or state_saver_task.done():
+        load_channel_state()
+        state_saver_task = asyncio.create_task(run_state_saver())
 
 async def start_alert_listener():
     max_retries = 5
@@ -358,38 +908,39 @@ async def start_alert_listener():
             
             print("✅ Telethon client authorized successfully")
             
-            # Set up event handler for the alert channel
+            # Handlers only enqueue; the worker pools do the LLM + send work
+            start_workers()
+            start_state_saver()
+            
+            # One raw handler for all registered channels, dispatched by peer id
+            from telethon import events, types
+            await resolve_channels(telethon_client)
+            if uses_memory_session():
+                asyncio.create_task(warm_entity_cache(telethon_client, registered_channels))
+                start_session_snapshots()
             try:
-                @telethon_client.on(events.NewMessage(chats=SOURCE_ALERT_CHANNEL))
-                async def alert_handler(event):
+                @telethon_client.on(events.Raw(types=[types.UpdateNewChannelMessage, types.UpdateNewMessage]))
+                async def channel_update_handler(update):
                     try:
-                        await handle_emergency_alert(event)
+                        await dispatch_channel_update(update)
                     except Exception as e:
-                        print(f"❌ Error handling alert: {e}")
+                        print(f"❌ Error queueing channel message: {e}")
                 
-                print(f"🚨 Real-time alert listener started for @{SOURCE_ALERT_CHANNEL}")
+                for channel in registered_channels:
+                    emoji = "🚨" if channel['kind'] == 'alert' else "📰"
+                    print(f"{emoji} Real-time {channel['kind']} listener started for @{channel['key']} ({channel['lang'].upper()}, priority {channel['priority']})")
             except Exception as e:
-                print(f"⚠️  Warning: Could not set up alert listener for @{SOURCE_ALERT_CHANNEL}: {e}")
-                print("💡 The bot will continue running but won't receive real-time alerts from this channel")
+                print(f"⚠️  Warning: Could not set up channel listener: {e}")
+                print("💡 The bot will continue running but won't receive real-time alerts or news")
             
-            # Set up event handler for the news channel (if configured)
-            if SOURCE_NEWS_CHANNEL:
-                try:
-                    @telethon_client.on(events.NewMessage(chats=SOURCE_NEWS_CHANNEL))
-                    async def news_handler(event):
-                        try:
-                            await handle_news_channel_message(event, source_lang_code='es')
-                        except Exception as e:
-                            print(f"❌ Error handling news: {e}")
-                    
-                    print(f"📰 Real-time news listener started for @{SOURCE_NEWS_CHANNEL} (Spanish)")
-                except Exception as e:
-                    print(f"⚠️  Warning: Could not set up news listener for @{SOURCE_NEWS_CHANNEL}: {e}")
-                    print("💡 The bot will continue running but won't receive real-time news from this channel")
-            else:
-                print("⚠️  No news channel configured. Add SOURCE_NEWS_CHANNEL to .env to enable")
+            if not SOURCE_NEWS_CHANNEL and not any(channel['kind'] == 'news' for channel in registered_channels):
+                print("⚠️  No news channel configured. Add SOURCE_NEWS_CHANNEL or SOURCE_CHANNELS to .env to enable")
             
             print("🔴 Listening for emergency alerts and news updates...")
+            listener_ready.set()
+            
+            # Fill the gap left by the disconnect while live updates keep flowing
+            asyncio.create_task(catch_up_missed_messages())
             
             # Keep the client running with error recovery
             try:
@@ -403,6 +954,7 @@ async def start_alert_listener():
             
         except Exception as e:
             print(f"❌ Error in alert listener (attempt {attempt + 1}/{max_retries}): {e}")
+            listener_ready.clear()
             
             # Clean up connection
             try:
@@ -426,10 +978,40 @@ async def start_webhook_server():
     from aiohttp import web, ClientSession
     import os
     
+    def wants_sync(request):
+        return WEBHOOK_SYNC_MODE or request.query.get('sync', '').lower() in ('1', 'true', 'yes')
+    
+    async def submit_webhook_job(request, kind, func, *args, message_id=None):
+        """Queues the work and answers 202 with a job id (or waits for it in sync mode)."""
+        # Same message already queued or running: point the caller at that job
+        existing = find_active_job(kind, message_id)
+        if existing:
+            return web.json_response(
+                {"job_id": existing["id"], "status": existing["status"], "status_url": f"/jobs/{existing['id']}"},
+                status=202
+            )
+        
+        job = create_job(kind, message_id)
+        enqueue = enqueue_alert if kind == 'alert' else enqueue_news
+        with start_trace(f"webhook.{kind}", kind, message_id=message_id or "", job_id=job["id"]):
+            future = await enqueue(run_job, job["id"], func, *args, label=f"webhook {kind} {job['id'][:8]}")
+        if future is None:
+            update_job(job["id"], "dropped", error="Queue full")
+            return web.json_response({"error": "Queue full, try again later", "job_id": job["id"]}, status=503)
+        
+        if wants_sync(request):
+            return web.json_response(await future)
+        
+        return web.json_response(
+            {"job_id": job["id"], "status": job["status"], "status_url": f"/jobs/{job['id']}"},
+            status=202
+        )
+    
     async def webhook_alert_handler(request):
         try:
             # Clean old messages from memory
             cleanup_telethon_memory()
+            cleanup_jobs()
             
             data = await request.json()
             alert_text = data.get('text', '')
@@ -438,8 +1020,12 @@ async def start_webhook_server():
             if not alert_text:
                 return web.json_response({"error": "No alert text provided"}, status=400)
             
-            result = await handle_webhook_alert(alert_text, message_id, source="Webhook")
-            return web.json_response(result)
+            if message_id and await is_telethon_message_processed(message_id):
+                return web.json_response({"success": True, "message": "Already processed"})
+            
+            return await submit_webhook_job(
+                request, 'alert', handle_webhook_alert, alert_text, message_id, "Webhook", message_id=message_id
+            )
             
         except Exception as e:
             print(f"❌ Webhook alert error: {e}")
@@ -449,30 +1035,181 @@ async def start_webhook_server():
         try:
             # Clean old messages from memory
             cleanup_telethon_memory()
+            cleanup_jobs()
             
             data = await request.json()
             news_text = data.get('text', '')
-            source_lang = data.get('source_lang', 'es')
             message_id = data.get('message_id')
             
             if not news_text:
                 return web.json_response({"error": "No news text provided"}, status=400)
+            source_lang = resolve_source_language(news_text, "webhook", data.get('source_lang'))
+            
+            if message_id and await is_telethon_message_processed(message_id):
+                return web.json_response({"success": True, "message": "Already processed"})
             
-            result = await handle_webhook_news(news_text, source_lang, message_id, source="Webhook")
-            return web.json_response(result)
+            return await submit_webhook_job(
+                request, 'news', handle_webhook_news, news_text, source_lang, message_id, "Webhook", message_id=message_id
+            )
             
         except Exception as e:
             print(f"❌ Webhook news error: {e}")
             return web.json_response({"error": str(e)}, status=500)
     
+    def parse_bulk_body(body):
+        """Accepts a JSON array or NDJSON; returns a list of items (or error strings for bad lines)."""
+        body = body.strip()
+        if body.startswith('['):
+            return json.loads(body)
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(f"Invalid JSON: {e}")
+        return items
+    
+    async def webhook_bulk_handler(request):
+        """
+        Bulk ingestion: items are deduplicated together, alerts go to the alert pool
+        one by one, news is grouped by source language into batched LLM jobs.
+        Per-item results are streamed back as NDJSON as soon as each job finishes.
+        """
+        try:
+            items = parse_bulk_body(await request.text())
+        except ValueError as e:
+            return web.json_response({"error": f"Invalid JSON: {e}"}, status=400)
+        if not isinstance(items, list):
+            return web.json_response({"error": "Expected a JSON array or NDJSON"}, status=400)
+        if len(items) > BULK_MAX_ITEMS:
+            return web.json_response({"error": f"Too many items (max {BULK_MAX_ITEMS})"}, status=413)
+        
+        # Clean old messages from memory once for the whole batch
+        cleanup_telethon_memory()
+        cleanup_jobs()
+        
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        counts = {}
+        
+        job_ids = {}  # index -> job id, so /webhook/news and /jobs/{id} see bulk items in flight
+        
+        async def write_result(index, item, status, **extra):
+            counts[status] = counts.get(status, 0) + 1
+            line = {"index": index, "message_id": item.get("message_id") if isinstance(item, dict) else None, "status": status, **extra}
+            if index in job_ids:
+                line["job_id"] = job_ids[index]
+                job_status = {"sent": "done", "failed": "failed", "dropped": "dropped"}[status]
+                update_job(job_ids[index], job_status, result=extra.get("results"), error=extra.get("error"))
+            await response.write((json.dumps(line, ensure_ascii=False) + "\n").encode('utf-8'))
+        
+        seen_ids = set()
+        seen_texts = set()
+        alerts = []  # (index, item)
+        news_by_lang = {}  # source_lang -> [(index, item)]
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                await write_result(index, item, "invalid", error=item if isinstance(item, str) else "Item must be an object")
+                continue
+            kind = item.get('type', 'news')
+            text = (item.get('text') or '').strip()
+            message_id = item.get('message_id')
+            if kind not in ('alert', 'news') or not text:
+                await write_result(index, item, "invalid", error="Item needs text and type 'alert' or 'news'")
+                continue
+            
+            text_key = (kind, ' '.join(text.split()))
+            if (message_id and (message_id in seen_ids or await is_telethon_message_processed(message_id)
+                                or find_active_job(kind, message_id))) or text_key in seen_texts:
+                await write_result(index, item, "duplicate")
+                continue
+            if message_id:
+                seen_ids.add(message_id)
+            seen_texts.add(text_key)
+            job_ids[index] = create_job(kind, message_id)["id"]
+            
+            if kind == 'alert':
+                alerts.append((index, item))
+            else:
+                news_by_lang.setdefault(resolve_source_language(text, "webhook", item.get('source_lang')), []).append((index, item))
+        
+        # Alerts first so they're ahead of the news in the worker pools
+        pending = []  # (entries, future, batched)
+        for index, item in alerts:
+            with start_trace("webhook.bulk_alert", 'alert', index=index, message_id=item.get('message_id') or ""):
+                future = await enqueue_alert(
+                    handle_webhook_alert, item['text'].strip(), item.get('message_id'), "Bulk", label=f"bulk alert {index}"
+                )
+            pending.append(([(index, item)], future, False))
+        for source_lang, entries in news_by_lang.items():
+            for start in range(0, len(entries), BULK_LLM_BATCH_SIZE):
+                chunk = entries[start:start + BULK_LLM_BATCH_SIZE]
+                with start_trace("webhook.bulk_news", 'news', source_lang=source_lang, items=len(chunk)):
+                    future = await enqueue_news(
+                        handle_webhook_news_batch,
+                        [(item['text'].strip(), item.get('message_id')) for _, item in chunk],
+                        source_lang, "Bulk",
+                        label=f"bulk news {source_lang} x{len(chunk)}"
+                    )
+                pending.append((chunk, future, True))
+        
+        async def wait_for_job(entries, future, batched):
+            if future is None:
+                return entries, None, "Queue full"
+            try:
+                result = await future
+            except Exception as e:
+                return entries, None, str(e)
+            return entries, result if batched else [result], None
+        
+        for next_done in asyncio.as_completed([wait_for_job(*job) for job in pending]):
+            entries, results, error = await next_done
+            for i, (index, item) in enumerate(entries):
+                if error:
+                    await write_result(index, item, "dropped" if error == "Queue full" else "failed", error=error)
+                    continue
+                result = results[i]
+                if result.get("success"):
+                    await write_result(index, item, "sent", results=result.get("results"))
+                else:
+                    await write_result(index, item, "failed", error=result.get("error"))
+        
+        await response.write((json.dumps({"summary": {"items": len(items), **counts}}) + "\n").encode('utf-8'))
+        await response.write_eof()
+        return response
+    
+    async def job_status_handler(request):
+        job = get_job(request.match_info['job_id'])
+        if not job:
+            return web.json_response({"error": "Job not found"}, status=404)
+        return web.json_response(job)
+    
     async def health_check(request):
-        return web.json_response({"status": "healthy", "timestamp": datetime.now().isoformat()})
+        return web.json_response({
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "queues": get_queue_stats(),
+            "alert_delta": get_delta_stats(),
+            "source_languages": get_channel_language_stats(),
+            "blocking_sites": get_blocking_sites(5),
+        })
+    
+    async def metrics_handler(request):
+        return web.Response(
+            body=render_metrics().encode('utf-8'),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
     
     # Create web application
     app = web.Application()
     app.router.add_post('/webhook/alert', webhook_alert_handler)
     app.router.add_post('/webhook/news', webhook_news_handler)
+    app.router.add_post('/webhook/bulk', webhook_bulk_handler)
+    app.router.add_get('/jobs/{job_id}', job_status_handler)
     app.router.add_get('/health', health_check)
+    app.router.add_get('/metrics', metrics_handler)
     app.router.add_get('/', health_check)  # Root endpoint
     
     # Get port from environment (Digital Ocean App Platform uses PORT)
@@ -481,7 +1218,16 @@ async def start_webhook_server():
     print(f"🌐 Starting webhook server on port {port}")
     print(f"📡 Alert webhook: POST /webhook/alert")
     print(f"📰 News webhook: POST /webhook/news")
+    print(f"📦 Bulk webhook: POST /webhook/bulk (JSON array or NDJSON, max {BULK_MAX_ITEMS} items)")
+    print(f"🧾 Job status: GET /jobs/{{id}}{' (sync mode)' if WEBHOOK_SYNC_MODE else ''}")
     print(f"❤️  Health check: GET /health")
+    print(f"📈 Metrics: GET /metrics")
+    
+    # Webhook requests are processed by the same worker pools as Telethon
+    start_workers()
+    start_loop_lag_monitor()
+    start_loop_watchdog()
+    start_trace_exporter()
     
     # Start the server
     runner = web.AppRunner(app)
@@ -0,0 +1,126 @@
+"""
+Broadcast engine for fanning one rendered message out to many chats.
+
+Each chat has its own FIFO of pending sends (so messages to a chat stay in
+order) and at most one send in progress. Workers take whichever chat is ready
+next from a shared queue; a chat that sent less than per_chat_interval ago is
+put back on that queue only once its time comes, so a slow or rate-limited
+chat never holds up the others. All workers share a global send-rate limiter
+that keeps us under Telegram's bot-wide limit.
+"""
+import asyncio
+import collections
+import contextvars
+import time
+
+class RateLimiter:
+    """Spaces sends evenly so we never exceed `rate` sends per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class BroadcastEngine:
+    def __init__(self, send_func, workers=16, global_rate=25, per_chat_interval=1.0):
+        """
+        send_func(text, chat_id, parse_mode, label) -> bool does the actual send.
+        """
+        self.send_func = send_func
+        self.workers = workers
+        self.limiter = RateLimiter(global_rate)
+        self.per_chat_interval = per_chat_interval
+        self.last_sent = {}  # chat_id -> monotonic time of last send
+        self.chat_queues = {}  # chat_id -> deque of pending sends; present while the chat is scheduled
+        self.ready = None  # chat ids whose next send may go now
+        self.worker_tasks = []
+        self.loop = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # Queues and timers belong to the loop they were created on
+            self.loop = loop
+            self.ready = asyncio.Queue()
+            self.chat_queues = {}
+            self.worker_tasks = [None] * self.workers
+        for index, task in enumerate(self.worker_tasks):
+            if task is None or task.done():
+                # Restart only this worker; the others keep serving the shared queue
+                self.worker_tasks[index] = asyncio.create_task(self._worker())
+
+    def _schedule(self, chat_id):
+        # Telegram allows roughly one message per second per chat
+        wait = self.last_sent.get(chat_id, 0) + self.per_chat_interval - time.monotonic()
+        if wait > 0:
+            self.loop.call_later(wait, self.ready.put_nowait, chat_id)
+        else:
+            self.ready.put_nowait(chat_id)
+
+    async def _worker(self):
+        while True:
+            chat_id = await self.ready.get()
+            pending = self.chat_queues[chat_id]
+            text, parse_mode, label, future, context = pending.popleft()
+            try:
+                await self.limiter.acquire()
+                success = await context.run(asyncio.create_task, self.send_func(text, chat_id, parse_mode, label))
+                self.last_sent[chat_id] = time.monotonic()
+                if not future.done():
+                    future.set_result(bool(success))
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_result(False)
+                raise
+            except Exception as e:
+                print(f"❌ [Broadcast] Send to {label} crashed: {e}")
+                if not future.done():
+                    future.set_result(False)
+            finally:
+                if pending:
+                    self._schedule(chat_id)
+                else:
+                    del self.chat_queues[chat_id]
+
+    def submit(self, chat_id, text, parse_mode=None, label=None):
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        entry = (text, parse_mode, label or f"chat {chat_id}", future, contextvars.copy_context())
+        if chat_id in self.chat_queues:
+            self.chat_queues[chat_id].append(entry)  # Scheduled already; goes after the chat's earlier sends
+        else:
+            self.chat_queues[chat_id] = collections.deque([entry])
+            self._schedule(chat_id)
+        return future
+
+    async def broadcast(self, chats_by_language, messages_by_language, parse_mode=None):
+        """
+        Sends each language's already-rendered message to all of its chats.
+        Returns {lang: {chat_id: success}}.
+        """
+        pending = []
+        for lang_code, chat_ids in chats_by_language.items():
+            text = messages_by_language.get(lang_code)
+            if not text:
+                continue
+            for chat_id in chat_ids:
+                future = self.submit(chat_id, text, parse_mode, label=f"{lang_code.upper()} subscriber {chat_id}")
+                pending.append((lang_code, chat_id, future))
+
+        results = {}
+        if pending:
+            outcomes = await asyncio.gather(*[future for _, _, future in pending])
+            for (lang_code, chat_id, _), success in zip(pending, outcomes):
+                results.setdefault(lang_code, {})[chat_id] = success
+        return results
+
+    def queue_depth(self):
+        return sum(len(pending) for pending in self.chat_queues.values())
@@ -0,0 +1,135 @@
+"""
+Tracks a contiguous watermark per source channel so that messages posted
+while the Telethon listener was disconnected can be caught up.
+
+The watermark is the id below which every seen message is done. Workers
+finish out of order, so ids that are done above the watermark are kept too,
+and so are ids that are claimed but not done yet ("in flight"). After a crash
+catch-up replays everything above the watermark except the ids that were
+already done.
+
+While catch-up is fetching a channel, ids above the watermark have not all
+been claimed yet, so a live message finishing first says nothing about the
+gap before it. hold_watermark() keeps the watermark where it was until
+release_watermark() at the end of the pass.
+
+State lives in memory and is written to CHANNEL_STATE_PATH by a background
+task, never from inside an update handler.
+"""
+import asyncio
+import json
+import os
+import time
+
+from src.config import CHANNEL_STATE_PATH
+
+last_message_ids = {}  # channel -> watermark: every seen message up to this id is done
+done_above = {}  # channel -> ids done above the watermark
+in_flight = {}  # channel -> ids claimed but not done yet
+claimed_messages = {}  # channel -> {message_id: timestamp} for live/catch-up dedup
+held_channels = set()  # channels whose catch-up pass is running; their watermark doesn't move
+_dirty = False
+
+def _channel_key(channel):
+    return str(channel)
+
+def load_channel_state(path=None):
+    path = path or CHANNEL_STATE_PATH
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        for key, value in state.items():
+            if isinstance(value, dict):
+                last_message_ids[key] = int(value["watermark"])
+                done = {int(message_id) for message_id in value.get("done", [])}
+            else:
+                last_message_ids[key] = int(value)  # Before the watermark: the highest id seen
+                done = set()
+            done_above[key] = done
+            # Already handled, so catch-up must not replay them
+            claimed_messages.setdefault(key, {}).update(dict.fromkeys(done, time.time()))
+        print(f"📌 Loaded last processed message ids for {len(last_message_ids)} channels")
+    except Exception as e:
+        print(f"⚠️  Could not load channel state from {path}: {e}")
+
+def _state_snapshot():
+    return {
+        key: {"watermark": watermark, "done": sorted(done_above.get(key, ()))}
+        for key, watermark in last_message_ids.items()
+    }
+
+def save_channel_state(path=None, state=None):
+    global _dirty
+    path = path or CHANNEL_STATE_PATH
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state if state is not None else _state_snapshot(), f)
+    os.replace(tmp_path, path)
+    _dirty = False
+
+async def run_state_saver(interval=5):
+    """Periodically flushes channel state off the event loop."""
+    global _dirty
+    while True:
+        await asyncio.sleep(interval)
+        if _dirty:
+            # Copied on the event loop, where the handlers change it
+            state = _state_snapshot()
+            _dirty = False
+            try:
+                await asyncio.to_thread(save_channel_state, None, state)
+            except Exception as e:
+                _dirty = True
+                print(f"⚠️  Could not save channel state: {e}")
+
+def get_last_message_id(channel):
+    return last_message_ids.get(_channel_key(channel))
+
+def claim_message(channel, message_id):
+    """Returns True the first time a message is seen (live handler or catch-up), False after."""
+    key = _channel_key(channel)
+    claimed = claimed_messages.setdefault(key, {})
+    if message_id in claimed:
+        return False
+    if len(claimed) > 2000:
+        # Keep the most recent half (ids arrive in roughly increasing order)
+        claimed_messages[key] = claimed = dict(list(claimed.items())[-1000:])
+    claimed[message_id] = time.time()
+    in_flight.setdefault(key, set()).add(message_id)
+    return True
+
+def _advance_watermark(key):
+    """Moves the watermark up to the highest done id that has nothing still in flight below it."""
+    done = done_above.get(key)
+    if not done or key in held_channels:
+        return
+    pending = in_flight.get(key)
+    watermark = last_message_ids.get(key, 0)
+    new_watermark = min(min(pending) - 1, max(done)) if pending else max(done)
+    if new_watermark > watermark:
+        last_message_ids[key] = new_watermark
+        done_above[key] = {done_id for done_id in done if done_id > new_watermark}
+
+def mark_message_done(channel, message_id):
+    """Marks a message done and advances the watermark as far as nothing below it is still in flight."""
+    global _dirty
+    key = _channel_key(channel)
+    in_flight.get(key, set()).discard(message_id)
+    if message_id <= last_message_ids.get(key, 0):
+        return
+    done_above.setdefault(key, set()).add(message_id)
+    _advance_watermark(key)
+    _dirty = True
+
+def hold_watermark(channel):
+    held_channels.add(_channel_key(channel))
+
+def release_watermark(channel):
+    """Ends a catch-up pass: every replayed id is claimed by now, so the watermark may catch up."""
+    global _dirty
+    key = _channel_key(channel)
+    held_channels.discard(key)
+    _advance_watermark(key)
+    _dirty = True
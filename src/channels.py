@@ -0,0 +1,76 @@
+"""
+Source channel registry: channel -> kind (alert/news), language and priority.
+
+Configured with SOURCE_CHANNELS as comma-separated `channel:kind:lang:priority`
+entries (lang and priority are optional), e.g.
+    SOURCE_CHANNELS=PikudHaOref_all:alert:he:0,-1001234567890:news:en:5,elmundoes:news:es
+SOURCE_ALERT_CHANNEL / SOURCE_NEWS_CHANNEL are still registered as before.
+
+After connecting, resolve_channels() builds a dict keyed by Telegram peer id,
+so dispatching an update costs one lookup no matter how many channels exist.
+"""
+from src.config import SOURCE_CHANNELS_STR, SOURCE_ALERT_CHANNEL, SOURCE_NEWS_CHANNEL, get_channel_entity_value
+
+DEFAULT_LANGUAGE = {'alert': 'he', 'news': 'es'}  # Pikud alerts are always Hebrew
+DEFAULT_PRIORITY = {'alert': 0, 'news': 10}
+
+registered_channels = []  # [{"key", "entity", "kind", "lang", "priority"}]
+dispatch_table = {}  # peer id -> channel entry
+
+def register_channel(entity, kind, lang=None, priority=None):
+    if kind not in DEFAULT_LANGUAGE:
+        print(f"⚠️  Unknown channel kind '{kind}' for {entity}, skipping")
+        return None
+    key = str(entity)
+    for channel in registered_channels:
+        if channel['key'] == key:
+            return channel
+    channel = {
+        "key": key,
+        "entity": entity,
+        "kind": kind,
+        "lang": lang or DEFAULT_LANGUAGE[kind],
+        "priority": DEFAULT_PRIORITY[kind] if priority is None else priority,
+    }
+    registered_channels.append(channel)
+    return channel
+
+def load_channels():
+    registered_channels.clear()
+    for entry in SOURCE_CHANNELS_STR.split(','):
+        if not entry.strip():
+            continue
+        # Locate the kind field so channel names containing ':' stay intact
+        parts = [part.strip() for part in entry.strip().split(':')]
+        kind_index = next((i for i, part in enumerate(parts) if part in DEFAULT_LANGUAGE), None)
+        if not kind_index:
+            print(f"⚠️  Could not parse SOURCE_CHANNELS entry '{entry}'. Use 'channel:kind:lang:priority'")
+            continue
+        entity = get_channel_entity_value(':'.join(parts[:kind_index]))
+        lang = parts[kind_index + 1] if len(parts) > kind_index + 1 and parts[kind_index + 1] else None
+        priority = int(parts[kind_index + 2]) if len(parts) > kind_index + 2 and parts[kind_index + 2] else None
+        register_channel(entity, parts[kind_index], lang, priority)
+
+    if SOURCE_ALERT_CHANNEL:
+        register_channel(SOURCE_ALERT_CHANNEL, 'alert')
+    if SOURCE_NEWS_CHANNEL:
+        register_channel(SOURCE_NEWS_CHANNEL, 'news')
+    return registered_channels
+
+async def resolve_channels(client):
+    """Resolves every registered channel to its peer id and rebuilds the dispatch table."""
+    table = {}
+    for channel in registered_channels:
+        try:
+            table[await client.get_peer_id(channel['entity'])] = channel
+        except Exception as e:
+            print(f"⚠️  Could not resolve channel @{channel['key']}: {e}")
+    dispatch_table.clear()
+    dispatch_table.update(table)
+    print(f"📡 Dispatch table ready: {len(dispatch_table)}/{len(registered_channels)} channels resolved")
+    return dispatch_table
+
+def get_channel_for_peer(peer_id):
+    return dispatch_table.get(peer_id)
+
+load_channels()
@@ -0,0 +1,47 @@
+"""
+Per-chat circuit breaker for Telegram sends.
+
+After CIRCUIT_BREAKER_THRESHOLD consecutive failures a chat is parked for
+CIRCUIT_BREAKER_COOLDOWN seconds. Once the cooldown passes, one probe send is
+allowed through: success closes the breaker, failure parks the chat again.
+Other sends wait while the probe is in flight; a probe that never reports
+back frees the slot after another cooldown.
+"""
+import time
+
+from src.config import CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+
+chat_failures = {}  # chat_id -> consecutive failure count
+open_until = {}  # chat_id -> timestamp the chat is parked until
+probe_started = {}  # chat_id -> timestamp the half-open probe was let through
+
+def is_chat_available(chat_id):
+    parked_until = open_until.get(chat_id)
+    if parked_until is None:
+        return True
+    now = time.time()
+    if now < parked_until:
+        return False
+    # Half-open: let one probe through
+    if now - probe_started.get(chat_id, 0) < CIRCUIT_BREAKER_COOLDOWN:
+        return False
+    probe_started[chat_id] = now
+    return True
+
+def seconds_until_available(chat_id):
+    return max(0.0, open_until.get(chat_id, 0) - time.time())
+
+def record_success(chat_id):
+    if chat_id in open_until:
+        print(f"🔌 [Breaker] Chat {chat_id} recovered, closing circuit")
+    chat_failures.pop(chat_id, None)
+    open_until.pop(chat_id, None)
+    probe_started.pop(chat_id, None)
+
+def record_failure(chat_id):
+    failures = chat_failures.get(chat_id, 0) + 1
+    chat_failures[chat_id] = failures
+    probe_started.pop(chat_id, None)
+    if failures >= CIRCUIT_BREAKER_THRESHOLD:
+        open_until[chat_id] = time.time() + CIRCUIT_BREAKER_COOLDOWN
+        print(f"🚧 [Breaker] Chat {chat_id} failed {failures} times, parked for {CIRCUIT_BREAKER_COOLDOWN}s")
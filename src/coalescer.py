@@ -0,0 +1,41 @@
+"""
+Time-window coalescer: collects items that share a key and flushes them together.
+
+The window starts with the first item of a group, so that item is never held
+back longer than `window` seconds no matter how many others join it.
+"""
+import asyncio
+
+class Coalescer:
+    def __init__(self, window, flush_func, name="coalescer"):
+        """flush_func(key, items) is awaited once per group when its window closes."""
+        self.window = window
+        self.flush_func = flush_func
+        self.name = name
+        self.pending = {}  # key -> [items]
+        self.flush_tasks = set()
+        self.groups_flushed = 0
+        self.items_flushed = 0
+
+    def add(self, key, item):
+        if key in self.pending:
+            self.pending[key].append(item)
+            return
+        self.pending[key] = [item]
+        task = asyncio.create_task(self._flush_later(key))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def _flush_later(self, key):
+        await asyncio.sleep(self.window)
+        items = self.pending.pop(key, [])
+        if not items:
+            return
+        self.groups_flushed += 1
+        self.items_flushed += len(items)
+        if len(items) > 1:
+            print(f"🧲 [{self.name}] Coalesced {len(items)} items for {key}")
+        try:
+            await self.flush_func(key, items)
+        except Exception as e:
+            print(f"❌ [{self.name}] Flush failed for {key}: {e}")
@@ -1,9 +1,36 @@
 import os
-from dotenv import dotenv_values
 
-# Load .env file contents into a dictionary without setting them as environment variables.
+from src.languages import LANGUAGES
+
+# .env file contents as a dictionary, without setting them as environment variables.
 # This bypasses the Windows character limit for environment variables.
-config = dotenv_values()
+# Parsed on the first lookup that os.environ can't answer. Most settings below
+# are optional, so that happens on import almost always; only when there is no
+# .env file at all is dotenv never imported.
+config = None
+
+def find_dotenv_path() -> str | None:
+    """The .env that dotenv_values() would load: the nearest one from this package's directory up."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def get_dotenv_config() -> dict:
+    global config
+    if config is None:
+        path = find_dotenv_path()
+        if path is None:
+            config = {}
+        else:
+            from dotenv import dotenv_values
+            config = dotenv_values(path)
+    return config
 
 def get_config_value(key: str) -> str | None:
     """
@@ -11,12 +38,13 @@ def get_config_value(key: str) -> str | None:
     then falling back to the parsed .env file from dotenv_values().
     This allows system environment variables to override .env files.
     """
-    return os.environ.get(key) or config.get(key)
+    return os.environ.get(key) or get_dotenv_config().get(key)
 
 # Get all required configuration values using the helper
 OPENROUTER_API_KEY = get_config_value("OPENROUTER_API_KEY")
 YOUR_SITE_URL = get_config_value("YOUR_SITE_URL")
 YOUR_SITE_NAME = get_config_value("YOUR_SITE_NAME")
+OPENROUTER_BASE_URL = get_config_value("OPENROUTER_BASE_URL") or "https://openrouter.ai/api/v1"
 TELEGRAM_BOT_TOKEN = get_config_value("TELEGRAM_BOT_TOKEN")
 
 # Legacy: General chat IDs (for backward compatibility)
@@ -28,14 +56,90 @@ TELEGRAM_CHAT_ID_HEBREW = get_config_value("TELEGRAM_CHAT_ID_HEBREW")
 TELEGRAM_CHAT_ID_ENGLISH = get_config_value("TELEGRAM_CHAT_ID_ENGLISH")
 TELEGRAM_CHAT_ID_SPANISH = get_config_value("TELEGRAM_CHAT_ID_SPANISH")
 
-# Language code to chat ID mapping
+# Language code to chat ID mapping, one TELEGRAM_CHAT_ID_<NAME> per registered language (src/languages.py)
 LANGUAGE_CHAT_IDS = {}
-if TELEGRAM_CHAT_ID_HEBREW:
-    LANGUAGE_CHAT_IDS['he'] = TELEGRAM_CHAT_ID_HEBREW
-if TELEGRAM_CHAT_ID_ENGLISH:
-    LANGUAGE_CHAT_IDS['en'] = TELEGRAM_CHAT_ID_ENGLISH
-if TELEGRAM_CHAT_ID_SPANISH:
-    LANGUAGE_CHAT_IDS['es'] = TELEGRAM_CHAT_ID_SPANISH
+for language_code, language in LANGUAGES.items():
+    if get_config_value(language["chat_id_key"]):
+        LANGUAGE_CHAT_IDS[language_code] = get_config_value(language["chat_id_key"])
+
+# Target languages per multi-language translation call; chunks run in parallel. 1 (one call per language,
+# all in parallel) is fastest; more trades latency for fewer calls (see benchmark_languages.py)
+TRANSLATION_LANGUAGES_PER_CALL = int(get_config_value("TRANSLATION_LANGUAGES_PER_CALL") or 1)
+
+# Detect the source language of channel and webhook news locally instead of trusting the declared one
+LANGUAGE_DETECTION = (get_config_value("LANGUAGE_DETECTION") or "true").lower() in ("1", "true", "yes")
+# Confident detections a channel needs before its language is used for posts too short to detect
+LANGUAGE_LEARN_MIN_SAMPLES = int(get_config_value("LANGUAGE_LEARN_MIN_SAMPLES") or 5)
+
+# Per-destination send deadline (seconds) when fanning out to language groups
+LANGUAGE_SEND_TIMEOUT = float(get_config_value("LANGUAGE_SEND_TIMEOUT") or 30)
+
+# Bot API endpoint override (e.g. a local Bot API server)
+TELEGRAM_API_BASE_URL = get_config_value("TELEGRAM_API_BASE_URL")
+
+# Subscriber broadcast
+SUBSCRIBERS_FILE = get_config_value("SUBSCRIBERS_FILE") or "subscribers.json"
+BROADCAST_WORKERS = int(get_config_value("BROADCAST_WORKERS") or 16)
+BROADCAST_GLOBAL_RATE = float(get_config_value("BROADCAST_GLOBAL_RATE") or 25)  # Telegram allows ~30 msg/s per bot
+BROADCAST_PER_CHAT_INTERVAL = float(get_config_value("BROADCAST_PER_CHAT_INTERVAL") or 1.0)
+
+# Processing work queues (Telethon/webhook ingest -> workers)
+ALERT_WORKERS = int(get_config_value("ALERT_WORKERS") or 4)
+NEWS_WORKERS = int(get_config_value("NEWS_WORKERS") or 2)
+ALERT_QUEUE_SIZE = int(get_config_value("ALERT_QUEUE_SIZE") or 200)
+NEWS_QUEUE_SIZE = int(get_config_value("NEWS_QUEUE_SIZE") or 100)
+# Threads for blocking LLM calls; enough for every alert and news worker to translate all languages at once
+LLM_THREADS = int(get_config_value("LLM_THREADS") or 32)
+NEWS_ENQUEUE_TIMEOUT = float(get_config_value("NEWS_ENQUEUE_TIMEOUT") or 5)
+
+# Catch-up of messages missed while the Telethon listener was disconnected
+CHANNEL_STATE_PATH = get_config_value("CHANNEL_STATE_PATH") or "channel_state.json"
+CATCHUP_MAX_MESSAGES = int(get_config_value("CATCHUP_MAX_MESSAGES") or 500)
+CATCHUP_MAX_ALERT_AGE = int(get_config_value("CATCHUP_MAX_ALERT_AGE") or 300)  # Older alerts are summarized
+
+# Alert burst coalescing window in seconds (0 = process every alert on its own)
+ALERT_COALESCE_WINDOW = float(get_config_value("ALERT_COALESCE_WINDOW") or 0)
+
+# News channel posts: album fragments (same grouped_id) are joined within this window;
+# NEWS_BURST_WINDOW > 0 also joins separate messages posted within that many seconds
+NEWS_ALBUM_WINDOW = float(get_config_value("NEWS_ALBUM_WINDOW") or 1.5)
+NEWS_BURST_WINDOW = float(get_config_value("NEWS_BURST_WINDOW") or 0)
+
+# Delta translation of alerts against recent alerts (opt-in: reused segments use the segment prompt, not the alert prompt)
+ALERT_DELTA_TRANSLATION = (get_config_value("ALERT_DELTA_TRANSLATION") or "").lower() in ("1", "true", "yes")
+ALERT_HISTORY_SIZE = int(get_config_value("ALERT_HISTORY_SIZE") or 20)
+
+# Webhook requests answer 202 with a job id; sync mode waits for the result like before
+WEBHOOK_SYNC_MODE = (get_config_value("WEBHOOK_SYNC_MODE") or "").lower() in ("1", "true", "yes")
+
+# Bulk webhook: max items per request, and news items summarized/translated per LLM call
+BULK_MAX_ITEMS = int(get_config_value("BULK_MAX_ITEMS") or 500)
+BULK_LLM_BATCH_SIZE = int(get_config_value("BULK_LLM_BATCH_SIZE") or 8)
+
+# Tracing: JSON lines file and/or OTLP/HTTP endpoint (e.g. http://localhost:4318/v1/traces); alerts are always sampled
+TRACE_EXPORT_PATH = get_config_value("TRACE_EXPORT_PATH") or ""
+TRACE_OTLP_ENDPOINT = get_config_value("TRACE_OTLP_ENDPOINT") or ""
+TRACE_SAMPLE_RATE = float(get_config_value("TRACE_SAMPLE_RATE") or 0.1)
+
+# Opt-in event loop watchdog: logs the stack whenever the loop is blocked longer than the threshold
+LOOP_WATCHDOG = (get_config_value("LOOP_WATCHDOG") or "").lower() in ("1", "true", "yes")
+LOOP_LAG_THRESHOLD = float(get_config_value("LOOP_LAG_THRESHOLD") or 0.1)
+LOOP_WATCHDOG_INTERVAL = float(get_config_value("LOOP_WATCHDOG_INTERVAL") or 0.02)
+
+# Delivery ledger and retries
+DELIVERY_LEDGER_PATH = get_config_value("DELIVERY_LEDGER_PATH") or "delivery_ledger.db"
+SEND_MAX_ATTEMPTS = int(get_config_value("SEND_MAX_ATTEMPTS") or 3)
+DELIVERY_RETRY_MAX_AGE = int(get_config_value("DELIVERY_RETRY_MAX_AGE") or 600)  # Don't resend stale messages
+CIRCUIT_BREAKER_THRESHOLD = int(get_config_value("CIRCUIT_BREAKER_THRESHOLD") or 3)
+CIRCUIT_BREAKER_COOLDOWN = int(get_config_value("CIRCUIT_BREAKER_COOLDOWN") or 300)
+
+# Multi-process mode (main.py --workers N): ingest -> processing workers -> delivery over a SQLite task queue
+PROCESS_WORKERS = int(get_config_value("PROCESS_WORKERS") or 0)  # 0 = everything in one process
+TASK_QUEUE_PATH = get_config_value("TASK_QUEUE_PATH") or "task_queue.db"
+WORKER_CONCURRENCY = int(get_config_value("WORKER_CONCURRENCY") or 4)  # Tasks in flight per processing worker
+DELIVERY_CONCURRENCY = int(get_config_value("DELIVERY_CONCURRENCY") or 32)
+TASK_POLL_INTERVAL = float(get_config_value("TASK_POLL_INTERVAL") or 0.02)
+TASK_LEASE_SECONDS = float(get_config_value("TASK_LEASE_SECONDS") or 300)  # Requeue tasks of a crashed process after this
 
 # RSS Feeds
 #RSS_FEEDS_STR = get_config_value("RSS_FEEDS") or ""
@@ -54,10 +158,34 @@ if RSS_FEEDS_STR:
     except IndexError:
         print("Warning: Could not parse RSS_FEEDS. Ensure it's in the format 'url1:lang1,url2:lang2'")
 
+# Streaming RSS pipeline: workers per stage and the bounded queue size between stages
+RSS_FETCH_CONCURRENCY = int(get_config_value("RSS_FETCH_CONCURRENCY") or 4)
+RSS_RATE_CONCURRENCY = int(get_config_value("RSS_RATE_CONCURRENCY") or 2)
+# Selected articles summarized/translated at once; sends still go out in rating order
+RSS_PROCESS_CONCURRENCY = int(get_config_value("RSS_PROCESS_CONCURRENCY") or 3)
+RSS_STAGE_QUEUE_SIZE = int(get_config_value("RSS_STAGE_QUEUE_SIZE") or 10)
+RSS_MAX_ARTICLES = int(get_config_value("RSS_MAX_ARTICLES") or 1)  # Articles sent per cycle
+# Feeds rated after the best candidate before it is selected without waiting for the rest (0 = wait for every feed)
+RSS_SELECT_LOOKAHEAD = int(get_config_value("RSS_SELECT_LOOKAHEAD") or 2)
+# Write-ahead journal of selected articles, so a restart resumes their LLM work (src/journal.py)
+JOURNAL_PATH = get_config_value("JOURNAL_PATH") or "rss_journal.jsonl"
+JOURNAL_FLUSH_INTERVAL = float(get_config_value("JOURNAL_FLUSH_INTERVAL") or 0.2)
+JOURNAL_COMPACT_THRESHOLD = int(get_config_value("JOURNAL_COMPACT_THRESHOLD") or 500)
+
+# Digest mode: one multi-article message per language instead of one message per article
+DIGEST_MODE = (get_config_value("DIGEST_MODE") or "").lower() in ("1", "true", "yes")
+DIGEST_TOP_K = int(get_config_value("DIGEST_TOP_K") or 5)
+DIGEST_WINDOW_MINUTES = int(get_config_value("DIGEST_WINDOW_MINUTES") or 0)  # 0 = send every cycle
+
 # Telegram User Credentials for Telethon
 TELEGRAM_API_ID = get_config_value("TELEGRAM_API_ID")
 TELEGRAM_API_HASH = get_config_value("TELEGRAM_API_HASH")
 TELEGRAM_SESSION_DATA = get_config_value("TELEGRAM_SESSION_DATA")
+# "memory" restores TELEGRAM_SESSION_DATA into an in-memory session (src/telethon_session.py),
+# "file" writes alert_session.session and lets Telethon keep it in SQLite like before
+TELETHON_SESSION_MODE = (get_config_value("TELETHON_SESSION_MODE") or "memory").lower()
+TELETHON_SNAPSHOT_PATH = get_config_value("TELETHON_SNAPSHOT_PATH") or "telethon_session.json"  # Holds the auth key
+TELETHON_SNAPSHOT_INTERVAL = float(get_config_value("TELETHON_SNAPSHOT_INTERVAL") or 60)
 
 def get_channel_entity(key: str, default: str = "") -> str | int:
     """
@@ -68,7 +196,10 @@ def get_channel_entity(key: str, default: str = "") -> str | int:
     value = get_config_value(key)
     if not value:
         return default
-    
+    return get_channel_entity_value(value)
+
+def get_channel_entity_value(value: str) -> str | int:
+    """Converts a raw channel string to an int id when numeric, else keeps the username."""
     try:
         # Try to convert to integer (for channel IDs like -100...)
         return int(value)
@@ -82,6 +213,9 @@ SOURCE_ALERT_CHANNEL = get_channel_entity("SOURCE_ALERT_CHANNEL", "PikudHaOref_a
 # News Channel Configuration (for real-time summarization)
 SOURCE_NEWS_CHANNEL = get_channel_entity("SOURCE_NEWS_CHANNEL")
 
+# Additional source channels: "channel:kind:lang:priority,..." (see src/channels.py)
+SOURCE_CHANNELS_STR = get_config_value("SOURCE_CHANNELS") or ""
+
 # Global runtime configuration (set by main.py command line args)
 DEV_MODE = False  # When True, show translations in console instead of sending to Telegram
 DEBUG_MODE = False  # When True, enable verbose logging
@@ -0,0 +1,139 @@
+"""
+Persistent delivery ledger for outgoing Telegram messages.
+
+Every send to a chat is recorded as one row keyed by (chat_id, text):
+pending -> sent (with Telegram message_id) | failed (with reason) | unknown.
+'unknown' means the request timed out and may have been delivered; it is
+never resent automatically, so timeouts can't cause double posts.
+
+The functions are blocking (each write is a commit); callers on the event
+loop run them with asyncio.to_thread. The connection is shared between those
+worker threads and guarded by a lock.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+from src.config import DELIVERY_LEDGER_PATH
+
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+UNKNOWN = 'unknown'
+
+_connection = None
+_lock = threading.RLock()
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(DELIVERY_LEDGER_PATH, check_same_thread=False)
+        _connection.row_factory = sqlite3.Row
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                key TEXT PRIMARY KEY,
+                chat_id TEXT NOT NULL,
+                label TEXT,
+                text TEXT NOT NULL,
+                parse_mode TEXT,
+                status TEXT NOT NULL,
+                message_id INTEGER,
+                reason TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        _connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_due ON deliveries (status, next_attempt_at)"
+        )
+        _connection.commit()
+    return _connection
+
+def delivery_key(text, chat_id):
+    return hashlib.md5(f"{chat_id}:{text}".encode()).hexdigest()
+
+def get_delivery(key):
+    with _lock:
+        row = _get_connection().execute("SELECT * FROM deliveries WHERE key = ?", (key,)).fetchone()
+    return dict(row) if row else None
+
+def record_pending(key, chat_id, text, parse_mode=None, label=None):
+    """Creates the ledger row if it doesn't exist yet; existing rows are kept."""
+    now = time.time()
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            """INSERT OR IGNORE INTO deliveries
+               (key, chat_id, label, text, parse_mode, status, attempts, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)""",
+            (key, str(chat_id), label, text, parse_mode, PENDING, now, now)
+        )
+        conn.commit()
+
+def begin_delivery(key, chat_id, text, parse_mode=None, label=None):
+    """
+    The existing ledger row for key (or None), creating a pending row if there
+    was none. One lock and one commit for the lookup a send starts with.
+    """
+    with _lock:
+        existing = get_delivery(key)
+        if existing is None:
+            record_pending(key, chat_id, text, parse_mode, label)
+    return existing
+
+def _update(key, **fields):
+    fields['updated_at'] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _lock:
+        conn = _get_connection()
+        conn.execute(f"UPDATE deliveries SET {assignments} WHERE key = ?", (*fields.values(), key))
+        conn.commit()
+
+def record_attempt(key):
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "UPDATE deliveries SET attempts = attempts + 1, updated_at = ? WHERE key = ?",
+            (time.time(), key)
+        )
+        conn.commit()
+
+def mark_sent(key, message_id=None):
+    _update(key, status=SENT, message_id=message_id, reason=None, next_attempt_at=None)
+
+def mark_unknown(key, reason):
+    _update(key, status=UNKNOWN, reason=reason, next_attempt_at=None)
+
+def mark_failed(key, reason):
+    _update(key, status=FAILED, reason=reason, next_attempt_at=None)
+
+def schedule_retry(key, reason, delay):
+    _update(key, status=PENDING, reason=reason, next_attempt_at=time.time() + delay)
+
+def get_due_retries(now=None):
+    now = now or time.time()
+    with _lock:
+        rows = _get_connection().execute(
+            """SELECT * FROM deliveries
+               WHERE status = ? AND next_attempt_at IS NOT NULL AND next_attempt_at <= ?
+               ORDER BY next_attempt_at""",
+            (PENDING, now)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+def prune_ledger(max_age=24 * 60 * 60):
+    cutoff = time.time() - max_age
+    with _lock:
+        conn = _get_connection()
+        cursor = conn.execute(
+            "DELETE FROM deliveries WHERE updated_at < ? AND status != ?", (cutoff, PENDING)
+        )
+        conn.commit()
+    if cursor.rowcount > 0:
+        print(f"🧹 [Ledger] Pruned {cursor.rowcount} old deliveries")
+    return cursor.rowcount
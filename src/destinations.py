@@ -0,0 +1,50 @@
+"""
+Which languages have somewhere to go, per content type.
+
+Alerts and news go to the language groups (LANGUAGE_CHAT_IDS) and to the
+subscribers of that language and content type. RSS articles and digests only
+go to the language groups. The translators ask get_target_languages() instead
+of translating into every supported language, so no LLM call is made for a
+language nobody receives.
+
+The sets are built on first use and again after the subscriber list changes.
+Dev mode translates into every supported language, since it prints them all.
+"""
+from src.config import LANGUAGE_CHAT_IDS
+from src.languages import LANGUAGES
+from src import subscribers
+
+SUPPORTED_LANGUAGES = tuple(LANGUAGES)
+
+target_languages = None  # content type -> set of language codes with at least one destination; None = stale
+
+def refresh_target_languages():
+    global target_languages
+    groups = {lang for lang in LANGUAGE_CHAT_IDS if lang in SUPPORTED_LANGUAGES}
+    refreshed = {
+        content_type: groups | (subscribers.get_subscribed_languages(content_type) & set(SUPPORTED_LANGUAGES))
+        for content_type in subscribers.CONTENT_TYPES
+    }
+    refreshed['rss'] = groups
+    target_languages = refreshed
+    return target_languages
+
+def invalidate_target_languages():
+    global target_languages
+    target_languages = None
+
+def get_all_target_languages():
+    return target_languages if target_languages is not None else refresh_target_languages()
+
+def print_target_languages():
+    print("🎯 Target languages: " + ", ".join(
+        f"{content_type} {'/'.join(sorted(langs)) or 'none'}" for content_type, langs in get_all_target_languages().items()
+    ))
+
+def get_target_languages(content_type, source_lang=None):
+    """Sorted languages to translate `content_type` into (the source language excluded)."""
+    from src.config import DEV_MODE  # Import dynamically to get current value
+    langs = set(SUPPORTED_LANGUAGES) if DEV_MODE else get_all_target_languages().get(content_type, set())
+    return sorted(langs - {source_lang})
+
+subscribers.change_listeners.append(invalidate_target_languages)
@@ -0,0 +1,76 @@
+"""
+In-memory job store for webhook requests processed by the background workers.
+
+A job moves queued -> running -> done | failed (or dropped when the queue is
+full). Finished jobs are kept for JOB_RETENTION seconds so callers can poll
+GET /jobs/{id}.
+"""
+import time
+import uuid
+
+JOB_RETENTION = 60 * 60  # 1 hour
+
+jobs = {}  # job_id -> job dict
+jobs_by_message = {}  # (kind, message_id) -> job_id, for in-flight dedup
+
+def create_job(kind, message_id=None):
+    now = time.time()
+    job = {
+        "id": uuid.uuid4().hex,
+        "kind": kind,
+        "message_id": message_id,
+        "status": "queued",
+        "created_at": now,
+        "updated_at": now,
+        "result": None,
+        "error": None,
+    }
+    jobs[job["id"]] = job
+    if message_id:
+        jobs_by_message[(kind, message_id)] = job["id"]
+    return job
+
+def get_job(job_id):
+    return jobs.get(job_id)
+
+def find_active_job(kind, message_id):
+    """Returns the queued/running job for this message, if any."""
+    if not message_id:
+        return None
+    job = jobs.get(jobs_by_message.get((kind, message_id)))
+    if job and job["status"] in ("queued", "running"):
+        return job
+    return None
+
+def update_job(job_id, status, result=None, error=None):
+    job = jobs.get(job_id)
+    if not job:
+        return
+    job["status"] = status
+    job["updated_at"] = time.time()
+    if result is not None:
+        job["result"] = result
+    if error is not None:
+        job["error"] = error
+
+async def run_job(job_id, func, *args, **kwargs):
+    """Worker-side wrapper that records the job's progress and outcome."""
+    update_job(job_id, "running")
+    try:
+        result = await func(*args, **kwargs)
+    except Exception as e:
+        update_job(job_id, "failed", error=str(e))
+        raise
+    success = not isinstance(result, dict) or result.get("success", True)
+    update_job(job_id, "done" if success else "failed", result=result)
+    return result
+
+def cleanup_jobs():
+    cutoff = time.time() - JOB_RETENTION
+    for job_id in [job_id for job_id, job in jobs.items()
+                   if job["updated_at"] < cutoff and job["status"] not in ("queued", "running")]:
+        job = jobs.pop(job_id)
+        key = (job["kind"], job["message_id"])
+        # A newer job for the same message owns the index entry now
+        if job["message_id"] and jobs_by_message.get(key) == job_id:
+            del jobs_by_message[key]
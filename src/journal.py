@@ -0,0 +1,188 @@
+"""
+Write-ahead journal for selected RSS articles.
+
+Each article's progress is appended as one JSON line per step: selected (with
+the article and its rating), summarized, translated (per language), sent (per
+language group) and done. After a restart load_journal() rebuilds the
+articles that never reached done, and the RSS cycle resumes them from their
+last completed step instead of paying for the LLM work again.
+
+record() only buffers. A background flusher appends and fsyncs the buffer
+every JOURNAL_FLUSH_INTERVAL seconds; await sync() to wait for it (e.g. before
+a send). Once the file holds JOURNAL_COMPACT_THRESHOLD records it is
+rewritten in the background with one snapshot line per unfinished article.
+"""
+import asyncio
+import json
+import os
+import time
+
+from src.config import JOURNAL_PATH, JOURNAL_FLUSH_INTERVAL, JOURNAL_COMPACT_THRESHOLD
+
+ARTICLE_FIELDS = ('title', 'summary', 'link', 'id', 'source_lang', 'source_type', 'source_name', 'clean_summary')
+
+live_items = {}  # item id -> {"article", "rating", "summary", "translations", "sent", "selected_at"}
+buffer = []  # records not yet on disk
+waiters = []  # (records recorded when sync() was called, future), resolved once that many are written
+recorded = 0  # records ever passed to record()
+written = 0  # records whose write has finished; behind `recorded` while a flush is in progress
+records_on_disk = 0
+flusher_task = None
+compaction_task = None
+io_lock = None
+loaded = False
+
+def _apply(record):
+    item_id = record["id"]
+    step = record["step"]
+    if step == "selected":
+        live_items[item_id] = {
+            "article": record["article"], "rating": record["rating"], "summary": None,
+            "translations": {}, "sent": [], "selected_at": record["ts"],
+        }
+    elif step == "snapshot":
+        live_items[item_id] = record["state"]
+    elif item_id not in live_items:
+        return
+    elif step == "summarized":
+        live_items[item_id]["summary"] = record["summary"]
+    elif step == "translated":
+        live_items[item_id]["translations"][record["lang"]] = record["text"]
+    elif step == "sent":
+        if record["lang"] not in live_items[item_id]["sent"]:
+            live_items[item_id]["sent"].append(record["lang"])
+    elif step == "done":
+        del live_items[item_id]
+
+def load_journal():
+    """Replays the journal file into live_items (once per process)."""
+    global loaded, records_on_disk
+    if loaded:
+        return live_items
+    loaded = True
+    if not os.path.exists(JOURNAL_PATH):
+        return live_items
+    with open(JOURNAL_PATH, encoding='utf-8') as f:
+        for line in f:
+            try:
+                _apply(json.loads(line))
+                records_on_disk += 1
+            except (ValueError, KeyError):
+                # A torn last line from a crash mid-write; everything before it is intact
+                print(f"⚠️  [Journal] Skipping unreadable record in {JOURNAL_PATH}")
+    if live_items:
+        print(f"📓 [Journal] {len(live_items)} unfinished articles in {JOURNAL_PATH}")
+    return live_items
+
+def _ensure_flusher():
+    global flusher_task
+    if flusher_task is None or flusher_task.done():
+        flusher_task = asyncio.create_task(_flush_soon())
+
+def record(item_id, step, **fields):
+    """Applies a step to the in-memory state and queues it for the next flush."""
+    if not item_id:
+        return
+    entry = {"id": item_id, "step": step, "ts": time.time(), **fields}
+    global recorded
+    _apply(entry)
+    buffer.append(json.dumps(entry, ensure_ascii=False, default=str))
+    recorded += 1
+    _ensure_flusher()
+
+def record_selected(item_id, article, rating):
+    record(item_id, "selected", article={key: article[key] for key in ARTICLE_FIELDS if key in article}, rating=rating)
+
+def get_item(item_id):
+    return live_items.get(item_id)
+
+async def sync():
+    """Waits until everything recorded so far is on disk, including records a flush in progress is writing."""
+    if written >= recorded:
+        return
+    future = asyncio.get_running_loop().create_future()
+    waiters.append((recorded, future))
+    _ensure_flusher()
+    await future
+
+def _get_io_lock():
+    global io_lock
+    if io_lock is None:
+        io_lock = asyncio.Lock()
+    return io_lock
+
+def _append(lines):
+    with open(JOURNAL_PATH, 'a', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def _rewrite(lines):
+    temp_path = f"{JOURNAL_PATH}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        if lines:
+            f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, JOURNAL_PATH)
+
+def _resolve(count, error=None):
+    """Marks the next `count` buffered records as written and wakes the syncs they were holding up."""
+    global written
+    written += count
+    for target, future in waiters[:]:
+        if target > written:
+            continue
+        waiters.remove((target, future))
+        if future.done():
+            continue
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+
+async def _flush_soon():
+    # Everything recorded during the interval goes out in one write + fsync
+    global records_on_disk, compaction_task
+    while buffer or waiters:
+        await asyncio.sleep(JOURNAL_FLUSH_INTERVAL)
+        async with _get_io_lock():
+            lines = buffer[:]
+            del buffer[:len(lines)]
+            if not lines:
+                _resolve(0)
+                continue
+            try:
+                await asyncio.to_thread(_append, lines)
+            except OSError as e:
+                print(f"❌ [Journal] Could not write {JOURNAL_PATH}: {e}")
+                _resolve(len(lines), e)
+                continue
+            records_on_disk += len(lines)
+            _resolve(len(lines))
+        if records_on_disk >= JOURNAL_COMPACT_THRESHOLD and (compaction_task is None or compaction_task.done()):
+            compaction_task = asyncio.create_task(compact())
+
+async def compact():
+    """Rewrites the journal as one snapshot per unfinished article, in a worker thread."""
+    global records_on_disk
+    async with _get_io_lock():
+        # The snapshot already covers anything still buffered
+        lines = [
+            json.dumps({"id": item_id, "step": "snapshot", "ts": time.time(), "state": state}, ensure_ascii=False, default=str)
+            for item_id, state in live_items.items()
+        ]
+        pending = buffer[:]
+        buffer.clear()
+        before = records_on_disk
+        try:
+            await asyncio.to_thread(_rewrite, lines)
+        except OSError as e:
+            # The old file is untouched; the next flush appends what was buffered
+            print(f"❌ [Journal] Compaction failed: {e}")
+            buffer[:0] = pending
+            _ensure_flusher()
+            return
+        records_on_disk = len(lines)
+        _resolve(len(pending))
+    print(f"🗜️  [Journal] Compacted {before} records into {len(lines)}")
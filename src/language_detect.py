@@ -0,0 +1,137 @@
+"""
+Local source-language detection for news at ingest (no LLM call).
+
+Non-Latin scripts decide on their own: the script with most letters wins
+(Hebrew, Arabic, Cyrillic -> Russian). Latin text is scored against a compact
+character-trigram profile per language (English, Spanish, French), plus a few
+characters that only one of them uses. Only the first SAMPLE_CHARS characters
+are looked at, so a call takes tens of microseconds.
+
+resolve_source_language() is what ingest uses. A confident detection wins.
+Otherwise the channel's learned language is used, then the declared
+language, then the default. Confident detections are counted per channel, so
+a channel that always posts in one language is learned even when a
+particular post is too short to tell.
+"""
+import re
+from collections import Counter
+
+from src.config import LANGUAGE_DETECTION, LANGUAGE_LEARN_MIN_SAMPLES
+from src.metrics import LANGUAGE_DETECTIONS
+
+SAMPLE_CHARS = 400
+MIN_LETTERS = 8  # Fewer letters than this is never a confident detection
+MIN_CONFIDENCE = 0.3
+LEARNED_SHARE = 0.8  # Share of a channel's detections one language needs to count as learned
+MAX_CHANNEL_SAMPLES = 200  # Counts are halved past this, so a channel that switches language is relearned
+
+SCRIPT_PATTERNS = {
+    'he': re.compile(r'[֐-׿]'),
+    'ar': re.compile(r'[؀-ۿݐ-ݿ]'),
+    'ru': re.compile(r'[Ѐ-ӿ]'),
+}
+LATIN_WORD = re.compile(r'[a-zß-öø-ÿœ]+')
+IGNORED = re.compile(r'https?://\S+|www\.\S+|[@#]\w+')
+CHARACTER_HINTS = {'ñ': 'es', '¿': 'es', '¡': 'es', 'ç': 'fr', 'è': 'fr', 'ê': 'fr', 'à': 'fr', 'ù': 'fr', 'œ': 'fr'}
+HINT_PATTERN = re.compile(f"[{''.join(CHARACTER_HINTS)}]")
+HINT_WEIGHT = 2.0
+
+# Most frequent trigrams of news text, most frequent first ('_' = word boundary)
+TRIGRAM_PROFILES = {
+    'en': "_th the he_ _an and nd_ _of of_ _to to_ _in ing ng_ in_ ed_ er_ _a_ is_ ion hat tha at_ es_ _is "
+          "_wa was _fo for or_ on_ ent re_ ere _be ter ly_ his _he al_ tio ati st_ _wh _re _on _ha ith wit _wi "
+          "are _it it_ ers ve_ _sa aid sai id_ _pr _co ate _ex _us _ne ew_ new",
+    'es': "_de de_ os_ _la la_ el_ _el es_ _en en_ ión ón_ ado que _qu ue_ as_ ent ien _co con ara par _pa "
+          "los _lo ar_ _se del _y_ ada cia nte por _po una _un _re al_ io_ sta _es est _ha _ca _su ido _al "
+          "ció as_ ero ne_ res dos _di _pr _mi",
+    'fr': "_de de_ es_ le_ _le ent _la la_ _et et_ les _qu que ue_ des ion nt_ re_ _pa on_ _du du_ ur_ "
+          "ait tio our _po pou _un une eur ans men est _en lle ne_ ons _se _ce _d' _l' _a_ _au aux ux_ "
+          "ais _il il_ _pr res _co _re _ré",
+}
+
+def _build_trigram_table():
+    table = {}  # trigram -> ((lang, weight), ...)
+    for lang, profile in TRIGRAM_PROFILES.items():
+        trigrams = [trigram.replace('_', ' ') for trigram in profile.split()]
+        for rank, trigram in enumerate(trigrams):
+            table.setdefault(trigram, []).append((lang, 1.0 - rank / len(trigrams)))
+    return {trigram: tuple(weights) for trigram, weights in table.items()}
+
+TRIGRAM_TABLE = _build_trigram_table()
+
+channel_languages = {}  # channel key -> Counter of confidently detected languages
+
+def _detect_latin(sample, letters):
+    scores = dict.fromkeys(TRIGRAM_PROFILES, 0.0)
+    for word in letters:
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            for lang, weight in TRIGRAM_TABLE.get(padded[i:i + 3], ()):
+                scores[lang] += weight
+    for hint in HINT_PATTERN.findall(sample):
+        scores[CHARACTER_HINTS[hint]] += HINT_WEIGHT
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, second_score) = ranked[0], ranked[1]
+    if best_score <= 0:
+        return None, 0.0
+    return best, (best_score - second_score) / best_score
+
+def detect_language(text):
+    """(language code, confidence 0-1) of text, or (None, 0.0) when there's nothing to go on."""
+    sample = IGNORED.sub(' ', (text or '')[:SAMPLE_CHARS]).lower()
+    script_letters = {lang: len(pattern.findall(sample)) for lang, pattern in SCRIPT_PATTERNS.items()}
+    words = LATIN_WORD.findall(sample)
+    latin_letters = sum(len(word) for word in words)
+    script, script_count = max(script_letters.items(), key=lambda item: item[1])
+    total = latin_letters + sum(script_letters.values())
+    if total < MIN_LETTERS:
+        return None, 0.0
+    if script_count >= latin_letters:
+        return script, script_count / total
+    lang, margin = _detect_latin(sample, words)
+    return lang, margin * latin_letters / total
+
+def record_channel_language(channel, lang):
+    counts = channel_languages.setdefault(channel, Counter())
+    counts[lang] += 1
+    if sum(counts.values()) > MAX_CHANNEL_SAMPLES:
+        for key in list(counts):
+            counts[key] //= 2
+        counts += Counter()  # Drops languages that reached zero
+
+def get_learned_language(channel):
+    counts = channel_languages.get(channel)
+    if not counts:
+        return None
+    lang, count = counts.most_common(1)[0]
+    total = sum(counts.values())
+    if total >= LANGUAGE_LEARN_MIN_SAMPLES and count / total >= LEARNED_SHARE:
+        return lang
+    return None
+
+def get_channel_language_stats():
+    return {
+        channel: {"learned": get_learned_language(channel), "counts": dict(counts)}
+        for channel, counts in channel_languages.items()
+    }
+
+def resolve_source_language(text, channel, declared=None, default='es'):
+    """
+    Source language of a news text from `channel`: a confident local detection,
+    else the channel's learned language, else `declared`, else `default`.
+    """
+    if not LANGUAGE_DETECTION:
+        return declared or default
+    lang, confidence = detect_language(text)
+    if lang and confidence >= MIN_CONFIDENCE:
+        record_channel_language(channel, lang)
+        outcome = "detected"
+    else:
+        lang = get_learned_language(channel)
+        outcome = "learned"
+        if not lang:
+            lang, outcome = (declared, "declared") if declared else (default, "default")
+    if outcome == "detected" and declared and lang != declared and get_learned_language(channel) != lang:
+        print(f"🔤 [{channel}] Source language is {lang.upper()} ({outcome}), not {declared.upper()}")
+    LANGUAGE_DETECTIONS.inc(outcome=outcome, lang=lang)
+    return lang
@@ -0,0 +1,36 @@
+"""
+Language registry: every output language the bot supports, in one place.
+
+Each entry gives the English name (used in prompts and logs), the flag emoji
+and the setting that holds the chat id of that language's Telegram group.
+Names, emojis, chat routing (LANGUAGE_CHAT_IDS) and translation targets
+(src/destinations.py) all come from here. Adding a language means adding one
+entry and setting its chat id, e.g. TELEGRAM_CHAT_ID_FRENCH=-100...
+
+Only languages with a group or subscribers are translated into, so unused
+entries cost nothing.
+"""
+
+LANGUAGES = {
+    'he': {"name": "Hebrew", "emoji": "🇮🇱", "chat_id_key": "TELEGRAM_CHAT_ID_HEBREW"},
+    'en': {"name": "English", "emoji": "🇺🇸", "chat_id_key": "TELEGRAM_CHAT_ID_ENGLISH"},
+    'es': {"name": "Spanish", "emoji": "🇪🇸", "chat_id_key": "TELEGRAM_CHAT_ID_SPANISH"},
+    'ar': {"name": "Arabic", "emoji": "🇸🇦", "chat_id_key": "TELEGRAM_CHAT_ID_ARABIC"},
+    'ru': {"name": "Russian", "emoji": "🇷🇺", "chat_id_key": "TELEGRAM_CHAT_ID_RUSSIAN"},
+    'fr': {"name": "French", "emoji": "🇫🇷", "chat_id_key": "TELEGRAM_CHAT_ID_FRENCH"},
+}
+
+def get_language_name(code, default='Unknown'):
+    """Full English name of a language code."""
+    language = LANGUAGES.get(code)
+    return language["name"] if language else default
+
+def get_language_emoji(code):
+    """Flag emoji of a language code."""
+    language = LANGUAGES.get(code)
+    return language["emoji"] if language else '🏳️'
+
+def get_chat_id_key(code):
+    """Name of the setting that holds the language group's chat id."""
+    language = LANGUAGES.get(code)
+    return language["chat_id_key"] if language else f"TELEGRAM_CHAT_ID_{code.upper()}"
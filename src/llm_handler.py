@@ -1,5 +1,4 @@
-from openai import OpenAI, RateLimitError
-from src.config import OPENROUTER_API_KEY, YOUR_SITE_URL, YOUR_SITE_NAME
+from src.config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, YOUR_SITE_URL, YOUR_SITE_NAME
 from src.prompts import (
     get_batch_filter_prompt,
     get_alert_translation_prompt,
@@ -7,8 +6,23 @@ from src.prompts import (
     get_generic_translation_prompt,
     get_structured_news_summary_prompt,
     get_structured_translation_prompt,
+    get_structured_digest_prompt,
+    get_alert_segments_translation_prompt,
+    get_structured_multi_translation_prompt,
 )
+from src.alert_history import translate_alert_delta, has_known_segments, remember_translation
+from src.config import ALERT_DELTA_TRANSLATION, TRANSLATION_LANGUAGES_PER_CALL, LLM_THREADS
+from src.languages import get_language_name, get_language_emoji
+from src.destinations import get_target_languages
 from src.error_handler import handle_openai_error
+from src.metrics import LLM_REQUEST_SECONDS, LLM_STAGE_SECONDS, timed
+from src.tracing import span
+from src.multiprocess import remote_task, PROCESSING
+from src.work_queue import NEWS_PRIORITY
+import asyncio
+import contextvars
+import functools
+import time
 
 def clean_response_for_logging(response, max_length=500):
     if not response:
@@ -22,10 +36,18 @@ def clean_response_for_logging(response, max_length=500):
     
     return cleaned
 
-client = OpenAI(
-  base_url="https://openrouter.ai/api/v1",
-  api_key=OPENROUTER_API_KEY,
-)
+client = None
+
+def get_client():
+    """The OpenAI client, created (and the openai package imported) on first use."""
+    global client
+    if client is None:
+        from openai import OpenAI
+        client = OpenAI(
+          base_url=OPENROUTER_BASE_URL,
+          api_key=OPENROUTER_API_KEY,
+        )
+    return client
 
 # Define model lists: primary and fallback
 # The first model in the list is the primary, the rest are fallbacks
@@ -37,6 +59,24 @@ MODELS = {
     ]
 }
 
+def _create_completion(request_params, kind, fallback, prompt_bytes):
+    """One API call to one model, timed per model and recorded as a trace span."""
+    model = request_params["model"]
+    start = time.monotonic()
+    outcome = "error"
+    with span("llm.completion", model=model, kind=kind, fallback=fallback, prompt_bytes=prompt_bytes) as llm_span:
+        try:
+            completion = get_client().chat.completions.create(**request_params)
+            if not completion or not completion.choices:
+                outcome = "empty"
+                return None
+            outcome = "ok"
+            llm_span.set(response_bytes=len((completion.choices[0].message.content or "").encode('utf-8')))
+            return completion
+        finally:
+            LLM_REQUEST_SECONDS.observe(time.monotonic() - start, model=model, kind=kind, outcome=outcome)
+            llm_span.set(outcome=outcome)
+
 @handle_openai_error
 def get_completion(prompt, model_list_name="default", response_format=None):
     if not OPENROUTER_API_KEY:
@@ -44,8 +84,9 @@ def get_completion(prompt, model_list_name="default", response_format=None):
         return "Error: OPENROUTER_API_KEY is not set."
 
     model_list = MODELS.get(model_list_name, MODELS["default"])
+    kind = response_format["json_schema"]["name"] if response_format else "text"
 
-    for model in model_list:
+    for fallback, model in enumerate(model_list):
         try:
             request_params = {
                 "extra_headers": {
@@ -60,10 +101,10 @@ def get_completion(prompt, model_list_name="default", response_format=None):
                 request_params["response_format"] = response_format
                 
             print(f"      ...preparing to call OpenRouter API with model: {model}...")
-            completion = client.chat.completions.create(**request_params)
+            completion = _create_completion(request_params, kind, fallback, len(prompt.encode('utf-8')))
             print("      ...API call completed.")
 
-            if not completion or not completion.choices:
+            if not completion:
                 print("      API response is invalid or empty.")
                 # Continue to next model if this one fails to respond properly
                 continue
@@ -106,6 +147,25 @@ def get_completion(prompt, model_list_name="default", response_format=None):
     print("      ❌ All models in the list failed to provide a valid response.")
     return None
 
+llm_executor = None
+
+def get_llm_executor():
+    # Own pool: the default executor has min(32, cpus + 4) threads, which on a
+    # small host would make alert translations queue behind news and ledger writes
+    global llm_executor
+    if llm_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        llm_executor = ThreadPoolExecutor(max_workers=LLM_THREADS, thread_name_prefix="llm")
+    return llm_executor
+
+async def get_completion_async(prompt, model_list_name="default", response_format=None):
+    """get_completion in a worker thread, so concurrent callers' API calls overlap and the event loop never blocks."""
+    # Carry the context over like asyncio.to_thread does, so LLM spans nest under the caller's trace
+    call = functools.partial(
+        contextvars.copy_context().run, get_completion, prompt, model_list_name, response_format
+    )
+    return await asyncio.get_running_loop().run_in_executor(get_llm_executor(), call)
+
 def get_structured_batch_filter_completion(articles_preview, source_lang_name, num_articles):
     properties = {}
     required = []
@@ -158,20 +218,7 @@ Rate each article and respond with the structured JSON format.
     print(f"    <- Returned from get_completion. Response is None: {response is None}")
     return response
 
-def get_language_name(code):
-    """Helper function to get full language name from code."""
-    if code == 'he': return 'Hebrew'
-    if code == 'en': return 'English'
-    if code == 'es': return 'Spanish'
-    return 'Unknown'
-
-def get_language_emoji(code):
-    """Helper function to get a flag emoji from language code."""
-    if code == 'he': return '🇮🇱'
-    if code == 'en': return '🇺🇸'
-    if code == 'es': return '🇪🇸'
-    return '🏳️'
-
+@timed(LLM_STAGE_SECONDS, stage="rate")
 def ai_batch_filter_content(articles, source_lang_code, preview_length=80):
     """
     Uses AI to filter and rate multiple articles at once using previews.
@@ -256,7 +303,14 @@ def ai_batch_filter_content(articles, source_lang_code, preview_length=80):
     print(f"📊 Batch filter result: {len(results)}/{len(articles)} articles kept")
     return results
 
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+async def rate_articles(articles, source_lang_code):
+    """ai_batch_filter_content off the event loop (in a processing worker in multi-process mode)."""
+    return await asyncio.to_thread(ai_batch_filter_content, articles, source_lang_code)
+
 
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@timed(LLM_STAGE_SECONDS, stage="translate")
 async def translate_text_immediately(text, source_language_code, target_language_code):
     source_language_name = get_language_name(source_language_code)
     target_language_name = get_language_name(target_language_code)
@@ -279,7 +333,7 @@ async def translate_text_immediately(text, source_language_code, target_language
     }
 
     try:
-        response = get_completion(prompt, response_format=response_format)
+        response = await get_completion_async(prompt, response_format=response_format)
         if not response:
             print(f"❌ Translation to {target_language_name} failed - all models unavailable")
             return None
@@ -294,28 +348,91 @@ async def translate_text_immediately(text, source_language_code, target_language
         print(f"❌ Error translating text to {target_language_name} (structured): {e}")
         return None
 
-async def translate_text_to_all_languages(text, source_lang_code):
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@timed(LLM_STAGE_SECONDS, stage="translate")
+async def translate_text_multi(text, source_language_code, target_language_codes):
+    """
+    Translates text into several languages with one LLM call. Returns the
+    translations that came back ({lang: text}); missing languages are left out.
+    """
+    prompt = get_structured_multi_translation_prompt(text, source_language_code, target_language_codes)
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "multi_translation",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {code: {"type": "string"} for code in target_language_codes},
+                "required": list(target_language_codes),
+                "additionalProperties": False
+            }
+        }
+    }
+    targets = "/".join(code.upper() for code in target_language_codes)
+
+    try:
+        response = await get_completion_async(prompt, response_format=response_format)
+        if not response:
+            print(f"❌ Translation to {targets} failed - all models unavailable")
+            return {}
+        import json
+        data = json.loads(response)
+        return {
+            code: data[code].strip() for code in target_language_codes
+            if isinstance(data.get(code), str) and data[code].strip()
+        }
+    except Exception as e:
+        print(f"❌ Error translating text to {targets} (structured): {e}")
+        return {}
+
+async def translate_text_to_languages(text, source_lang_code, target_langs, languages_per_call=None,
+                                      translate_single=None):
+    """
+    Translates text into target_langs with chunked multi-language calls, all
+    chunks in parallel, so N languages take ceil(N / languages_per_call) calls
+    and about one call's latency. Languages a chunk's response missed are
+    retried one by one with translate_single (translate_text_immediately by
+    default). Returns {lang: translation} for the languages that succeeded.
+    """
+    languages_per_call = languages_per_call or TRANSLATION_LANGUAGES_PER_CALL
+    translate_single = translate_single or translate_text_immediately
+    target_langs = [lang for lang in target_langs if lang != source_lang_code]
+
+    async def translate_chunk(chunk):
+        translated = {}
+        if len(chunk) > 1:
+            translated = await translate_text_multi(text, source_lang_code, chunk)
+        missing = [lang for lang in chunk if lang not in translated]
+        if len(chunk) > 1 and missing:
+            print(f"⚠️  Multi-language translation missed {'/'.join(lang.upper() for lang in missing)}, translating one by one")
+        results = await asyncio.gather(
+            *[translate_single(text, source_lang_code, lang) for lang in missing], return_exceptions=True
+        )
+        for lang, result in zip(missing, results):
+            # Only add successful translations, skip None results
+            if result and not isinstance(result, Exception):
+                translated[lang] = result
+        return translated
+
+    chunks = [target_langs[i:i + languages_per_call] for i in range(0, len(target_langs), languages_per_call)]
+    translations = {}
+    for translated in await asyncio.gather(*[translate_chunk(chunk) for chunk in chunks]):
+        translations.update(translated)
+    return translations
+
+async def translate_text_to_all_languages(text, source_lang_code, target_langs=None):
     translations = {source_lang_code: text}
     
-    import asyncio
-    
-    target_langs = {'he', 'en', 'es'} - {source_lang_code}
-    tasks = []
+    if target_langs is None:
+        target_langs = get_target_languages('news', source_lang_code)
     
+    translated = await translate_text_to_languages(text, source_lang_code, target_langs)
     for lang in target_langs:
-        task = translate_text_immediately(text, source_lang_code, lang)
-        tasks.append((lang, task))
-        
-    if tasks:
-        results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-        
-        for i, (lang, _) in enumerate(tasks):
-            result = results[i]
-            # Only add successful translations, skip None results
-            if result and not isinstance(result, Exception):
-                translations[lang] = result
-            else:
-                print(f"❌ Skipping {get_language_name(lang)} - translation failed")
+        if lang in translated:
+            translations[lang] = translated[lang]
+        elif lang != source_lang_code:
+            print(f"❌ Skipping {get_language_name(lang)} - translation failed")
             
     return translations
 
@@ -326,7 +443,7 @@ async def translate_alert_immediately(alert_text, target_language_code):
     
     try:
         # Use DeepSeek and fallbacks for consistent model usage
-        response = get_completion(prompt)
+        response = await get_completion_async(prompt)
         if response:
             return response.strip()
         else:
@@ -336,17 +453,70 @@ async def translate_alert_immediately(alert_text, target_language_code):
         print(f"❌ Error translating alert to {target_language_name}: {e}")
         return None
 
-async def translate_alert_to_all_languages(alert_text, source_lang='he'):
+async def translate_alert_segments(segments, target_language_code):
+    """Translates alert segments one-to-one; returns a list of the same length or None."""
+    target_language_name = get_language_name(target_language_code)
+    import json
+    prompt = get_alert_segments_translation_prompt(json.dumps(segments, ensure_ascii=False), target_language_name)
+
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "alert_segments",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "translations": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["translations"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+    try:
+        response = await get_completion_async(prompt, response_format=response_format)
+        if not response:
+            return None
+        translations = [t.strip() for t in json.loads(response).get("translations", [])]
+        if len(translations) != len(segments) or not all(translations):
+            print(f"⚠️  {target_language_name} segment translation returned {len(translations)}/{len(segments)} segments")
+            return None
+        return translations
+    except Exception as e:
+        print(f"❌ Error translating alert segments to {target_language_name}: {e}")
+        return None
+
+@timed(LLM_STAGE_SECONDS, stage="alert_translate")
+async def translate_alert_with_history(alert_text, target_language_code):
+    """
+    Delta-translates when a recent alert shares segments with this one, else
+    translates in full with the alert prompt (and learns its segments).
+    """
+    if ALERT_DELTA_TRANSLATION and has_known_segments(alert_text, target_language_code):
+        translated = await translate_alert_delta(alert_text, target_language_code, translate_alert_segments)
+        if translated:
+            return translated
+        print(f"⚠️  Delta translation to {get_language_name(target_language_code)} failed, translating in full")
+    start = time.monotonic()
+    translated = await translate_alert_immediately(alert_text, target_language_code)
+    if translated and ALERT_DELTA_TRANSLATION:
+        remember_translation(alert_text, target_language_code, translated, time.monotonic() - start)
+    return translated
+
+async def translate_alert_to_all_languages(alert_text, source_lang='he', target_langs=None):
     translations = {source_lang: alert_text}  # Original in source language
     
-    # Translate to other languages
+    # Translate to the other languages someone receives
     import asyncio
     
-    target_langs = {'he', 'en', 'es'} - {source_lang}
+    if target_langs is None:
+        target_langs = get_target_languages('alert', source_lang)
     tasks = []
     
     for lang in target_langs:
-        task = translate_alert_immediately(alert_text, lang)
+        task = translate_alert_with_history(alert_text, lang)
         tasks.append((lang, task))
     
     if tasks:
@@ -364,6 +534,8 @@ async def translate_alert_to_all_languages(alert_text, source_lang='he'):
     
     return translations
 
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@timed(LLM_STAGE_SECONDS, stage="summarize")
 async def summarize_news_content(news_text, source_lang_code):
     # Prefer structured JSON response to avoid meta sections
     prompt = get_structured_news_summary_prompt(news_text, source_lang_code)
@@ -385,7 +557,7 @@ async def summarize_news_content(news_text, source_lang_code):
     }
 
     try:
-        response = get_completion(prompt, response_format=response_format)
+        response = await get_completion_async(prompt, response_format=response_format)
         if not response:
             print("❌ News summarization failed - all models unavailable")
             return None
@@ -400,7 +572,7 @@ async def summarize_news_content(news_text, source_lang_code):
         print(f"❌ Error summarizing news (structured): {e}")
         return None
 
-async def summarize_and_translate_news(news_text, source_lang_code):
+async def summarize_and_translate_news(news_text, source_lang_code, target_langs=None):
     # First, summarize the content in its original language
     print(f"📝 Summarizing {get_language_name(source_lang_code)} news content...")
     summarized_content = await summarize_news_content(news_text, source_lang_code)
@@ -412,22 +584,68 @@ async def summarize_and_translate_news(news_text, source_lang_code):
     
     # Then translate the summary to all languages using the generic translator
     print("🔄 Translating summary to all languages...")
-    translations = await translate_text_to_all_languages(summarized_content, source_lang_code)
+    translations = await translate_text_to_all_languages(summarized_content, source_lang_code, target_langs)
     
     return translations
 
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+@timed(LLM_STAGE_SECONDS, stage="digest")
+async def summarize_digest(articles_text, target_lang_code, max_items):
+    """
+    Summarizes several articles into one list of short items written directly
+    in the target language (one LLM call per language instead of per article).
+    """
+    target_language_name = get_language_name(target_lang_code)
+    prompt = get_structured_digest_prompt(articles_text, target_language_name, max_items)
+
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "news_digest",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "items": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["items"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+    try:
+        response = await get_completion_async(prompt, response_format=response_format)
+        if not response:
+            print(f"❌ {target_language_name} digest failed - all models unavailable")
+            return None
+        import json
+        data = json.loads(response)
+        items = [item.strip() for item in data.get("items", []) if item and item.strip()]
+        if not items:
+            print(f"❌ Empty JSON digest for {target_language_name}")
+            return None
+        return items[:max_items]
+    except Exception as e:
+        print(f"❌ Error building {target_language_name} digest (structured): {e}")
+        return None
+
 # --- NEWS/RSS translation APIs (distinct from ALERT translation) ---
-async def translate_news_to_all_languages(news_text: str, source_lang_code: str):
+async def translate_news_to_all_languages(news_text: str, source_lang_code: str, target_langs=None):
     """
     Public API for translating general news content (non-alert).
     This uses the summarize-then-translate pipeline for concise outputs.
     Returns a dict mapping language code to translated text, including the source language.
+    target_langs defaults to the languages that have news destinations.
     """
-    return await summarize_and_translate_news(news_text, source_lang_code)
+    return await summarize_and_translate_news(news_text, source_lang_code, target_langs)
 
-async def translate_rss_to_all_languages(news_text: str, source_lang_code: str):
+@remote_task(PROCESSING, priority=NEWS_PRIORITY)
+async def translate_rss_to_all_languages(news_text: str, source_lang_code: str, target_langs=None):
     """
     Alias specifically for RSS articles to make the call sites explicit.
-    Equivalent to translate_news_to_all_languages.
+    Equivalent to translate_news_to_all_languages, but targets the languages with a language group.
     """
-    return await translate_news_to_all_languages(news_text, source_lang_code)
+    if target_langs is None:
+        target_langs = get_target_languages('rss', source_lang_code)
+    return await translate_news_to_all_languages(news_text, source_lang_code, target_langs)
@@ -0,0 +1,121 @@
+"""
+Opt-in event-loop watchdog (LOOP_WATCHDOG=true).
+
+A coroutine refreshes a heartbeat every LOOP_WATCHDOG_INTERVAL seconds. A
+helper thread checks it, and when the loop is more than LOOP_LAG_THRESHOLD
+late it samples the loop thread's stack, logs the frames once per stall, and
+counts the stall against the innermost frame in our own code (the "blocking
+site"). get_blocking_sites() ranks the sites by stall time.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+from src.config import LOOP_WATCHDOG, LOOP_LAG_THRESHOLD, LOOP_WATCHDOG_INTERVAL
+from src.metrics import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_LOG_DEPTH = 8
+
+LOOP_STALLS = Counter("yoninews_event_loop_stalls_total", "Event loop stalls by blocking site", ["site"])
+
+blocking_sites = {}  # site -> {"stalls", "samples", "total_stall", "max_stall", "leaf", "last_seen"}
+watchdog = None
+
+def _site_for(stack):
+    """Innermost frame in project code, plus the innermost frame overall."""
+    leaf = stack[-1] if stack else None
+    for frame in reversed(stack):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(PROJECT_ROOT) and path != os.path.abspath(__file__) and 'site-packages' not in path:
+            site = f"{os.path.relpath(path, PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+            break
+    else:
+        site = "<outside project code>"
+    leaf_text = f"{os.path.basename(leaf.filename)}:{leaf.lineno} in {leaf.name}" if leaf else ""
+    return site, leaf_text
+
+class LoopWatchdog:
+    def __init__(self, threshold=LOOP_LAG_THRESHOLD, interval=LOOP_WATCHDOG_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id = None
+        self.heartbeat_task = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.heartbeat_task = asyncio.create_task(self._beat())
+        self.thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+        print(f"🐕 Event loop watchdog on (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self.stopped.set()
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+
+    async def _beat(self):
+        while True:
+            self.heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        stall_site = None
+        while not self.stopped.wait(self.interval):
+            lag = time.monotonic() - self.heartbeat - self.interval
+            if lag <= self.threshold:
+                if stall_site:
+                    self._end_stall(stall_site, lag_before)
+                    stall_site = None
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            site, leaf = _site_for(stack)
+            if stall_site is None:
+                stall_site = site
+                self._begin_stall(site, leaf, lag, stack)
+            blocking_sites[stall_site]["samples"] += 1
+            lag_before = lag
+
+    def _begin_stall(self, site, leaf, lag, stack):
+        stats = blocking_sites.setdefault(site, {
+            "stalls": 0, "samples": 0, "total_stall": 0.0, "max_stall": 0.0, "leaf": leaf, "last_seen": 0.0,
+        })
+        stats["stalls"] += 1
+        stats["leaf"] = leaf
+        stats["last_seen"] = time.time()
+        LOOP_STALLS.inc(site=site)
+        frames = "".join(traceback.format_list(stack[-STACK_LOG_DEPTH:]))
+        print(f"🐢 [Watchdog] Event loop blocked for {lag * 1000:.0f}ms+ at {site}\n{frames}", end="")
+
+    def _end_stall(self, site, last_lag):
+        # The last sample taken during the stall is a lower bound on its length
+        stats = blocking_sites[site]
+        stats["total_stall"] += last_lag
+        stats["max_stall"] = max(stats["max_stall"], last_lag)
+
+def get_blocking_sites(limit=20):
+    sites = sorted(blocking_sites.items(), key=lambda item: item[1]["total_stall"], reverse=True)[:limit]
+    return [
+        {"site": site, **stats, "total_stall": round(stats["total_stall"], 3), "max_stall": round(stats["max_stall"], 3)}
+        for site, stats in sites
+    ]
+
+def start_loop_watchdog():
+    """Starts the watchdog on the running loop if LOOP_WATCHDOG is enabled (no-op otherwise)."""
+    global watchdog
+    if not LOOP_WATCHDOG or (watchdog and watchdog.thread.is_alive()):
+        return watchdog
+    watchdog = LoopWatchdog()
+    watchdog.start()
+    return watchdog
@@ -1,22 +1,48 @@
+import time
+STARTED_AT = time.monotonic()  # Before the heavy imports below, for time-to-listening
+
 import asyncio
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import contextvars
 from src.news_fetcher import fetch_news
 from src.llm_handler import (
     get_language_name,
     get_language_emoji,
-    ai_batch_filter_content,
-    translate_rss_to_all_languages,
+    get_client,
+    rate_articles,
+    summarize_news_content,
+    translate_text_to_languages,
+    summarize_digest,
+)
+from src.bot import (
+    send_message, send_message_to_language_group, deliver_to_destinations, start_alert_listener, start_webhook_server,
+    listener_ready, get_bot,
+)
+from src.metrics import STARTUP_SECONDS
+from src.tracing import start_trace, span, begin_trace, end_span, get_current_span, start_trace_exporter
+from src.pipeline import Pipeline, Stage
+from src.loop_watchdog import start_loop_watchdog
+from src.multiprocess import start_role_processes, supervise_processes, stop_role_processes
+from src.work_queue import start_workers
+from src import journal
+from src.destinations import get_target_languages, print_target_languages
+from src.subscribers import load_subscribers
+from src.config import (
+    RSS_FEEDS, DIGEST_MODE, PROCESS_WORKERS, DIGEST_TOP_K, DIGEST_WINDOW_MINUTES, set_runtime_config,
+    RSS_FETCH_CONCURRENCY, RSS_RATE_CONCURRENCY, RSS_PROCESS_CONCURRENCY, RSS_STAGE_QUEUE_SIZE, RSS_MAX_ARTICLES,
+    RSS_SELECT_LOOKAHEAD,
 )
-from src.bot import send_message, send_message_to_language_group, start_alert_listener, start_webhook_server
-from src.config import RSS_FEEDS, set_runtime_config
 import re
-import telegram.helpers
-import time
 import hashlib
 
 # RSS memory (completely separate from Telethon/Webhook)
 processed_rss_articles = {}  # article_hash -> timestamp
 
+# Digest mode: articles waiting for the next digest
+pending_digest_articles = {}  # article_hash -> (article, rating)
+last_digest_sent_at = 0.0
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
 def get_identifier_from_article(article):
     """
     Creates a unique and consistent identifier for an article to prevent duplicates.
@@ -68,155 +94,416 @@ def is_already_processed(article_id):
     """Check if we've seen this article in the last 3 hours"""
     return article_id in processed_rss_articles if article_id else False
 
-async def fetch_process_and_send_news():
-    print("🔄 Starting news processing cycle...")
+def build_digest_message(lang_code, items):
+    """Formats digest items for Telegram, dropping trailing items that don't fit the length limit."""
+    import telegram.helpers
+    message_text = f"🗞️ {get_language_emoji(lang_code)} **NEWS DIGEST**\n"
+    footer = "\n\\-\\-\\-"
+    for item in items:
+        line = f"\n• {telegram.helpers.escape_markdown(item, version=2)}\n"
+        if len(message_text) + len(line) + len(footer) > TELEGRAM_MESSAGE_LIMIT:
+            print(f"✂️  {lang_code.upper()} digest trimmed to fit Telegram's length limit")
+            break
+        message_text += line
+    return message_text + footer
+
+async def send_news_digest(rated_articles):
+    """Queues rated articles and sends one digest message per language when the window is due."""
+    global last_digest_sent_at
     
-    # Clean old articles from memory first
-    cleanup_rss_memory()
+    for article, rating in rated_articles:
+        article_identifier = get_identifier_from_article(article)
+        if article_identifier:
+            pending_digest_articles[article_identifier] = (article, rating)
+            # Queued for the digest (until it's delivered), so don't pick it up again next cycle
+            mark_as_processed(article_identifier)
+    
+    window = DIGEST_WINDOW_MINUTES * 60
+    if window and time.time() - last_digest_sent_at < window:
+        print(f"🗞️  [Digest] {len(pending_digest_articles)} articles queued, next digest in {(window - (time.time() - last_digest_sent_at)) / 60:.0f} min")
+        return
     
-    all_articles = []
+    if not pending_digest_articles:
+        print("❌ [Digest] No articles for this digest")
+        return
+    
+    # Snapshot: articles queued by a cycle that runs meanwhile wait for the next digest
+    queued = dict(pending_digest_articles)
+    selected = sorted(queued.values(), key=lambda x: x[1], reverse=True)[:DIGEST_TOP_K]
+    dropped = len(queued) - len(selected)
+    
+    print(f"\n🗞️  [Digest] Building digest from {len(selected)} articles" + (f" ({dropped} lower-rated dropped)" if dropped else ""))
+    articles_block = ""
+    for i, (article, rating) in enumerate(selected, 1):
+        title = article.get('title', '')
+        clean_summary = re.sub('<[^<]+?>', '', article.get('summary', '')).strip()
+        articles_block += f"\nArticle {i} ({get_language_name(article['source_lang'])}, {article['source_name']}):\n{title}\n{clean_summary[:400]}\n"
+        print(f"  {i}. {rating}/10 - {article['source_name']} - {title}")
+    
+    # One call per language group covers every article
+    digest_languages = get_target_languages('rss')
+    digests = await asyncio.gather(
+        *[summarize_digest(articles_block, lang_code, len(selected)) for lang_code in digest_languages]
+    )
+    messages = {
+        lang_code: build_digest_message(lang_code, items)
+        for lang_code, items in zip(digest_languages, digests)
+        if items
+    }
+    if not messages:
+        print(f"❌ [Digest] Digest generation failed for all languages, keeping {len(queued)} articles for the next digest")
+        return
+    
+    results, _, _ = await deliver_to_destinations(messages, 'news', parse_mode='MarkdownV2')
+    sent = sum(1 for success in results.values() if success)
+    if not sent:
+        # Failed sends are retried from the ledger; nothing went out at all, so try again next cycle
+        print(f"❌ [Digest] Not delivered to any language group, keeping {len(queued)} articles for the next digest")
+        return
+    for article_identifier in queued:
+        pending_digest_articles.pop(article_identifier, None)
+    last_digest_sent_at = time.time()
+    print(f"✅ [Digest] Sent to {sent}/{len(results)} language groups")
 
-    # 1. Fetch from RSS feeds with limits
-    print("📰 Fetching RSS feeds...")
-    for feed_url, lang_code in RSS_FEEDS:
-        articles = fetch_news(feed_url, limit=10)  # Limit to 10 articles per feed
+# Selection thresholds (reduced to avoid alert interference)
+MIN_RATING = 7  # Higher threshold
+TOP_RATING = 10  # Highest rating the LLM gives
+MAX_ARTICLES = RSS_MAX_ARTICLES  # Default 1 article per hour (3 messages total per hour)
+
+def get_text_for_llm(article):
+    title = article.get('title')
+    return f"{title}\n{article['clean_summary']}" if title else article['clean_summary']
+
+async def translate_selected_article(article_to_process, importance_rating, i):
+    print(f"\n{'='*50}")
+    print(f"📖 [RSS] ARTICLE {i} (Rating: {importance_rating}/10)")
+    print(f"{'='*50}")
+    
+    source_lang_code = article_to_process['source_lang']
+    source_name = article_to_process['source_name']
+    title = article_to_process.get('title')
+    clean_summary = article_to_process['clean_summary']
+
+    print(f"📍 [RSS] {source_name} ({get_language_name(source_lang_code)})")
+    if title:
+        print(f"📄 [RSS] {title}")
+    print(f"📝 [RSS] {clean_summary[:100]}...")
+
+    from src.config import DEV_MODE  # Import dynamically to get current value
+    if DEV_MODE:
+        print(f"🔧 DEV MODE: Summarizing & translating content...")
+        print(f"   Source language: {get_language_name(source_lang_code)}")
+    else:
+        print(f"🔄 Summarizing & translating...")
+    
+    with span("rss.translate"):
+        all_languages = await summarize_and_translate_article(article_to_process)
+    if not all_languages:
+        print("❌ Translation failed")
+        return None
+    print(f"✅ Got all {len(all_languages)} languages")
+    return all_languages
+
+async def summarize_and_translate_article(article):
+    """
+    Summarize, then translate the summary into the other languages, writing
+    each result to the journal. Steps the journal already has (from before a
+    restart) are reused instead of calling the LLM again.
+    """
+    item_id = get_identifier_from_article(article)
+    source_lang_code = article['source_lang']
+    progress = journal.get_item(item_id) or {}
+    
+    summary = progress.get("summary")
+    if summary:
+        print("📓 [RSS] Reusing journaled summary")
+    else:
+        print(f"📝 Summarizing {get_language_name(source_lang_code)} news content...")
+        summary = await summarize_news_content(get_text_for_llm(article), source_lang_code)
+        if not summary:
+            print("❌ Cannot proceed with translation - summarization failed")
+            return {}
+        journal.record(item_id, "summarized", summary=summary)
+    
+    translations = {source_lang_code: summary, **progress.get("translations", {})}
+    missing = [lang for lang in get_target_languages('rss', source_lang_code) if lang not in translations]
+    if len(translations) > 1:
+        print(f"📓 [RSS] Reusing {len(translations) - 1} journaled translations")
+    translated = {}
+    if missing:
+        print("🔄 Translating summary to all languages...")
+        translated = await translate_text_to_languages(summary, source_lang_code, missing)
+    for lang in missing:
+        if lang in translated:
+            translations[lang] = translated[lang]
+            journal.record(item_id, "translated", lang=lang, text=translated[lang])
+        else:
+            print(f"❌ Skipping {get_language_name(lang)} - translation failed")
+    return translations
+
+async def send_translated_article(article, all_languages):
+    # Queue every language (source + translations) on the outbound scheduler,
+    # which paces each group and keeps messages to one group in order
+    import telegram.helpers
+    item_id = get_identifier_from_article(article)
+    already_sent = (journal.get_item(item_id) or {}).get("sent", [])
+    # Write-ahead: the translations are on disk before anything goes out
+    await journal.sync()
+    sends = []
+    for lang_code, translated_content in all_languages.items():
+        lang_name = get_language_name(lang_code)
+        lang_emoji = get_language_emoji(lang_code)
+        if lang_code in already_sent:
+            print(f"  📓 {lang_name} already sent before the restart, skipping")
+            continue
+        
+        # Show brief preview
+        preview = str(translated_content)[:60] + "..."
+        print(f"  {lang_emoji} {lang_name}: {preview}")
+        
+        # Format message for Telegram (simple text format like alerts)
+        message_text = f"{lang_emoji} {telegram.helpers.escape_markdown(translated_content, version=2)}\n\n\\-\\-\\-"
+        
+        # Send to the appropriate language group (RSS-specific sending)
+        print(f"  📤 [RSS] Sending {lang_name} to {lang_code.upper()} group...")
+        sends.append(send_and_journal(item_id, message_text, lang_code))
+    await asyncio.gather(*sends)
+
+async def send_and_journal(item_id, message_text, lang_code):
+    success = await send_message_to_language_group(message_text, lang_code, parse_mode='MarkdownV2', scheduled=True)
+    if success:
+        journal.record(item_id, "sent", lang=lang_code)
+        print(f"  ✅ {get_language_name(lang_code)} sent to {lang_code.upper()} group!")
+    return success
+
+async def send_selected_article(cycle, article, all_languages):
+    interrupted = False
+    try:
+        if all_languages:
+            await send_translated_article(article, all_languages)
+            cycle["sent"] += 1
+    except asyncio.CancelledError:
+        # Shutting down mid-send: the journal keeps the article for the next start
+        interrupted = True
+        raise
+    finally:
+        if not interrupted:
+            # Mark as processed using RSS-specific memory
+            article_identifier = get_identifier_from_article(article)
+            mark_as_processed(article_identifier)
+            journal.record(article_identifier, "done")
+        end_span(get_current_span())
+
+async def send_in_selection_order(cycle, flush=False):
+    """
+    Sends translated articles in the order they were selected (highest rating
+    first), however their concurrent translations finish. flush=True skips
+    over positions that never came back, so nothing is left behind.
+    """
+    ready = cycle["ready"]
+    sent = []
+    while ready:
+        if cycle["next_send"] not in ready:
+            if not flush:
+                break
+            cycle["next_send"] = min(ready)
+        position = cycle["next_send"]
+        cycle["next_send"] += 1
+        article, all_languages, context = ready.pop(position)
+        # Send in the article's own context so its trace gets the send spans
+        await context.run(asyncio.create_task, send_selected_article(cycle, article, all_languages))
+        sent.append(article)
+    return sent
+
+def build_rss_pipeline(cycle):
+    """
+    fetch → normalize → dedup → rate → select → translate → send, each stage
+    with its own workers and a bounded queue in front of it. Articles move on
+    feed by feed up to rating. Selection streams with a bounded look-ahead: the
+    best candidate so far is selected once RSS_SELECT_LOOKAHEAD more feeds have
+    been rated without beating it (a top rating goes at once), so the first
+    article doesn't wait for the slowest feed. What's left of the budget goes
+    to the best remaining articles after the last feed.
+    """
+    seen_identifiers = set()
+
+    async def fetch_stage(feed):
+        feed_url, lang_code = feed
+        with span("rss.fetch", feed=feed_url) as fetch_span:
+            # requests/feedparser are blocking, keep them off the event loop
+            articles = await asyncio.to_thread(fetch_news, feed_url, 10)  # Limit to 10 articles per feed
+            fetch_span.set(articles=len(articles))
+        print(f"   📊 {len(articles)} articles from {feed_url.split('/')[2]}")
+        cycle["fetched"] += len(articles)
+        return [(feed_url, lang_code, articles)] if articles else []
+
+    async def normalize_stage(feed_batch):
+        feed_url, lang_code, articles = feed_batch
         for article in articles:
             article['source_lang'] = lang_code
             article['source_type'] = 'rss'
             article['source_name'] = feed_url.split('/')[2]
-        all_articles.extend(articles)
-        print(f"   📊 {len(articles)} articles from {feed_url.split('/')[2]}")
+            # Clean RSS summary (remove HTML tags)
+            article['clean_summary'] = re.sub('<[^<]+?>', '', article.get('summary', '')).strip()
+        return [articles]
 
-    print(f"📊 Total content: {len(all_articles)} items")
+    async def dedup_stage(articles):
+        # RSS-specific deduplication, also across feeds within this cycle
+        new_articles = []
+        for article in articles:
+            article_identifier = get_identifier_from_article(article)
+            if article_identifier in seen_identifiers or is_already_processed(article_identifier):
+                continue
+            if article_identifier:
+                seen_identifiers.add(article_identifier)
+            new_articles.append(article)
+        cycle["new"] += len(new_articles)
+        return [new_articles] if new_articles else []
 
-    if not all_articles:
-        print("❌ No content found")
-        return
+    async def rate_stage(articles):
+        lang_code = articles[0]['source_lang']
+        print(f"  🔍 Rating {len(articles)} {get_language_name(lang_code)} articles from {articles[0]['source_name']}...")
+        with span("rss.rate", lang=lang_code, articles=len(articles)):
+            rated_results = await rate_articles(articles, lang_code)
+        return [rated_results] if rated_results else []
 
-    # 3. Filter out already processed RSS articles (RSS-specific deduplication)
-    new_articles = [
-        article for article in all_articles
-        if not is_already_processed(get_identifier_from_article(article))
-    ]
+    def select(article, rating):
+        cycle["selected"] += 1
+        print(f"🎯 Selected {rating}/10 - {article['source_name']} - {article.get('title', article['clean_summary'][:50] + '...')}")
+        journal.record_selected(get_identifier_from_article(article), article, rating)
+        return (article, rating, cycle["selected"])
 
-    if not new_articles:
-        print("❌ [RSS] No new content (all already processed in last 3 hours)")
-        return
+    async def select_stage(rated_articles):
+        # Filter by minimum rating
+        good_articles = [(article, rating) for article, rating in rated_articles if rating >= MIN_RATING]
+        if DIGEST_MODE:
+            cycle["good"].extend(good_articles)
+            return []
+        
+        cycle["rated_feeds"] += 1
+        candidates = cycle["candidates"]
+        candidates.extend((article, rating, cycle["rated_feeds"]) for article, rating in good_articles)
+        candidates.sort(key=lambda x: x[1], reverse=True)  # Stable: the earlier of equal ratings first
+        selected = []
+        while candidates and cycle["selected"] < MAX_ARTICLES:
+            article, rating, rated_at = candidates[0]
+            # Nothing can outrank a top rating; anything else waits for the look-ahead window
+            looked_ahead = RSS_SELECT_LOOKAHEAD and cycle["rated_feeds"] - rated_at >= RSS_SELECT_LOOKAHEAD
+            if rating < TOP_RATING and not looked_ahead:
+                break
+            candidates.pop(0)
+            selected.append(select(article, rating))
+        return selected
 
-    print(f"🆕 New content: {len(new_articles)} items")
+    async def select_best():
+        # Every feed is rated: fill the rest of the budget with the best remaining articles
+        if DIGEST_MODE:
+            return []
+        remaining = max(0, MAX_ARTICLES - cycle["selected"])
+        return [select(article, rating) for article, rating, _ in cycle["candidates"][:remaining]]
 
-    # 4. Group articles by language for batch processing
-    articles_by_lang = {}
-    for article in new_articles:
-        lang = article['source_lang']
-        if lang not in articles_by_lang:
-            articles_by_lang[lang] = []
-        articles_by_lang[lang].append(article)
+    async def translate_stage(selection):
+        article, rating, position = selection
+        # Each selected RSS entry gets its own trace, ended when it is sent
+        begin_trace("rss.entry", 'news', feed=article['source_name'], rating=rating, link=article.get('link', ''))
+        try:
+            all_languages = await translate_selected_article(article, rating, position)
+        except Exception as e:
+            print(f"❌ [RSS] Article {position} failed: {e}")
+            all_languages = None
+        # Failed articles still pass through, so later positions aren't held back
+        return [(position, article, all_languages, contextvars.copy_context())]
 
-    # 5. Batch filter and rate articles by language
-    print("🎯 Batch filtering and rating...")
-    rated_articles = []
-    
-    for lang_code, articles in articles_by_lang.items():
-        print(f"  🔍 Processing {len(articles)} {get_language_name(lang_code)} articles...")
-        
-        # Batch filter all articles for this language together
-        if articles:
-            rated_results = ai_batch_filter_content(articles, lang_code)
-            rated_articles.extend(rated_results)
-
-    # 6. Select top articles by rating (reduced to avoid alert interference)
-    MIN_RATING = 7  # Higher threshold
-    MAX_ARTICLES = 1  # Only 1 article per hour (3 messages total per hour)
-    
-    # Filter by minimum rating and sort by rating (highest first)
-    good_articles = [(article, rating) for article, rating in rated_articles if rating >= MIN_RATING]
-    good_articles.sort(key=lambda x: x[1], reverse=True)
-    
-    # Take top articles
-    selected_articles = good_articles[:MAX_ARTICLES]
-    
-    print(f"🎯 Selected {len(selected_articles)} articles (rating ≥{MIN_RATING}):")
-    for i, (article, rating) in enumerate(selected_articles, 1):
-        source_name = article['source_name']
-        title = article.get('title', article.get('summary', '')[:50] + '...')
-        print(f"  {i}. {rating}/10 - {source_name} - {title}")
+    async def send_stage(translated):
+        position, article, all_languages, context = translated
+        cycle["ready"][position] = (article, all_languages, context)
+        return await send_in_selection_order(cycle)
 
-    if not selected_articles:
-        print("❌ No articles meet minimum rating threshold")
-        return
+    return Pipeline("RSS", [
+        Stage("fetch", fetch_stage, RSS_FETCH_CONCURRENCY, RSS_STAGE_QUEUE_SIZE),
+        Stage("normalize", normalize_stage, 1, RSS_STAGE_QUEUE_SIZE),
+        Stage("dedup", dedup_stage, 1, RSS_STAGE_QUEUE_SIZE),
+        Stage("rate", rate_stage, RSS_RATE_CONCURRENCY, RSS_STAGE_QUEUE_SIZE),
+        Stage("select", select_stage, 1, RSS_STAGE_QUEUE_SIZE, flush=select_best),
+        Stage("translate", translate_stage, RSS_PROCESS_CONCURRENCY, RSS_STAGE_QUEUE_SIZE),
+        Stage("send", send_stage, 1, RSS_STAGE_QUEUE_SIZE),
+    ])
+
+async def resume_journaled_article(article, rating, position):
+    begin_trace("rss.entry", 'news', feed=article.get('source_name', ''), rating=rating, resumed=True)
+    try:
+        all_languages = await translate_selected_article(article, rating, position)
+    except Exception as e:
+        print(f"❌ [RSS] Resumed article {position} failed: {e}")
+        all_languages = None
+    return all_languages, contextvars.copy_context()
+
+async def resume_journaled_articles():
+    """Finishes articles a previous run selected but never completed, from their last journaled step."""
+    unfinished = sorted(journal.load_journal().items(), key=lambda item: item[1]["rating"], reverse=True)
+    if not unfinished:
+        return 0
+    print(f"♻️  [RSS] Resuming {len(unfinished)} articles from the journal")
+    resumed = await asyncio.gather(*[
+        asyncio.create_task(resume_journaled_article(state["article"], state["rating"], i))  # Each task gets its own context
+        for i, (_, state) in enumerate(unfinished, 1)
+    ])
+    cycle = {"sent": 0, "ready": {}, "next_send": 1}
+    for i, ((_, state), (all_languages, context)) in enumerate(zip(unfinished, resumed), 1):
+        cycle["ready"][i] = (state["article"], all_languages, context)
+    await send_in_selection_order(cycle, flush=True)
+    print(f"♻️  [RSS] Resumed {cycle['sent']}/{len(unfinished)} journaled articles")
+    return cycle["sent"]
+
+last_pipeline_stats = {}
 
-    # 7. Process selected articles
-    print(f"\n📝 Processing {len(selected_articles)} selected articles...")
+async def fetch_process_and_send_news():
+    global last_pipeline_stats
+    print("🔄 Starting news processing cycle...")
     
-    for i, (article_to_process, importance_rating) in enumerate(selected_articles, 1):
-        print(f"\n{'='*50}")
-        print(f"📖 [RSS] ARTICLE {i}/{len(selected_articles)} (Rating: {importance_rating}/10)")
-        print(f"{'='*50}")
-        
-        source_lang_code = article_to_process['source_lang']
-        source_name = article_to_process['source_name']
-        
-        title = article_to_process.get('title')
-        summary_to_clean = article_to_process.get('summary', '')
+    # Clean old articles from memory first
+    cleanup_rss_memory()
+    
+    # Articles interrupted by a restart go first, reusing the LLM work already done
+    await resume_journaled_articles()
+    
+    print("📰 Fetching RSS feeds...")
+    cycle = {
+        "fetched": 0, "new": 0, "selected": 0, "sent": 0, "good": [], "candidates": [], "rated_feeds": 0,
+        "ready": {}, "next_send": 1,
+    }
+    pipeline = build_rss_pipeline(cycle)
+    last_pipeline_stats = await pipeline.run(RSS_FEEDS)
+    if cycle["ready"]:
+        print(f"⚠️  [RSS] {len(cycle['ready'])} articles left waiting for an earlier one, sending them now")
+        await send_in_selection_order(cycle, flush=True)
+    pipeline.print_stats()
 
-        # Clean RSS summary (remove HTML tags)
-        clean_summary = re.sub('<[^<]+?>', '', summary_to_clean).strip()
+    print(f"📊 Total content: {cycle['fetched']} items, {cycle['new']} new")
+    if not cycle["fetched"]:
+        print("❌ No content found")
+    elif not cycle["new"]:
+        print("❌ [RSS] No new content (all already processed in last 3 hours)")
 
-        print(f"📍 [RSS] {source_name} ({get_language_name(source_lang_code)})")
-        if title:
-            print(f"📄 [RSS] {title}")
-        print(f"📝 [RSS] {clean_summary[:100]}...")
+    if DIGEST_MODE:
+        # Quiet cycles too: articles queued by earlier cycles go out once the window is due
+        cycle["good"].sort(key=lambda x: x[1], reverse=True)
+        await send_news_digest(cycle["good"])
+        return
+    if not cycle["new"]:
+        return
 
-        # Prepare text and summarize + translate using the NEWS path (not alert path)
-        text_for_llm = f"{title}\n{clean_summary}" if title else clean_summary
-        
-        from src.config import DEV_MODE  # Import dynamically to get current value
-        if DEV_MODE:
-            print(f"🔧 DEV MODE: Summarizing & translating content...")
-            print(f"   Source language: {get_language_name(source_lang_code)}")
-        else:
-            print(f"🔄 Summarizing & translating...")
-        
-        # Use the explicit RSS NEWS translation API (clear separation from ALERT flow)
-        all_languages = await translate_rss_to_all_languages(text_for_llm, source_lang_code)
+    if not cycle["selected"]:
+        print("❌ No articles meet minimum rating threshold")
+        return
 
-        if not all_languages:
-            print("❌ Translation failed")
-        else:
-            print(f"✅ Got all {len(all_languages)} languages")
-            
-            # Send all 3 languages (source + translations)
-            for lang_code, translated_content in all_languages.items():
-                lang_name = get_language_name(lang_code)
-                lang_emoji = get_language_emoji(lang_code)
-                
-                # Show brief preview
-                preview = str(translated_content)[:60] + "..."
-                print(f"  {lang_emoji} {lang_name}: {preview}")
-                
-                # Format message for Telegram (simple text format like alerts)
-                message_text = f"{lang_emoji} {telegram.helpers.escape_markdown(translated_content, version=2)}\n\n\\-\\-\\-"
-                
-                # Send to the appropriate language group (RSS-specific sending)
-                print(f"  📤 [RSS] Sending {lang_name} to {lang_code.upper()} group...")
-                success = await send_message_to_language_group(message_text, lang_code, parse_mode='MarkdownV2')
-                if success:
-                    print(f"  ✅ {lang_name} sent to {lang_code.upper()} group!")
-                
-                # Longer delay between RSS messages to avoid interfering with alerts
-                await asyncio.sleep(5)
-
-        # Mark as processed using RSS-specific memory
-        article_identifier = get_identifier_from_article(article_to_process)
-        mark_as_processed(article_identifier)
-
-    print(f"\n✅ Processing complete! Handled {len(selected_articles)} articles")
+    print(f"\n✅ Processing complete! Handled {cycle['sent']} articles")
 
 async def safe_fetch_process_and_send_news():
     """Wrapper with error handling for scheduler"""
     try:
-        await fetch_process_and_send_news()
+        with start_trace("rss.cycle", 'news'):
+            await fetch_process_and_send_news()
     except Exception as e:
         print(f"❌ Error in scheduled news processing: {e}")
         # Don't re-raise - let scheduler continue
@@ -228,19 +515,75 @@ async def safe_cleanup_memory():
         # Import the telethon cleanup (since RSS and Telethon are separate)
         from src.bot import cleanup_telethon_memory
         cleanup_telethon_memory()
+        from src.delivery_ledger import prune_ledger
+        await asyncio.to_thread(prune_ledger)
         print("🧹 Memory cleanup completed")
     except Exception as e:
         print(f"❌ Error in memory cleanup: {e}")
 
-async def main(dev_mode=False, debug_mode=False):
+async def safe_retry_pending_deliveries():
+    """Wrapper with error handling for delivery retries"""
+    try:
+        from src.bot import retry_pending_deliveries
+        await retry_pending_deliveries()
+    except Exception as e:
+        print(f"❌ Error retrying pending deliveries: {e}")
+
+async def report_time_to_listening(webhook_task, timeout=300):
+    """Prints (and exports) how long after process start each listener came up."""
+    async def wait_for(component, ready):
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except Exception:
+            print(f"⏱️  {component} not listening {timeout}s after start")
+            return
+        elapsed = time.monotonic() - STARTED_AT
+        STARTUP_SECONDS.set(round(elapsed, 3), component=component)
+        print(f"⏱️  {component} listening {elapsed:.2f}s after start")
+    
+    await asyncio.gather(
+        wait_for("Webhook server", asyncio.shield(webhook_task)),
+        wait_for("Telethon listener", listener_ready.wait()),
+    )
+
+def warm_clients():
+    """Imports the heavy client libraries and builds the LLM and Bot API clients. Blocking."""
+    import telegram.helpers  # noqa: F401
+    get_client()
+    get_bot()
+
+async def warm_up_clients(webhook_task):
+    # After the webhook is listening, so the first event doesn't pay for the imports either
+    try:
+        await asyncio.shield(webhook_task)
+    except Exception:
+        pass
+    start = time.monotonic()
+    await asyncio.to_thread(warm_clients)
+    print(f"🔥 Clients warmed up in {time.monotonic() - start:.2f}s")
+
+async def main(dev_mode=False, debug_mode=False, workers=None):
     # Set runtime configuration
     set_runtime_config(dev_mode, debug_mode)
+    load_subscribers()
+    
+    # Multi-process mode: this process only ingests, LLM work and sends run in child processes
+    workers = PROCESS_WORKERS if workers is None else workers
+    supervisor_task = None
+    if workers:
+        start_role_processes(workers, dev_mode, debug_mode)
+        start_workers(scale=workers)
+        supervisor_task = asyncio.create_task(supervise_processes(dev_mode, debug_mode))
     
     # Start the scheduled news processor with error handling
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
     scheduler = AsyncIOScheduler()
     scheduler.add_job(safe_fetch_process_and_send_news, 'interval', hours=1, id='news_processor')
     scheduler.add_job(safe_cleanup_memory, 'interval', hours=3, id='memory_cleanup')  # Clean every 3 hours
+    scheduler.add_job(safe_retry_pending_deliveries, 'interval', minutes=1, id='delivery_retries')
     scheduler.start()
+    start_trace_exporter()
+    start_loop_watchdog()  # Before the first RSS cycle so its blocking calls are caught too
     
     mode_info = ""
     if dev_mode:
@@ -252,13 +595,10 @@ async def main(dev_mode=False, debug_mode=False):
     print("📰 Scheduled news processing: Every hour")
     print("🧹 Memory cleanup: Every 3 hours")
     print("🚨 Real-time alerts: Continuous monitoring")
+    print_target_languages()
     print("Press Ctrl+C to exit.")
 
-    # Run once at startup
-    print("\n🔄 Running initial news processing...")
-    await safe_fetch_process_and_send_news()
-
-    # Start webhook server, scheduler, and alert listener concurrently
+    # Start webhook server and alert listener first, so alerts are handled from the start
     try:
         tasks = []
         
@@ -266,7 +606,11 @@ async def main(dev_mode=False, debug_mode=False):
             # Only start these services in production mode
             webhook_task = asyncio.create_task(start_webhook_server())
             alert_task = asyncio.create_task(start_alert_listener())
-            tasks = [webhook_task, alert_task]
+            tasks = [
+                webhook_task, alert_task,
+                asyncio.create_task(report_time_to_listening(webhook_task)),
+                asyncio.create_task(warm_up_clients(webhook_task)),
+            ]
             
             print("🚀 All systems started:")
             print("  📰 Scheduled news processing: Every hour")
@@ -277,6 +621,10 @@ async def main(dev_mode=False, debug_mode=False):
             print("  📰 Scheduled news processing: Every hour (console output only)")
             print("  🚨 Webhook & Telethon disabled in dev mode")
         
+        # The initial RSS cycle runs in the background instead of delaying the listeners
+        print("\n🔄 Running initial news processing in the background...")
+        tasks.append(asyncio.create_task(safe_fetch_process_and_send_news()))
+        
         # Main loop to keep all systems running
         while True:
             await asyncio.sleep(1)
@@ -284,9 +632,12 @@ async def main(dev_mode=False, debug_mode=False):
     except (KeyboardInterrupt, SystemExit):
         print("\n🛑 Shutting down...")
         scheduler.shutdown()
+        if supervisor_task:
+            supervisor_task.cancel()
+            stop_role_processes()
         
         # Cancel all tasks if they exist
-        if not dev_mode and tasks:
+        if tasks:
             for task in tasks:
                 task.cancel()
                 try:
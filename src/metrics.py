@@ -0,0 +1,183 @@
+"""
+Minimal in-process metrics registry with Prometheus text exposition.
+
+Recording is a dict lookup plus a bisect per observation, so it stays on in
+production. Values that already live elsewhere (queue depths, dedup sizes,
+cache stats) are pulled by collectors at scrape time instead of being pushed.
+"""
+import asyncio
+import functools
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+registry = {}  # metric name -> metric
+collectors = []  # callables run before each scrape
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    return repr(float(value)) if not isinstance(value, int) else str(value)
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        registry[name] = self
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in list(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.values[self._key(labels)] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self.values.get(key)
+        if series is None:
+            # Per-bucket counts (not cumulative) + overflow, sum, count
+            series = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, (counts, total, count) in list(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+def register_collector(func):
+    if func not in collectors:
+        collectors.append(func)
+    return func
+
+def render_metrics():
+    for collector in collectors:
+        try:
+            collector()
+        except Exception as e:
+            print(f"⚠️  Metrics collector {collector.__name__} failed: {e}")
+    lines = []
+    for metric in registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def timed(histogram, **labels):
+    """Decorator that observes the duration of a sync or async function."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.monotonic()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.monotonic() - start, **labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.monotonic() - start, **labels)
+        return wrapper
+    return decorator
+
+# --- Metrics shared across modules ---
+
+FEED_FETCH_SECONDS = Histogram("yoninews_feed_fetch_seconds", "RSS feed HTTP fetch time", ["feed"])
+FEED_PARSE_SECONDS = Histogram("yoninews_feed_parse_seconds", "RSS feed parse time", ["feed"])
+LLM_STAGE_SECONDS = Histogram(
+    "yoninews_llm_stage_seconds", "LLM pipeline stage time (rate, summarize, translate, ...)", ["stage"]
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "yoninews_llm_request_seconds", "Single LLM API call time per model", ["model", "kind", "outcome"]
+)
+TELEGRAM_SEND_SECONDS = Histogram(
+    "yoninews_telegram_send_seconds", "Bot API sendMessage attempt time per chat", ["chat", "outcome"]
+)
+ALERT_END_TO_END_SECONDS = Histogram(
+    "yoninews_alert_end_to_end_seconds", "Telethon alert message date to last send", ["channel"],
+    buckets=(0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 60, 120, 300)
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "yoninews_event_loop_lag_seconds", "Extra delay of a scheduled event loop wakeup",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+STARTUP_SECONDS = Gauge("yoninews_startup_seconds", "Process start until a component was ready", ["component"])
+LANGUAGE_DETECTIONS = Counter(
+    "yoninews_language_detections_total", "Source language decisions at ingest by how they were made", ["outcome", "lang"]
+)
+DEDUP_CHECKS = Counter("yoninews_dedup_checks_total", "Dedup/cache lookups by result", ["cache", "result"])
+QUEUE_DEPTH = Gauge("yoninews_queue_depth", "Items waiting in an internal queue", ["queue"])
+DEDUP_ENTRIES = Gauge("yoninews_dedup_entries", "Entries held by a dedup cache", ["cache"])
+CACHE_HIT_RATIO = Gauge("yoninews_cache_hit_ratio", "Hit ratio of a cache since start", ["cache"])
+
+@register_collector
+def collect_hit_ratios():
+    totals = {}
+    for (cache, result), count in DEDUP_CHECKS.values.items():
+        hits, checks = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (count if result == "hit" else 0), checks + count)
+    for cache, (hits, checks) in totals.items():
+        CACHE_HIT_RATIO.set(hits / checks if checks else 0.0, cache=cache)
+
+# --- Event loop lag ---
+
+LOOP_LAG_INTERVAL = 0.5
+loop_lag_task = None
+
+async def monitor_loop_lag(interval=LOOP_LAG_INTERVAL):
+    """Measures how late the loop wakes up from a fixed sleep."""
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, time.monotonic() - start - interval))
+
+def start_loop_lag_monitor():
+    global loop_lag_task
+    if loop_lag_task is None or loop_lag_task.done():
+        loop_lag_task = asyncio.create_task(monitor_loop_lag())
+    return loop_lag_task
@@ -0,0 +1,217 @@
+"""
+Multi-process mode (main.py --workers N or PROCESS_WORKERS=N).
+
+    ingest     Telethon listener, webhook server, RSS scheduler (the main process)
+    worker xN  LLM work: alert/news handlers, RSS rating and translation
+    delivery   Telegram sends: language groups, subscribers, ledger retries
+
+Functions decorated with @remote_task(queue) run wherever they're called in
+single-process mode. In multi-process mode, a call from a process that
+doesn't serve `queue` is stored in the durable task queue and awaited; the
+serving process runs it and writes back the JSON result. Callers see the
+same return values and exceptions (as RemoteTaskError) either way.
+"""
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import time
+
+from src import task_queue
+from src.config import (
+    WORKER_CONCURRENCY, DELIVERY_CONCURRENCY, TASK_POLL_INTERVAL, TASK_LEASE_SECONDS, set_runtime_config,
+)
+from src.metrics import QUEUE_DEPTH, register_collector
+from src.tracing import get_trace_parent, resume_trace
+
+PROCESSING = 'processing'
+DELIVERY = 'delivery'
+ROLE_QUEUES = {'ingest': None, 'worker': PROCESSING, 'delivery': DELIVERY}
+ROLE_CONCURRENCY = {'worker': WORKER_CONCURRENCY, 'delivery': DELIVERY_CONCURRENCY}
+MAINTENANCE_INTERVAL = 30
+LEASE_RENEW_INTERVAL = TASK_LEASE_SECONDS / 3  # A few missed heartbeats before the lease runs out
+
+process_role = None  # None = single-process mode
+remote_functions = {}  # task name -> undecorated function
+pending_results = {}  # task id -> future of the caller waiting for it
+result_poller_task = None
+running_tasks = set()  # ids of the tasks this process is running, kept leased by the heartbeat
+queue_depths = {}  # task queue -> {status: count}, refreshed by the supervisor for /metrics
+child_processes = {}  # process name -> (role, multiprocessing.Process)
+
+class RemoteTaskError(Exception):
+    pass
+
+def set_process_role(role):
+    global process_role
+    process_role = role
+
+def is_multiprocess():
+    return process_role is not None
+
+def remote_task(queue, priority=0):
+    """
+    Lets a coroutine function run in the process serving `queue`. Arguments and
+    results must be JSON-serializable. priority may be a callable taking the
+    call's arguments; lower numbers are claimed first.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        remote_functions[name] = func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if process_role is None or ROLE_QUEUES[process_role] == queue:
+                return await func(*args, **kwargs)
+            task_priority = priority(*args, **kwargs) if callable(priority) else priority
+            return await call_remote(queue, name, args, kwargs, task_priority)
+        return wrapper
+    return decorator
+
+async def call_remote(queue, name, args, kwargs, priority=0):
+    payload = json.dumps({"args": args, "kwargs": kwargs, "trace": get_trace_parent()}, ensure_ascii=False, default=str)
+    task_id = await asyncio.to_thread(task_queue.put_task, queue, name, payload, priority)
+    future = asyncio.get_running_loop().create_future()
+    pending_results[task_id] = future
+    _ensure_result_poller()
+    try:
+        return await future
+    finally:
+        pending_results.pop(task_id, None)
+
+def _ensure_result_poller():
+    global result_poller_task
+    if result_poller_task is None or result_poller_task.done():
+        result_poller_task = asyncio.create_task(_poll_results())
+
+async def _poll_results():
+    """One batched query per tick resolves every finished task this process is waiting on."""
+    while pending_results:
+        await asyncio.sleep(TASK_POLL_INTERVAL)
+        for row in await asyncio.to_thread(task_queue.get_finished, list(pending_results)):
+            future = pending_results.pop(row['id'], None)
+            if future is None or future.done():
+                continue
+            if row['status'] == task_queue.DONE:
+                future.set_result(json.loads(row['result']))
+            else:
+                future.set_exception(RemoteTaskError(row['error']))
+
+# --- Serving tasks (worker and delivery processes) ---
+
+async def _run_task(task, slots):
+    running_tasks.add(task['id'])
+    try:
+        func = remote_functions.get(task['name'])
+        if func is None:
+            raise RemoteTaskError(f"unknown task {task['name']}")
+        payload = json.loads(task['payload'])
+        with resume_trace(f"task.{task['name'].rsplit('.', 1)[-1]}", payload.get("trace"), task_id=task['id']):
+            result = await func(*payload["args"], **payload["kwargs"])
+        await asyncio.to_thread(task_queue.finish_task, task['id'], json.dumps(result, ensure_ascii=False, default=str))
+    except Exception as e:
+        print(f"❌ [Tasks] {task['name']} (#{task['id']}) failed: {e}")
+        await asyncio.to_thread(task_queue.fail_task, task['id'], f"{type(e).__name__}: {e}")
+    finally:
+        running_tasks.discard(task['id'])
+        slots.release()
+
+async def _renew_leases(worker_name):
+    """Keeps the leases of long-running tasks from expiring while this process is alive."""
+    while True:
+        await asyncio.sleep(LEASE_RENEW_INTERVAL)
+        try:
+            await asyncio.to_thread(task_queue.renew_leases, list(running_tasks), worker_name)
+        except Exception as e:
+            print(f"⚠️  [Tasks] Could not renew task leases: {e}")
+
+async def serve_tasks(queue, concurrency):
+    """Claims and runs tasks from `queue`, at most `concurrency` at a time, forever."""
+    worker_name = f"{process_role or 'single'}-{os.getpid()}"
+    slots = asyncio.Semaphore(concurrency)
+    next_maintenance = 0.0
+    print(f"🛠️  [Tasks] {worker_name} serving '{queue}' ({concurrency} at a time)")
+    heartbeat = asyncio.create_task(_renew_leases(worker_name))
+    try:
+        while True:
+            if time.monotonic() >= next_maintenance:
+                await asyncio.to_thread(task_queue.requeue_expired, TASK_LEASE_SECONDS)
+                await asyncio.to_thread(task_queue.prune_tasks)
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+            await slots.acquire()
+            task = await asyncio.to_thread(task_queue.claim_task, queue, worker_name)
+            if task is None:
+                slots.release()
+                await asyncio.sleep(TASK_POLL_INTERVAL)
+                continue
+            asyncio.create_task(_run_task(task, slots))
+    finally:
+        heartbeat.cancel()
+
+async def serve_role(role):
+    from src.tracing import start_trace_exporter
+    from src.loop_watchdog import start_loop_watchdog
+    start_trace_exporter()
+    start_loop_watchdog()
+    await serve_tasks(ROLE_QUEUES[role], ROLE_CONCURRENCY[role])
+
+def run_role(role, dev_mode=False, debug_mode=False):
+    """Entry point of a spawned worker or delivery process."""
+    set_runtime_config(dev_mode, debug_mode)
+    set_process_role(role)
+    import src.main  # noqa: F401 - registers every remote task
+    from src.subscribers import load_subscribers
+    load_subscribers()
+    try:
+        asyncio.run(serve_role(role))
+    except KeyboardInterrupt:
+        pass
+
+# --- Process management (ingest process) ---
+
+def _spawn(name, role, dev_mode, debug_mode):
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_role, args=(role, dev_mode, debug_mode), name=name, daemon=True
+    )
+    process.start()
+    child_processes[name] = (role, process)
+    return process
+
+def start_role_processes(workers, dev_mode=False, debug_mode=False):
+    """Makes this the ingest process and starts one delivery process plus `workers` processing workers."""
+    set_process_role('ingest')
+    _spawn("delivery", 'delivery', dev_mode, debug_mode)
+    for i in range(workers):
+        _spawn(f"worker-{i + 1}", 'worker', dev_mode, debug_mode)
+    print(f"🧩 Multi-process mode: 1 ingest, {workers} processing workers, 1 delivery process")
+    return child_processes
+
+async def supervise_processes(dev_mode=False, debug_mode=False, interval=5):
+    """Restarts child processes that exit (their claimed tasks are requeued after the lease) and refreshes queue_depths."""
+    global queue_depths
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            queue_depths = await asyncio.to_thread(task_queue.get_queue_depths)
+        except Exception as e:
+            print(f"⚠️  [Tasks] Could not read task queue depths: {e}")
+        for name, (role, process) in list(child_processes.items()):
+            if not process.is_alive():
+                print(f"⚠️  [Tasks] {name} exited with code {process.exitcode}, restarting")
+                _spawn(name, role, dev_mode, debug_mode)
+
+def stop_role_processes(timeout=5):
+    for _, process in child_processes.values():
+        process.terminate()
+    for _, process in child_processes.values():
+        process.join(timeout)
+    child_processes.clear()
+
+@register_collector
+def collect_task_queue_metrics():
+    # Depths come from the supervisor loop, so a scrape never waits on the task queue's lock
+    if process_role != 'ingest':
+        return
+    for queue in (PROCESSING, DELIVERY):
+        QUEUE_DEPTH.set(queue_depths.get(queue, {}).get(task_queue.QUEUED, 0), queue=f"task_{queue}")
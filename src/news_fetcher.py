@@ -1,10 +1,12 @@
-import feedparser
 from src.error_handler import handle_feed_error
-import requests
+from src.metrics import FEED_FETCH_SECONDS, FEED_PARSE_SECONDS
+import time
 
 @handle_feed_error
 def fetch_news(feed_url, limit=10):
     print(f"   Fetching from {feed_url}...")
+    import feedparser
+    import requests
     
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -12,11 +14,17 @@ def fetch_news(feed_url, limit=10):
     
     # Use requests to fetch the content with a timeout
     try:
-        response = requests.get(feed_url, headers=headers, timeout=15) # 15-second timeout
+        start = time.monotonic()
+        try:
+            response = requests.get(feed_url, headers=headers, timeout=15) # 15-second timeout
+        finally:
+            FEED_FETCH_SECONDS.observe(time.monotonic() - start, feed=feed_url)
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
         
         # Pass the content to feedparser
+        start = time.monotonic()
         feed = feedparser.parse(response.content)
+        FEED_PARSE_SECONDS.observe(time.monotonic() - start, feed=feed_url)
         
     except requests.exceptions.RequestException as e:
         print(f"Error using requests for {feed_url}: {e}")
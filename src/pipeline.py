@@ -0,0 +1,135 @@
+"""
+Small streaming pipeline: async stages connected by bounded queues.
+
+Each stage has its own worker count and turns one input item into zero or
+more output items, which move on as soon as they're produced - a slow item
+never holds back the items behind it in earlier stages. Each item carries the
+context it was produced in, so a trace started in one stage continues in the
+next.
+"""
+import asyncio
+import contextvars
+import time
+
+from src.metrics import Counter, Histogram
+
+PIPELINE_ITEMS = Counter("yoninews_pipeline_items_total", "Items entering/leaving a pipeline stage", ["pipeline", "stage", "direction"])
+PIPELINE_STAGE_SECONDS = Histogram("yoninews_pipeline_stage_seconds", "Time a stage spent on one item", ["pipeline", "stage"])
+
+_DONE = object()
+
+async def _run_in_context(func, item):
+    outputs = await func(item)
+    return outputs or [], contextvars.copy_context()
+
+class Stage:
+    def __init__(self, name, func, concurrency=1, queue_size=10, flush=None):
+        """
+        func(item) is async and returns a list of output items (may be empty).
+        flush(), if given, is async and runs once after the stage's last input;
+        its output items move on like func's (for stages that must see every
+        item before choosing, e.g. picking the best).
+        """
+        self.name = name
+        self.func = func
+        self.flush = flush
+        self.concurrency = concurrency
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = {"in": 0, "out": 0, "failed": 0, "busy": 0.0, "max_depth": 0, "first_out": None}
+
+class Pipeline:
+    def __init__(self, name, stages):
+        self.name = name
+        self.stages = stages
+        self.started_at = None
+
+    async def _worker(self, stage, next_stage):
+        stats = stage.stats
+        while True:
+            envelope = await stage.queue.get()
+            if envelope is _DONE:
+                return
+            item, context = envelope
+            stats["in"] += 1
+            PIPELINE_ITEMS.inc(pipeline=self.name, stage=stage.name, direction="in")
+            start = time.monotonic()
+            try:
+                # The task runs in a copy of the item's context; what the stage set there moves on with its outputs.
+                # context.run(create_task, ...) instead of create_task(context=), which needs Python 3.11
+                outputs, context = await context.run(asyncio.create_task, _run_in_context(stage.func, item))
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"❌ [{self.name}] Stage '{stage.name}' failed: {e}")
+                outputs = []
+            elapsed = time.monotonic() - start
+            stats["busy"] += elapsed
+            PIPELINE_STAGE_SECONDS.observe(elapsed, pipeline=self.name, stage=stage.name)
+            await self._emit(stage, next_stage, outputs, context)
+
+    async def _emit(self, stage, next_stage, outputs, context):
+        stats = stage.stats
+        for output in outputs:
+            stats["out"] += 1
+            if stats["first_out"] is None:
+                stats["first_out"] = time.monotonic() - self.started_at
+            PIPELINE_ITEMS.inc(pipeline=self.name, stage=stage.name, direction="out")
+            if next_stage:
+                await next_stage.queue.put((output, context))
+                next_stage.stats["max_depth"] = max(next_stage.stats["max_depth"], next_stage.queue.qsize())
+
+    async def _run_stage(self, stage, next_stage):
+        await asyncio.gather(*[self._worker(stage, next_stage) for _ in range(stage.concurrency)])
+        if stage.flush:
+            try:
+                outputs = await stage.flush() or []
+            except Exception as e:
+                stage.stats["failed"] += 1
+                print(f"❌ [{self.name}] Stage '{stage.name}' flush failed: {e}")
+                outputs = []
+            await self._emit(stage, next_stage, outputs, contextvars.copy_context())
+        # Upstream is finished: let every downstream worker know
+        if next_stage:
+            for _ in range(next_stage.concurrency):
+                await next_stage.queue.put(_DONE)
+
+    async def run(self, items):
+        """Feeds items into the first stage and waits until the last stage has drained."""
+        self.started_at = time.monotonic()
+        runners = [
+            asyncio.create_task(self._run_stage(stage, self.stages[i + 1] if i + 1 < len(self.stages) else None))
+            for i, stage in enumerate(self.stages)
+        ]
+        first = self.stages[0]
+        try:
+            for item in items:
+                await first.queue.put((item, contextvars.copy_context()))
+            for _ in range(first.concurrency):
+                await first.queue.put(_DONE)
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+        return self.get_stats()
+
+    def get_stats(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            stage.name: {
+                "in": stage.stats["in"],
+                "out": stage.stats["out"],
+                "failed": stage.stats["failed"],
+                "workers": stage.concurrency,
+                "busy_seconds": round(stage.stats["busy"], 2),
+                "max_queue_depth": stage.stats["max_depth"],
+                "items_per_sec": round(stage.stats["in"] / elapsed, 2) if elapsed else 0.0,
+                "first_output_after": round(stage.stats["first_out"], 2) if stage.stats["first_out"] is not None else None,
+            }
+            for stage in self.stages
+        }
+
+    def print_stats(self):
+        print(f"📊 [{self.name}] Stage throughput:")
+        for name, stats in self.get_stats().items():
+            first = f", first out after {stats['first_output_after']}s" if stats['first_output_after'] is not None else ""
+            print(f"   {name:10s} {stats['in']:3d} in → {stats['out']:3d} out, {stats['workers']} workers, "
+                  f"busy {stats['busy_seconds']}s, max queue {stats['max_queue_depth']}{first}")
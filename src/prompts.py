@@ -2,15 +2,11 @@
 AI Prompts for YoniNews Telegram Bot
 All prompts are stored here for easy maintenance and modification.
 """
+from src.languages import get_language_name
 
 def _get_language_name(source_lang_code):
     """Helper function to get language name from code."""
-    lang_map = {
-        'he': 'Hebrew',
-        'en': 'English', 
-        'es': 'Spanish'
-    }
-    return lang_map.get(source_lang_code, source_lang_code)
+    return get_language_name(source_lang_code, default=source_lang_code)
 
 
 
@@ -72,6 +68,25 @@ You are an emergency alert translator. Your job is to translate urgent security
 
 **TRANSLATED ALERT:**"""
 
+def get_alert_segments_translation_prompt(segments_json, target_language):
+    """Strict prompt for translating a list of alert segments (lines, area names, town names) one-to-one."""
+    return f"""
+You are an emergency alert translator. Translate each Hebrew segment of an emergency alert to {target_language.upper()}.
+
+RULES (STRICT):
+- Return exactly one translation per input segment, in the same order.
+- Preserve ALL location names, times, durations, numbers, emojis and warning symbols.
+- Town and area names: use the common {target_language} name, otherwise transliterate.
+- Do NOT merge, split, explain or comment on segments.
+ - Output ONLY valid JSON with this exact shape: {{"translations": ["...", "..."]}}
+- Do NOT include markdown code fences.
+
+SEGMENTS (JSON array):
+{segments_json}
+
+Respond ONLY with the JSON object.
+"""
+
 def get_generic_translation_prompt(text, source_language, target_language):
     """Returns a generic prompt for translating text."""
     return f"""
@@ -153,4 +168,81 @@ SOURCE:
 
 Respond ONLY with the JSON object.
 """
- 
\ No newline at end of file
+ 
+def get_structured_multi_translation_prompt(text, source_lang_code, target_lang_codes):
+    """Strict prompt for translating one text into several languages in one JSON response keyed by language code."""
+    source_lang_name = _get_language_name(source_lang_code)
+    targets = ", ".join(f"{_get_language_name(code)} ({code})" for code in target_lang_codes)
+    return f"""
+You are a precise translator.
+
+TASK: Translate from {source_lang_name} to each of: {targets}.
+
+RULES (STRICT):
+- Translate the SOURCE text independently into every listed language. Never mix languages within one translation.
+- Output ONLY the translation content. No headings, titles, bullet points, explanations, justifications, compliance/verification notes, or commentary.
+- Preserve names, numbers, quotes, and URLs exactly; keep tone neutral and concise.
+- Do NOT add emojis, markdown formatting, or visual separators (e.g., ---).
+- Output ONLY valid JSON with this exact shape: {{{", ".join(f'"{code}": "..."' for code in target_lang_codes)}}}
+- Do NOT include markdown code fences.
+- Do NOT include any text before or after the JSON object. Any extra content will be discarded.
+
+SOURCE:
+<TEXT>
+{text}
+</TEXT>
+
+Respond ONLY with the JSON object.
+"""
+
+def get_structured_digest_prompt(articles_block, target_language, max_items):
+    """Strict prompt for a JSON-only multi-article digest written directly in the target language."""
+    return f"""
+You are a professional news editor for YoniNews. Write a compact news digest in {target_language} from the articles below (they may be in different languages).
+
+RULES (STRICT):
+- One item per article, in the given order, at most {max_items} items.
+- Each item is ONE short factual sentence (max 30 words) written in {target_language}.
+- Preserve important names, locations, dates, and numbers.
+- Do NOT include headings, numbering, bullet symbols, explanations, reasoning, or commentary.
+- Do NOT add emojis, markdown, decorative symbols, or visual separators (e.g., ---).
+ - Output ONLY valid JSON with this exact shape: {{"items": ["...", "..."]}}
+- Do NOT include markdown code fences.
+- Do NOT include any text before or after the JSON object. Any extra content will be discarded.
+
+ARTICLES:
+<ARTICLES>
+{articles_block}
+</ARTICLES>
+
+Respond ONLY with the JSON object.
+"""
+
+def get_structured_batch_news_prompt(articles_block, source_lang_code, target_lang_codes):
+    """Strict prompt for summarizing several news messages and translating each summary in one JSON response."""
+    source_lang_name = _get_language_name(source_lang_code)
+    targets = ", ".join(f"{_get_language_name(code)} ({code})" for code in target_lang_codes)
+    keys = ", ".join(f'"{code}"' for code in [source_lang_code, *target_lang_codes])
+    return f"""
+You are a professional news summarizer and translator for YoniNews. The numbered messages below are in {source_lang_name}.
+
+TASK: For EACH message, in the given order, write a summary in {source_lang_name} ({source_lang_code}) and translate that summary to: {targets}.
+
+RULES (STRICT):
+- Exactly one entry per message, in the same order. Never merge or skip messages.
+- Each summary is 2-4 sentences, clear and factual.
+- Preserve important names, locations, dates, numbers, quotes, and URLs exactly.
+- Do NOT include headings, titles, bullet points, explanations, reasoning, or commentary of any kind.
+- Do NOT add emojis, markdown, decorative symbols, or visual separators (e.g., ---).
+- Each entry is an object keyed by language code: {keys}.
+- Output ONLY valid JSON with this exact shape: {{"items": [{{"{source_lang_code}": "...", ...}}, ...]}}
+- Do NOT include markdown code fences.
+- Do NOT include any text before or after the JSON object. Any extra content will be discarded.
+
+MESSAGES:
+<MESSAGES>
+{articles_block}
+</MESSAGES>
+
+Respond ONLY with the JSON object.
+"""
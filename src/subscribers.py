@@ -0,0 +1,70 @@
+"""
+Subscriber registry: which extra chats receive which languages and content types.
+
+Loaded from a JSON file (SUBSCRIBERS_FILE), for example:
+[
+    {"chat_id": "-1001234", "name": "Haifa region", "languages": ["he"], "content": ["alert"]},
+    {"chat_id": "@partner_news", "languages": ["en", "es"], "content": ["alert", "news"]}
+]
+"content" defaults to every content type. The bot and worker processes call
+load_subscribers() at startup.
+"""
+import json
+import os
+
+from src.config import SUBSCRIBERS_FILE
+
+CONTENT_TYPES = ('alert', 'news')
+
+subscribers = {}  # chat_id -> {"name", "languages", "content"}
+subscriber_index = {}  # (language, content_type) -> [chat_id, ...]
+change_listeners = []  # Called after every change to the subscriber list
+
+def _rebuild_index():
+    global subscriber_index
+    index = {}
+    for chat_id, subscriber in subscribers.items():
+        for lang in subscriber['languages']:
+            for content_type in subscriber['content']:
+                index.setdefault((lang, content_type), []).append(chat_id)
+    subscriber_index = index
+    for listener in change_listeners:
+        listener()
+
+def add_subscriber(chat_id, languages, content=CONTENT_TYPES, name=None):
+    subscribers[str(chat_id)] = {
+        "name": name or str(chat_id),
+        "languages": list(languages),
+        "content": [c for c in content if c in CONTENT_TYPES],
+    }
+    _rebuild_index()
+
+def remove_subscriber(chat_id):
+    if subscribers.pop(str(chat_id), None):
+        _rebuild_index()
+
+def load_subscribers(path=None):
+    path = path or SUBSCRIBERS_FILE
+    subscribers.clear()
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+            for entry in entries:
+                subscribers[str(entry['chat_id'])] = {
+                    "name": entry.get('name') or str(entry['chat_id']),
+                    "languages": list(entry.get('languages', [])),
+                    "content": [c for c in entry.get('content', CONTENT_TYPES) if c in CONTENT_TYPES],
+                }
+            print(f"👥 Loaded {len(subscribers)} subscriber chats from {path}")
+        except Exception as e:
+            print(f"❌ Could not load subscribers from {path}: {e}")
+    _rebuild_index()
+    return len(subscribers)
+
+def get_subscriber_chats(language_code, content_type):
+    return subscriber_index.get((language_code, content_type), [])
+
+def get_subscribed_languages(content_type=None):
+    return {lang for lang, kind in subscriber_index if content_type is None or kind == content_type}
+
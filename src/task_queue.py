@@ -0,0 +1,193 @@
+"""
+Durable task queue shared by the processes of multi-process mode.
+
+One SQLite table holds every task: queued -> running (claimed by a worker) ->
+done (with a JSON result) | failed (with an error). Claiming is a single
+UPDATE, so two workers can never take the same task. Tasks left running by a
+crashed process are requeued once their lease expires (a live worker renews
+the lease of the tasks it is running); the delivery ledger keeps a re-run
+from posting twice.
+
+The connection is shared across threads so async callers can run these
+functions in asyncio.to_thread; a lock serializes its use.
+
+A second table records processed message ids, so duplicate checks hold
+across processes.
+"""
+import sqlite3
+import threading
+import time
+
+from src.config import TASK_QUEUE_PATH
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_connection = None
+_lock = threading.RLock()
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(TASK_QUEUE_PATH, timeout=10, check_same_thread=False)
+        _connection.row_factory = sqlite3.Row
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                claimed_at REAL,
+                finished_at REAL
+            )
+        """)
+        _connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (queue, status, priority, id)"
+        )
+        _connection.execute("""
+            CREATE TABLE IF NOT EXISTS processed (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            )
+        """)
+        _connection.commit()
+    return _connection
+
+def put_task(queue, name, payload, priority=0):
+    with _lock:
+        conn = _get_connection()
+        cursor = conn.execute(
+            "INSERT INTO tasks (queue, name, payload, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (queue, name, payload, priority, QUEUED, time.time())
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+def claim_task(queue, worker):
+    """Takes the next queued task (lowest priority number, then oldest), or returns None."""
+    with _lock:
+        conn = _get_connection()
+        row = conn.execute(
+            """UPDATE tasks SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1
+               WHERE id = (
+                   SELECT id FROM tasks WHERE queue = ? AND status = ? ORDER BY priority, id LIMIT 1
+               )
+               RETURNING id, name, payload, attempts""",
+            (RUNNING, worker, time.time(), queue, QUEUED)
+        ).fetchone()
+        conn.commit()
+        return dict(row) if row else None
+
+def finish_task(task_id, result):
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+            (DONE, result, time.time(), task_id)
+        )
+        conn.commit()
+
+def fail_task(task_id, error):
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "UPDATE tasks SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), task_id)
+        )
+        conn.commit()
+
+def renew_leases(task_ids, worker):
+    """Heartbeat: moves claimed_at forward on the tasks `worker` is still running."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    with _lock:
+        conn = _get_connection()
+        renewed = 0
+        for i in range(0, len(task_ids), 500):  # Stay under SQLite's parameter limit
+            chunk = task_ids[i:i + 500]
+            renewed += conn.execute(
+                f"""UPDATE tasks SET claimed_at = ?
+                    WHERE id IN ({','.join('?' * len(chunk))}) AND status = ? AND worker = ?""",
+                (time.time(), *chunk, RUNNING, worker)
+            ).rowcount
+        conn.commit()
+        return renewed
+
+def get_finished(task_ids):
+    """Rows of the given tasks that are done or failed."""
+    with _lock:
+        rows = []
+        task_ids = list(task_ids)
+        conn = _get_connection()
+        for i in range(0, len(task_ids), 500):  # Stay under SQLite's parameter limit
+            chunk = task_ids[i:i + 500]
+            rows.extend(conn.execute(
+                f"""SELECT id, status, result, error FROM tasks
+                    WHERE id IN ({','.join('?' * len(chunk))}) AND status IN (?, ?)""",
+                (*chunk, DONE, FAILED)
+            ).fetchall())
+        return [dict(row) for row in rows]
+
+def requeue_expired(lease, max_attempts=3):
+    """Puts tasks whose worker stopped answering back in the queue (or fails them after max_attempts)."""
+    with _lock:
+        cutoff = time.time() - lease
+        conn = _get_connection()
+        failed = conn.execute(
+            "UPDATE tasks SET status = ?, error = ?, finished_at = ? WHERE status = ? AND claimed_at < ? AND attempts >= ?",
+            (FAILED, "lease expired too many times", time.time(), RUNNING, cutoff, max_attempts)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE tasks SET status = ?, worker = NULL WHERE status = ? AND claimed_at < ?",
+            (QUEUED, RUNNING, cutoff)
+        ).rowcount
+        conn.commit()
+        if requeued or failed:
+            print(f"♻️  [Tasks] Requeued {requeued} expired tasks, gave up on {failed}")
+        return requeued
+
+def get_queue_depths():
+    with _lock:
+        rows = _get_connection().execute(
+            "SELECT queue, status, COUNT(*) AS count FROM tasks WHERE status IN (?, ?) GROUP BY queue, status",
+            (QUEUED, RUNNING)
+        ).fetchall()
+        depths = {}
+        for row in rows:
+            depths.setdefault(row['queue'], {QUEUED: 0, RUNNING: 0})[row['status']] = row['count']
+        return depths
+
+def mark_processed(key):
+    with _lock:
+        conn = _get_connection()
+        conn.execute("INSERT OR REPLACE INTO processed (key, created_at) VALUES (?, ?)", (key, time.time()))
+        conn.commit()
+
+def is_processed(key):
+    with _lock:
+        return _get_connection().execute("SELECT 1 FROM processed WHERE key = ?", (key,)).fetchone() is not None
+
+def prune_tasks(max_age=60 * 60, processed_max_age=24 * 60 * 60):
+    with _lock:
+        now = time.time()
+        conn = _get_connection()
+        cursor = conn.execute(
+            "DELETE FROM tasks WHERE status IN (?, ?) AND finished_at < ?", (DONE, FAILED, now - max_age)
+        )
+        conn.execute("DELETE FROM processed WHERE created_at < ?", (now - processed_max_age,))
+        conn.commit()
+        if cursor.rowcount > 0:
+            print(f"🧹 [Tasks] Pruned {cursor.rowcount} finished tasks")
+        return cursor.rowcount
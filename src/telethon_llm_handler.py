@@ -3,14 +3,17 @@ This file contains the specialized, hardened LLM processing logic
 for the Telethon News Flow. It is kept separate to avoid impacting
 the primary RSS and Alert flows.
 """
-import asyncio
 import json
 
-from src.llm_handler import get_completion, get_language_name
-from src.prompts import get_structured_news_summary_prompt, get_structured_translation_prompt
+from src.llm_handler import get_completion_async, get_language_name, translate_text_to_languages
+from src.config import BULK_LLM_BATCH_SIZE
+from src.destinations import get_target_languages
+from src.metrics import LLM_STAGE_SECONDS, timed
+from src.prompts import get_structured_news_summary_prompt, get_structured_translation_prompt, get_structured_batch_news_prompt
 
 # --- Hardened processing path for Telethon News Flow ---
 
+@timed(LLM_STAGE_SECONDS, stage="summarize")
 async def summarize_news_content_telethon(news_text, source_lang_code):
     """A hardened version of summarize_news_content for the Telethon flow."""
     prompt = get_structured_news_summary_prompt(news_text, source_lang_code)
@@ -25,7 +28,7 @@ async def summarize_news_content_telethon(news_text, source_lang_code):
         }
     }
     try:
-        response = get_completion(prompt, response_format=response_format)
+        response = await get_completion_async(prompt, response_format=response_format)
         if not response:
             print("❌ [Telethon] News summarization failed - all models unavailable")
             return None
@@ -40,6 +43,7 @@ async def summarize_news_content_telethon(news_text, source_lang_code):
         print(f"❌ [Telethon] Error summarizing news (structured): {e}")
         return None
 
+@timed(LLM_STAGE_SECONDS, stage="translate")
 async def translate_text_immediately_telethon(text, source_language_code, target_language_code):
     """A hardened version of translate_text_immediately for the Telethon flow."""
     source_language_name = get_language_name(source_language_code)
@@ -56,7 +60,7 @@ async def translate_text_immediately_telethon(text, source_language_code, target
         }
     }
     try:
-        response = get_completion(prompt, response_format=response_format)
+        response = await get_completion_async(prompt, response_format=response_format)
         if not response:
             print(f"❌ [Telethon] Translation to {target_language_name} failed - all models unavailable")
             return None
@@ -71,8 +75,11 @@ async def translate_text_immediately_telethon(text, source_language_code, target
         print(f"❌ [Telethon] Error translating text to {target_language_name} (structured): {e}")
         return None
 
-async def summarize_and_translate_news_telethon(news_text, source_lang_code):
-    """Orchestrator for the hardened Telethon news processing pipeline."""
+async def summarize_and_translate_news_telethon(news_text, source_lang_code, target_langs=None):
+    """
+    Orchestrator for the hardened Telethon news processing pipeline.
+    target_langs defaults to the languages that have news destinations.
+    """
     print(f"📝 [Telethon] Summarizing {get_language_name(source_lang_code)} news content (hardened path)...")
     summarized_content = await summarize_news_content_telethon(news_text, source_lang_code)
     
@@ -85,20 +92,76 @@ async def summarize_and_translate_news_telethon(news_text, source_lang_code):
     print("🔄 [Telethon] Translating summary to all languages (hardened path)...")
     
     translations = {source_lang_code: summarized_content}
-    target_langs = {'he', 'en', 'es'} - {source_lang_code}
-    tasks = []
+    if target_langs is None:
+        target_langs = get_target_languages('news', source_lang_code)
+    # Chunked multi-language calls; the hardened single translator covers what they miss
+    translated = await translate_text_to_languages(
+        summarized_content, source_lang_code, target_langs, translate_single=translate_text_immediately_telethon
+    )
     for lang in target_langs:
-        task = translate_text_immediately_telethon(summarized_content, source_lang_code, lang)
-        tasks.append((lang, task))
-    
-    if tasks:
-        results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-        for i, (lang, _) in enumerate(tasks):
-            result = results[i]
-            # Only add successful translations, skip None results
-            if result and not isinstance(result, Exception):
-                translations[lang] = result
-            else:
-                print(f"❌ [Telethon] Skipping {get_language_name(lang)} - translation failed")
+        if lang in translated:
+            translations[lang] = translated[lang]
+        elif lang != source_lang_code:
+            print(f"❌ [Telethon] Skipping {get_language_name(lang)} - translation failed")
             
     return translations
+
+@timed(LLM_STAGE_SECONDS, stage="batch_news")
+async def summarize_and_translate_news_batch_telethon(news_texts, source_lang_code, target_langs=None):
+    """
+    Summarizes and translates several news messages of one source language with
+    one LLM call per BULK_LLM_BATCH_SIZE messages. Returns one translations dict
+    per message ({} when it failed). A chunk whose response doesn't line up is
+    retried message by message with the single-item pipeline.
+    """
+    if target_langs is None:
+        target_langs = get_target_languages('news', source_lang_code)
+    lang_codes = [source_lang_code, *sorted(set(target_langs) - {source_lang_code})]
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "news_batch", "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {code: {"type": "string"} for code in lang_codes},
+                            "required": lang_codes, "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["items"], "additionalProperties": False
+            }
+        }
+    }
+
+    results = []
+    for start in range(0, len(news_texts), BULK_LLM_BATCH_SIZE):
+        chunk = news_texts[start:start + BULK_LLM_BATCH_SIZE]
+        articles_block = "\n\n".join(f"[{i}]\n{text}" for i, text in enumerate(chunk, 1))
+        prompt = get_structured_batch_news_prompt(articles_block, source_lang_code, lang_codes[1:])
+        items = None
+        try:
+            response = await get_completion_async(prompt, response_format=response_format)
+            if response:
+                items = json.loads(response).get("items")
+        except Exception as e:
+            print(f"❌ [Telethon] Error in batch news processing (structured): {e}")
+
+        if not isinstance(items, list) or len(items) != len(chunk):
+            print(f"⚠️  [Telethon] Batch of {len(chunk)} news messages failed, processing one by one")
+            for text in chunk:
+                results.append(await summarize_and_translate_news_telethon(text, source_lang_code, lang_codes[1:]))
+            continue
+
+        for item in items:
+            translations = {code: (item.get(code) or "").strip() for code in lang_codes}
+            if not translations[source_lang_code]:
+                print("❌ [Telethon] Empty summary in batch response")
+                results.append({})
+                continue
+            results.append({code: text for code, text in translations.items() if text})
+    return results
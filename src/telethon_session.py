@@ -0,0 +1,169 @@
+"""
+In-memory Telethon session (TELETHON_SESSION_MODE=memory, the default).
+
+TELEGRAM_SESSION_DATA - the base64 .session file from setup_telethon_session.py,
+or a Telethon StringSession string - is decoded straight into a StringSession,
+entity cache included. Nothing is written to disk on (re)connect, the update
+path never touches SQLite, and the same session object is reused across
+reconnects so resolved channels stay cached.
+
+A background task snapshots the auth data and entity cache to
+TELETHON_SNAPSHOT_PATH, off the event loop and only when something changed.
+The next start restores from the snapshot if it was taken from the same
+TELEGRAM_SESSION_DATA, so channels resolved last run need no network lookups.
+The snapshot holds the auth key: it is written owner-only and ignored by git.
+
+Telethon has no public API for entity cache rows (process_entities() takes TL
+objects from updates), so restoring and snapshotting read and fill the private
+MemorySession._entities set of (id, hash, username, phone, name) rows. Check
+it still has that shape when upgrading Telethon.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from src.config import TELEGRAM_SESSION_DATA, TELETHON_SNAPSHOT_PATH, TELETHON_SNAPSHOT_INTERVAL
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+session = None
+last_snapshot = None  # (session string, entity rows) last written or restored
+snapshot_task = None
+
+def _session_data_fingerprint():
+    return hashlib.sha256((TELEGRAM_SESSION_DATA or "").encode()).hexdigest()[:16]
+
+def _read_sqlite_session(session_bytes):
+    """(dc_id, server_address, port, auth_key, entity rows) from a Telethon .session file's bytes."""
+    conn = sqlite3.connect(":memory:")
+    temp_path = None
+    try:
+        if hasattr(conn, "deserialize"):
+            conn.deserialize(session_bytes)
+        else:
+            # Python < 3.11: sqlite3 can only open it from a file
+            conn.close()
+            with tempfile.NamedTemporaryFile(suffix=".session", delete=False) as f:
+                f.write(session_bytes)
+                temp_path = f.name
+            conn = sqlite3.connect(temp_path)
+        dc_id, server_address, port, auth_key = conn.execute(
+            "SELECT dc_id, server_address, port, auth_key FROM sessions"
+        ).fetchone()
+        entities = conn.execute("SELECT id, hash, username, phone, name FROM entities").fetchall()
+        return dc_id, server_address, port, auth_key, entities
+    finally:
+        conn.close()
+        if temp_path:
+            os.remove(temp_path)
+
+def _session_from_env():
+    from telethon.sessions import StringSession
+    from telethon.crypto import AuthKey
+    try:
+        session_bytes = base64.b64decode(TELEGRAM_SESSION_DATA, validate=True)
+    except ValueError:
+        session_bytes = b""
+    if not session_bytes.startswith(SQLITE_HEADER):
+        return StringSession(TELEGRAM_SESSION_DATA.strip())
+    dc_id, server_address, port, auth_key, entities = _read_sqlite_session(session_bytes)
+    restored = StringSession()
+    restored.set_dc(dc_id, server_address, port)
+    restored.auth_key = AuthKey(data=auth_key)
+    restored._entities.update(tuple(row) for row in entities)
+    return restored
+
+def _session_from_snapshot():
+    global last_snapshot
+    from telethon.sessions import StringSession
+    if not os.path.exists(TELETHON_SNAPSHOT_PATH):
+        return None
+    with open(TELETHON_SNAPSHOT_PATH, encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get("source") != _session_data_fingerprint():
+        print("🔑 Telethon session snapshot is from other session data, ignoring it")
+        return None
+    restored = StringSession(state["session"])
+    restored._entities.update(tuple(row) for row in state["entities"])
+    last_snapshot = _snapshot_state(restored)
+    return restored
+
+def get_session():
+    """The process-wide in-memory session, restored on first use. Blocking (reads the snapshot)."""
+    global session
+    if session is not None:
+        return session
+    try:
+        session = _session_from_snapshot()
+        if session is not None:
+            print(f"🔑 Telethon session restored from snapshot ({len(session._entities)} cached entities)")
+    except Exception as e:
+        print(f"⚠️  Could not read Telethon session snapshot {TELETHON_SNAPSHOT_PATH}: {e}")
+    if session is None:
+        session = _session_from_env()
+        print(f"🔑 Telethon session restored in memory from environment variable ({len(session._entities)} cached entities)")
+    return session
+
+def _snapshot_state(snapshot_session):
+    # Copied on the event loop: Telethon adds entities from the update handlers
+    return snapshot_session.save(), frozenset(snapshot_session._entities)
+
+def _write_snapshot(state):
+    session_string, entities = state
+    temp_path = f"{TELETHON_SNAPSHOT_PATH}.tmp"
+    # The snapshot holds the auth key, so only the owner may read it
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({
+            "source": _session_data_fingerprint(),
+            "saved_at": time.time(),
+            "session": session_string,
+            "entities": sorted(entities, key=lambda row: row[0]),
+        }, f, ensure_ascii=False)
+    os.replace(temp_path, TELETHON_SNAPSHOT_PATH)
+
+async def save_session_snapshot():
+    """Writes the snapshot in a worker thread if the session changed since the last one."""
+    global last_snapshot
+    if session is None or not session.auth_key:
+        return False
+    state = _snapshot_state(session)
+    if state == last_snapshot:
+        return False
+    await asyncio.to_thread(_write_snapshot, state)
+    last_snapshot = state
+    return True
+
+async def run_session_snapshots(interval=None):
+    while True:
+        await asyncio.sleep(interval or TELETHON_SNAPSHOT_INTERVAL)
+        try:
+            await save_session_snapshot()
+        except Exception as e:
+            print(f"⚠️  Could not snapshot Telethon session: {e}")
+
+def start_session_snapshots():
+    global snapshot_task
+    if snapshot_task is None or snapshot_task.done():
+        snapshot_task = asyncio.create_task(run_session_snapshots())
+    return snapshot_task
+
+async def warm_entity_cache(client, channels):
+    """Caches the input entity (access hash) of every configured channel, then snapshots it."""
+    cached = 0
+    for channel in channels:
+        try:
+            await client.get_input_entity(channel['entity'])
+            cached += 1
+        except Exception as e:
+            print(f"⚠️  Could not cache entity for @{channel['key']}: {e}")
+    print(f"🗂️  Entity cache warm: {cached}/{len(channels)} channels")
+    try:
+        await save_session_snapshot()
+    except Exception as e:
+        print(f"⚠️  Could not snapshot Telethon session: {e}")
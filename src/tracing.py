@@ -0,0 +1,212 @@
+"""
+Lightweight tracing for alerts and news items.
+
+A trace starts at ingest (Telethon update, webhook request, RSS entry) and the
+current span travels in a context variable through the handlers, LLM calls and
+Telegram sends. Finished spans are buffered and exported off the event loop as
+JSON lines (TRACE_EXPORT_PATH) and/or OTLP/HTTP JSON (TRACE_OTLP_ENDPOINT).
+
+Alerts are always sampled; everything else at TRACE_SAMPLE_RATE. Tracing is off
+unless an exporter is configured, and unsampled spans cost a context lookup.
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.config import TRACE_EXPORT_PATH, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE
+
+TRACING_ENABLED = bool(TRACE_EXPORT_PATH or TRACE_OTLP_ENDPOINT)
+SERVICE_NAME = "yoninews-bot"
+
+current_span = contextvars.ContextVar("current_span", default=None)
+finished_spans = deque(maxlen=10000)  # Oldest spans are dropped if the exporter falls behind
+exporter_task = None
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "status", "sampled")
+
+    def __init__(self, trace_id, parent_id, name, attributes, sampled=True):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.sampled = sampled
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((self.end - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    """Stands in for spans of unsampled traces so callers never need to check."""
+    sampled = False
+    trace_id = None
+
+    def set(self, **attributes):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+@contextmanager
+def _activate(span):
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        if span.sampled:
+            span.status = "error"
+            span.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current_span.reset(token)
+        if span.sampled:
+            span.end = time.time()
+            finished_spans.append(span)
+
+def _new_root_span(name, kind, attributes):
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    sampled = kind == 'alert' or random.random() < TRACE_SAMPLE_RATE
+    if not sampled:
+        return NOOP_SPAN
+    return Span(os.urandom(16).hex(), None, name, {"kind": kind, **attributes})
+
+def start_trace(name, kind, **attributes):
+    """Starts a new trace at an ingest point. Alerts are always sampled."""
+    return _activate(_new_root_span(name, kind, attributes))
+
+def begin_trace(name, kind, **attributes):
+    """
+    Like start_trace, but the span stays current in this context until
+    end_span() - for traces that continue across pipeline stages.
+    """
+    root = _new_root_span(name, kind, attributes)
+    current_span.set(root)
+    return root
+
+def end_span(span_to_end):
+    if span_to_end.sampled and span_to_end.end is None:
+        span_to_end.end = time.time()
+        finished_spans.append(span_to_end)
+
+def span(name, **attributes):
+    """Child span of the current span; a no-op outside a sampled trace."""
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return _activate(parent or NOOP_SPAN)
+    return _activate(Span(parent.trace_id, parent.span_id, name, attributes))
+
+def get_current_span():
+    return current_span.get() or NOOP_SPAN
+
+def get_trace_parent():
+    """[trace_id, span_id] of the current sampled span, to hand the trace to another process."""
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return None
+    return [parent.trace_id, parent.span_id]
+
+def resume_trace(name, trace_parent, **attributes):
+    """Continues a trace handed over with get_trace_parent()."""
+    if not TRACING_ENABLED or not trace_parent:
+        return _activate(NOOP_SPAN)
+    trace_id, parent_id = trace_parent
+    return _activate(Span(trace_id, parent_id, name, attributes))
+
+def traced(name):
+    """Decorator that wraps an async function in a child span."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# --- Export ---
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_payload(spans):
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "yoninews"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(int(span.start * 1e9)),
+                    "endTimeUnixNano": str(int(span.end * 1e9)),
+                    "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                    "status": {"code": 2 if span.status == "error" else 1},
+                } for span in spans],
+            }],
+        }]
+    }
+
+def export_finished_spans():
+    """Writes out everything buffered so far. Blocking - run it in a thread."""
+    spans = []
+    while finished_spans:
+        spans.append(finished_spans.popleft())
+    if not spans:
+        return 0
+
+    if TRACE_EXPORT_PATH:
+        with open(TRACE_EXPORT_PATH, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+    if TRACE_OTLP_ENDPOINT:
+        import requests
+        response = requests.post(TRACE_OTLP_ENDPOINT, json=_otlp_payload(spans), timeout=5)
+        response.raise_for_status()
+    return len(spans)
+
+async def run_trace_exporter(interval=2):
+    while True:
+        await asyncio.sleep(interval)
+        if not finished_spans:
+            continue
+        try:
+            await asyncio.to_thread(export_finished_spans)
+        except Exception as e:
+            print(f"⚠️  Could not export trace spans: {e}")
+
+def start_trace_exporter():
+    global exporter_task
+    if TRACING_ENABLED and (exporter_task is None or exporter_task.done()):
+        exporter_task = asyncio.create_task(run_trace_exporter())
+        print(f"🔭 Tracing on (sample rate {TRACE_SAMPLE_RATE:.0%}, alerts always): "
+              f"{TRACE_EXPORT_PATH or ''}{' + ' if TRACE_EXPORT_PATH and TRACE_OTLP_ENDPOINT else ''}{TRACE_OTLP_ENDPOINT or ''}")
+    return exporter_task
@@ -0,0 +1,141 @@
+"""
+Bounded priority work queues between the Telethon/webhook ingest and processing.
+
+Handlers only enqueue; separate worker pools drain the alert and news queues,
+so a flood of news can never starve alert processing. Lower priority numbers
+run first. Alerts wait for room when the queue is full, news is dropped after
+NEWS_ENQUEUE_TIMEOUT seconds.
+"""
+import asyncio
+import contextvars
+import itertools
+import time
+
+from src.config import ALERT_WORKERS, NEWS_WORKERS, ALERT_QUEUE_SIZE, NEWS_QUEUE_SIZE, NEWS_ENQUEUE_TIMEOUT
+
+ALERT_PRIORITY = 0
+NEWS_PRIORITY = 10
+
+queues = {}  # kind -> asyncio.PriorityQueue
+worker_tasks = {}  # kind -> [asyncio.Task]
+queue_stats = {}  # kind -> counters and lag numbers
+_sequence = itertools.count()  # Keeps FIFO order within a priority
+
+def _new_stats():
+    return {
+        "enqueued": 0,
+        "processed": 0,
+        "failed": 0,
+        "dropped": 0,
+        "last_lag": 0.0,
+        "max_lag": 0.0,
+        "total_lag": 0.0,
+    }
+
+def _get_queue(kind):
+    if kind not in queues:
+        size = ALERT_QUEUE_SIZE if kind == 'alert' else NEWS_QUEUE_SIZE
+        queues[kind] = asyncio.PriorityQueue(maxsize=size)
+        queue_stats[kind] = _new_stats()
+    return queues[kind]
+
+async def _worker(kind, worker_number):
+    queue = _get_queue(kind)
+    stats = queue_stats[kind]
+    while True:
+        priority, _, enqueued_at, func, args, kwargs, label, future, context = await queue.get()
+        lag = time.monotonic() - enqueued_at
+        stats["last_lag"] = lag
+        stats["max_lag"] = max(stats["max_lag"], lag)
+        stats["total_lag"] += lag
+        if lag > 5:
+            print(f"🐢 [Queue] {kind} job '{label}' waited {lag:.1f}s (depth {queue.qsize()})")
+        try:
+            # Run in (a copy of) the producer's context so its trace span carries over
+            result = await context.run(asyncio.create_task, func(*args, **kwargs))
+            stats["processed"] += 1
+            if future and not future.done():
+                future.set_result(result)
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"❌ [Queue] {kind} worker {worker_number} failed on '{label}': {e}")
+            if future and not future.done():
+                future.set_exception(e)
+        finally:
+            queue.task_done()
+
+def start_workers(scale=1):
+    """
+    Starts the alert and news worker pools (no-op if they're already running).
+    In multi-process mode the ingest process passes scale > 1: its workers only
+    wait on remote tasks, so it needs enough of them to keep every process busy.
+    """
+    for kind, count in (('alert', ALERT_WORKERS * scale), ('news', NEWS_WORKERS * scale)):
+        tasks = [task for task in worker_tasks.get(kind, []) if not task.done()]
+        _get_queue(kind)
+        for worker_number in range(len(tasks), count):
+            tasks.append(asyncio.create_task(_worker(kind, worker_number)))
+        worker_tasks[kind] = tasks
+    print(f"👷 Work queues ready: {len(worker_tasks['alert'])} alert workers, {len(worker_tasks['news'])} news workers")
+
+async def stop_workers():
+    for tasks in worker_tasks.values():
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    worker_tasks.clear()
+
+async def enqueue(kind, func, *args, priority=None, label=None, **kwargs):
+    """
+    Queues `await func(*args, **kwargs)` for the `kind` worker pool.
+    Returns a future with the job's result, or None if the job was dropped.
+    """
+    queue = _get_queue(kind)
+    stats = queue_stats[kind]
+    if priority is None:
+        priority = ALERT_PRIORITY if kind == 'alert' else NEWS_PRIORITY
+    future = asyncio.get_running_loop().create_future()
+    # Failures are already logged by the worker; callers that await still see them
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    item = (
+        priority, next(_sequence), time.monotonic(), func, args, kwargs, label or func.__name__, future,
+        contextvars.copy_context()
+    )
+
+    try:
+        if kind == 'alert':
+            # Alerts are never dropped - the producer waits for room instead
+            await queue.put(item)
+        else:
+            await asyncio.wait_for(queue.put(item), timeout=NEWS_ENQUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        stats["dropped"] += 1
+        print(f"🚫 [Queue] {kind} queue full ({queue.qsize()}), dropped '{label}'")
+        return None
+
+    stats["enqueued"] += 1
+    return future
+
+async def enqueue_alert(func, *args, **kwargs):
+    return await enqueue('alert', func, *args, **kwargs)
+
+async def enqueue_news(func, *args, **kwargs):
+    return await enqueue('news', func, *args, **kwargs)
+
+def get_queue_stats():
+    snapshot = {}
+    for kind, stats in queue_stats.items():
+        processed = stats["processed"] + stats["failed"]
+        snapshot[kind] = {
+            "depth": queues[kind].qsize(),
+            "capacity": queues[kind].maxsize,
+            "workers": len([task for task in worker_tasks.get(kind, []) if not task.done()]),
+            "enqueued": stats["enqueued"],
+            "processed": stats["processed"],
+            "failed": stats["failed"],
+            "dropped": stats["dropped"],
+            "last_lag": round(stats["last_lag"], 3),
+            "max_lag": round(stats["max_lag"], 3),
+            "avg_lag": round(stats["total_lag"] / processed, 3) if processed else 0.0,
+        }
+    return snapshot
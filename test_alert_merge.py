@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for merging Pikud HaOref alert bursts (src/alert_merge.py).
+Run with: python -m pytest -q test_alert_merge.py
+"""
+import pytest
+
+from src.alert_merge import parse_alert, format_alert, merge_alerts
+
+ROCKETS_1 = """🚨 ירי רקטות וטילים (24/6/2025) 10:45
+
+היכנסו למרחב המוגן
+
+אזור גולן דרום
+חוף גולן, צאלון"""
+
+ROCKETS_2 = """🚨 ירי רקטות וטילים (24/6/2025) 10:46
+
+היכנסו למרחב המוגן
+
+אזור גולן דרום
+צאלון, חוף גופרה
+
+אזור קו העימות
+מטולה"""
+
+AIRCRAFT = """🚨 חדירת כלי טיס עוין (24/6/2025) 10:45
+
+אזור קו העימות
+מטולה"""
+
+ENDED = """🚨 עדכון (24/6/2025) 10:50
+האירוע הסתיים"""
+
+def test_parse_alert():
+    alert = parse_alert(ROCKETS_1)
+    assert alert["header"] == "🚨 ירי רקטות וטילים (24/6/2025) 10:45"
+    assert alert["key"] == "🚨 ירי רקטות וטילים"
+    assert alert["body"] == ["היכנסו למרחב המוגן"]
+    assert alert["areas"] == {"אזור גולן דרום": ["חוף גולן", "צאלון"]}
+
+def test_format_round_trips():
+    assert format_alert(parse_alert(ROCKETS_1)) == ROCKETS_1
+
+@pytest.mark.parametrize("texts, expected_count", [
+    ([ROCKETS_1], 1),
+    ([ROCKETS_1, ROCKETS_2], 1),  # Same type: merged
+    ([ROCKETS_1, AIRCRAFT], 2),  # Different types stay apart
+    ([ROCKETS_1, AIRCRAFT, ROCKETS_2], 2),
+    ([ENDED, ENDED], 2),  # No areas: nothing to union, each kept
+    ([], 0),
+])
+def test_merge_groups_by_type(texts, expected_count):
+    assert len(merge_alerts(texts)) == expected_count
+
+def test_single_alert_is_returned_unchanged():
+    assert merge_alerts([ROCKETS_2]) == [ROCKETS_2]
+
+def test_merge_unions_areas_and_towns_in_first_seen_order():
+    merged = parse_alert(merge_alerts([ROCKETS_1, ROCKETS_2])[0])
+    assert merged["header"].endswith("10:46")  # Latest time
+    assert merged["body"] == ["היכנסו למרחב המוגן"]
+    assert merged["areas"] == {
+        "אזור גולן דרום": ["חוף גולן", "צאלון", "חוף גופרה"],
+        "אזור קו העימות": ["מטולה"],
+    }
+
+def test_merge_keeps_first_seen_type_order():
+    merged = merge_alerts([AIRCRAFT, ROCKETS_1, ROCKETS_2])
+    assert merged[0] == AIRCRAFT
+    assert parse_alert(merged[1])["key"] == "🚨 ירי רקטות וטילים"
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-channel catch-up watermark in src/channel_state.py.
+Run with: python -m pytest -q test_channel_state.py
+"""
+import json
+
+import pytest
+
+from src import channel_state
+
+def reset_state():
+    for state in (channel_state.last_message_ids, channel_state.done_above,
+                  channel_state.in_flight, channel_state.claimed_messages, channel_state.held_channels):
+        state.clear()
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    reset_state()
+    yield
+
+def claim_all(channel, message_ids):
+    for message_id in message_ids:
+        assert channel_state.claim_message(channel, message_id)
+
+@pytest.mark.parametrize("done_order, watermark, done_above", [
+    ([101, 102, 103, 104, 105], 105, set()),
+    ([105], 100, {105}),  # 101-104 still in flight
+    ([102, 105, 101], 102, {105}),
+    ([105, 104, 103, 102], 100, {102, 103, 104, 105}),
+    ([105, 104, 103, 102, 101], 105, set()),
+])
+def test_watermark_only_covers_contiguous_done_ids(done_order, watermark, done_above):
+    channel_state.mark_message_done("news", 100)
+    claim_all("news", range(101, 106))
+    for message_id in done_order:
+        channel_state.mark_message_done("news", message_id)
+    assert channel_state.get_last_message_id("news") == watermark
+    assert channel_state.done_above.get("news", set()) == done_above
+
+def test_claim_is_once_per_message():
+    assert channel_state.claim_message("alerts", 7)
+    assert not channel_state.claim_message("alerts", 7)
+
+def test_done_ids_below_watermark_are_ignored():
+    channel_state.mark_message_done("news", 50)
+    channel_state.mark_message_done("news", 40)
+    assert channel_state.get_last_message_id("news") == 50
+
+def test_crash_before_lower_id_is_done_replays_it(tmp_path):
+    path = str(tmp_path / "state.json")
+    channel_state.mark_message_done("alerts", 102)
+    claim_all("alerts", [103, 104, 105])
+    channel_state.mark_message_done("alerts", 105)
+    channel_state.mark_message_done("alerts", 104)
+    channel_state.save_channel_state(path)  # Crash here: 103 is still in flight
+
+    reset_state()  # Restart
+    channel_state.load_channel_state(path)
+
+    assert channel_state.get_last_message_id("alerts") == 102  # Catch-up starts after 102
+    assert channel_state.claim_message("alerts", 103)  # ... and replays 103
+    assert not channel_state.claim_message("alerts", 104)  # ... but not what was already done
+    assert not channel_state.claim_message("alerts", 105)
+    channel_state.mark_message_done("alerts", 103)
+    assert channel_state.get_last_message_id("alerts") == 105
+
+def test_watermark_holds_during_catch_up():
+    channel_state.mark_message_done("news", 100)
+    channel_state.hold_watermark("news")  # Catch-up of 101-104 starts
+    claim_all("news", [105])  # Live message, finishes before catch-up has claimed the gap
+    channel_state.mark_message_done("news", 105)
+    assert channel_state.get_last_message_id("news") == 100
+    claim_all("news", [101, 102, 103, 104])
+    channel_state.mark_message_done("news", 101)
+    channel_state.release_watermark("news")  # Pass done, 102-104 still in flight
+    assert channel_state.get_last_message_id("news") == 101
+    for message_id in (102, 103, 104):
+        channel_state.mark_message_done("news", message_id)
+    assert channel_state.get_last_message_id("news") == 105
+
+def test_loads_highest_id_state_files(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"news": 500}))
+    channel_state.load_channel_state(str(path))
+    assert channel_state.get_last_message_id("news") == 500
+    assert channel_state.done_above["news"] == set()
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the delivery ledger state transitions and the per-chat circuit breaker.
+Run with: python -m pytest -q test_delivery_ledger.py
+"""
+import time
+
+import pytest
+
+from src import delivery_ledger, circuit_breaker
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(delivery_ledger, "DELIVERY_LEDGER_PATH", str(tmp_path / "ledger.db"))
+    monkeypatch.setattr(delivery_ledger, "_connection", None)
+    yield delivery_ledger
+    if delivery_ledger._connection is not None:
+        delivery_ledger._connection.close()
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_BREAKER_COOLDOWN", 60)
+    for state in (circuit_breaker.chat_failures, circuit_breaker.open_until, circuit_breaker.probe_started):
+        state.clear()
+    return circuit_breaker
+
+def test_begin_delivery_creates_row_once(ledger):
+    key = ledger.delivery_key("hello", 1)
+    assert ledger.begin_delivery(key, 1, "hello", label="EN group") is None
+    existing = ledger.begin_delivery(key, 1, "hello", label="EN group")
+    assert existing["status"] == ledger.PENDING
+    assert existing["attempts"] == 0
+    assert existing["chat_id"] == "1"
+
+@pytest.mark.parametrize("transition, args, status, reason", [
+    ("mark_sent", (42,), delivery_ledger.SENT, None),
+    ("mark_unknown", ("timeout",), delivery_ledger.UNKNOWN, "timeout"),
+    ("mark_failed", ("Forbidden",), delivery_ledger.FAILED, "Forbidden"),
+    ("schedule_retry", ("rate limited", 0), delivery_ledger.PENDING, "rate limited"),
+])
+def test_transitions(ledger, transition, args, status, reason):
+    key = ledger.delivery_key("hello", 1)
+    ledger.begin_delivery(key, 1, "hello")
+    ledger.record_attempt(key)
+    getattr(ledger, transition)(key, *args)
+    row = ledger.get_delivery(key)
+    assert (row["status"], row["reason"], row["attempts"]) == (status, reason, 1)
+    if transition == "mark_sent":
+        assert row["message_id"] == 42
+
+def test_only_due_pending_rows_are_retried(ledger):
+    keys = {name: ledger.delivery_key(name, 1) for name in ("due", "later", "unknown")}
+    for name, key in keys.items():
+        ledger.begin_delivery(key, 1, name)
+    ledger.schedule_retry(keys["due"], "network", 0)
+    ledger.schedule_retry(keys["later"], "network", 3600)
+    ledger.mark_unknown(keys["unknown"], "timeout")
+    assert [row["key"] for row in ledger.get_due_retries(time.time() + 1)] == [keys["due"]]
+
+def test_prune_keeps_pending_rows(ledger):
+    sent, pending = ledger.delivery_key("sent", 1), ledger.delivery_key("pending", 1)
+    for key, text in ((sent, "sent"), (pending, "pending")):
+        ledger.begin_delivery(key, 1, text)
+    ledger.mark_sent(sent, 1)
+    assert ledger.prune_ledger(max_age=-1) == 1
+    assert ledger.get_delivery(sent) is None
+    assert ledger.get_delivery(pending) is not None
+
+def test_breaker_opens_after_threshold(breaker):
+    breaker.record_failure(1)
+    assert breaker.is_chat_available(1)
+    breaker.record_failure(1)
+    assert not breaker.is_chat_available(1)
+    assert breaker.seconds_until_available(1) > 0
+
+def test_breaker_half_open_allows_one_probe(breaker):
+    breaker.record_failure(1)
+    breaker.record_failure(1)
+    breaker.open_until[1] = time.time() - 1  # Cooldown over
+    assert breaker.is_chat_available(1)
+    assert not breaker.is_chat_available(1)  # Probe in flight
+    breaker.probe_started[1] -= 61  # Probe never reported back
+    assert breaker.is_chat_available(1)
+
+@pytest.mark.parametrize("outcome, available", [("record_success", True), ("record_failure", False)])
+def test_probe_outcome(breaker, outcome, available):
+    breaker.record_failure(1)
+    breaker.record_failure(1)
+    breaker.open_until[1] = time.time() - 1
+    assert breaker.is_chat_available(1)
+    getattr(breaker, outcome)(1)
+    assert breaker.is_chat_available(1) is available
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the RSS article journal (src/journal.py): replay, compaction and sync().
+Run with: python -m pytest -q test_journal.py
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src import journal
+
+ARTICLE = {"title": "Title", "link": "https://example.com/a", "summary": "Text", "extra": "not journaled"}
+
+@pytest.fixture
+def journal_file(tmp_path, monkeypatch):
+    path = tmp_path / "journal.jsonl"
+    monkeypatch.setattr(journal, "JOURNAL_PATH", str(path))
+    monkeypatch.setattr(journal, "JOURNAL_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(journal, "JOURNAL_COMPACT_THRESHOLD", 1000)
+    for name, value in (("recorded", 0), ("written", 0), ("records_on_disk", 0), ("loaded", False),
+                        ("flusher_task", None), ("compaction_task", None), ("io_lock", None)):
+        monkeypatch.setattr(journal, name, value)
+    for state in (journal.live_items, journal.buffer, journal.waiters):
+        state.clear()
+    return path
+
+def restart():
+    journal.live_items.clear()
+    journal.loaded = False
+    journal.records_on_disk = 0
+    return journal.load_journal()
+
+def write_lines(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+@pytest.mark.parametrize("steps, expected", [
+    ([], {"summary": None, "translations": {}, "sent": []}),
+    ([("summarized", {"summary": "S"})], {"summary": "S", "translations": {}, "sent": []}),
+    ([("translated", {"lang": "en", "text": "E"}), ("sent", {"lang": "en"}), ("sent", {"lang": "en"})],
+     {"summary": None, "translations": {"en": "E"}, "sent": ["en"]}),
+])
+def test_replay_rebuilds_unfinished_articles(journal_file, steps, expected):
+    records = [{"id": "a", "step": "selected", "ts": 1, "article": {"title": "Title"}, "rating": 8}]
+    records += [{"id": "a", "step": step, "ts": 2, **fields} for step, fields in steps]
+    write_lines(journal_file, records)
+    state = restart()["a"]
+    assert {key: state[key] for key in expected} == expected
+    assert state["rating"] == 8
+
+def test_replay_drops_done_articles_and_steps_without_selection(journal_file):
+    write_lines(journal_file, [
+        {"id": "a", "step": "selected", "ts": 1, "article": {}, "rating": 8},
+        {"id": "a", "step": "done", "ts": 2},
+        {"id": "b", "step": "summarized", "ts": 3, "summary": "orphan"},
+    ])
+    assert restart() == {}
+
+def test_replay_skips_torn_last_line(journal_file):
+    write_lines(journal_file, [{"id": "a", "step": "selected", "ts": 1, "article": {}, "rating": 8}])
+    with open(journal_file, "a", encoding="utf-8") as f:
+        f.write('{"id": "a", "step": "summ')
+    assert list(restart()) == ["a"]
+    assert journal.records_on_disk == 1
+
+def test_records_survive_restart_after_sync(journal_file):
+    async def run():
+        journal.record_selected("a", ARTICLE, 9)
+        journal.record("a", "summarized", summary="S")
+        journal.record_selected("b", ARTICLE, 7)
+        journal.record("b", "done")
+        await journal.sync()
+    asyncio.run(run())
+    items = restart()
+    assert list(items) == ["a"]
+    assert items["a"]["summary"] == "S"
+    assert "extra" not in items["a"]["article"]
+
+def test_compaction_keeps_one_snapshot_per_unfinished_article(journal_file):
+    async def run():
+        for item_id in ("a", "b", "c"):
+            journal.record_selected(item_id, ARTICLE, 8)
+            journal.record(item_id, "translated", lang="en", text=item_id.upper())
+        journal.record("b", "done")
+        await journal.sync()
+        journal.record("c", "sent", lang="en")  # Still buffered: the snapshot covers it
+        await journal.compact()
+        await journal.sync()
+    asyncio.run(run())
+    lines = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+    assert [(line["id"], line["step"]) for line in lines] == [("a", "snapshot"), ("c", "snapshot")]
+    items = restart()
+    assert items["a"]["translations"] == {"en": "A"}
+    assert items["c"]["sent"] == ["en"]
+
+def test_sync_waits_for_a_flush_in_progress(journal_file, monkeypatch):
+    release = threading.Event()
+    append = journal._append
+
+    def slow_append(lines):
+        release.wait(5)
+        append(lines)
+    monkeypatch.setattr(journal, "_append", slow_append)
+
+    async def run():
+        journal.record_selected("a", ARTICLE, 8)
+        while journal.buffer:  # Let the flusher take the record
+            await asyncio.sleep(0.005)
+        waiter = asyncio.create_task(journal.sync())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()  # The record is not on disk yet
+        release.set()
+        await asyncio.wait_for(waiter, 5)
+    asyncio.run(run())
+    assert journal_file.read_text(encoding="utf-8").count("\n") == 1
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for local source-language detection and per-channel learning (src/language_detect.py).
+Run with: python -m pytest -q test_language_detect.py
+"""
+from collections import Counter
+
+import pytest
+
+from src import language_detect
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    monkeypatch.setattr(language_detect, "LANGUAGE_DETECTION", True)
+    monkeypatch.setattr(language_detect, "LANGUAGE_LEARN_MIN_SAMPLES", 5)
+    language_detect.channel_languages.clear()
+    yield
+    language_detect.channel_languages.clear()
+
+@pytest.mark.parametrize("text, expected", [
+    ("ראש הממשלה נפגש היום עם שר הביטחון לדיון על המצב בצפון", 'he'),
+    ("The prime minister met with the defense minister today to discuss the situation in the north", 'en'),
+    ("El primer ministro se reunió hoy con el ministro de defensa para hablar de la situación en el norte", 'es'),
+    ("Le premier ministre a rencontré aujourd'hui le ministre de la défense pour discuter de la situation", 'fr'),
+    ("التقى رئيس الوزراء اليوم بوزير الدفاع لمناقشة الوضع في الشمال", 'ar'),
+    ("Премьер-министр сегодня встретился с министром обороны, чтобы обсудить ситуацию на севере", 'ru'),
+    ("בעדכון האחרון: https://example.com/news/2025/update #breaking @channel", 'he'),  # Links and tags don't count
+])
+def test_detect_language(text, expected):
+    lang, confidence = language_detect.detect_language(text)
+    assert lang == expected
+    assert confidence >= language_detect.MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", [None, "", "OK", "🚨🚨🚨", "https://example.com/a/very/long/link", "12:45 24/6"])
+def test_nothing_to_go_on(text):
+    assert language_detect.detect_language(text) == (None, 0.0)
+
+@pytest.mark.parametrize("detections, learned", [
+    ([], None),
+    (['en'] * 4, None),  # Below LANGUAGE_LEARN_MIN_SAMPLES
+    (['en'] * 5, 'en'),
+    (['en'] * 4 + ['es'], 'en'),  # 80% is LEARNED_SHARE exactly
+    (['en'] * 3 + ['es'] * 2, None),  # Mixed channel: nothing learned
+    (['es'] * 2 + ['en'] * 8, 'en'),
+])
+def test_learning(detections, learned):
+    for lang in detections:
+        language_detect.record_channel_language("news", lang)
+    assert language_detect.get_learned_language("news") == learned
+
+def test_counts_decay_so_a_channel_can_switch_language():
+    for _ in range(language_detect.MAX_CHANNEL_SAMPLES):
+        language_detect.record_channel_language("news", 'en')
+    assert language_detect.get_learned_language("news") == 'en'
+    language_detect.record_channel_language("news", 'es')  # Past MAX_CHANNEL_SAMPLES: counts are halved
+    assert language_detect.channel_languages["news"] == Counter({'en': 100})
+    for _ in range(250):
+        language_detect.record_channel_language("news", 'es')
+    assert language_detect.get_learned_language("news") == 'es'
+    assert sum(language_detect.channel_languages["news"].values()) <= language_detect.MAX_CHANNEL_SAMPLES
+
+ENGLISH = "The prime minister met with the defense minister today to discuss the situation in the north"
+SHORT = "OK"
+
+@pytest.mark.parametrize("text, learned, declared, expected", [
+    (ENGLISH, 'es', 'fr', 'en'),  # A confident detection beats everything
+    (SHORT, 'es', 'fr', 'es'),  # Too short: the channel's learned language
+    (SHORT, None, 'fr', 'fr'),  # Nothing learned: the declared language
+    (SHORT, None, None, 'he'),  # Nothing at all: the default
+])
+def test_precedence(text, learned, declared, expected):
+    if learned:
+        language_detect.channel_languages["news"] = Counter({learned: 10})
+    assert language_detect.resolve_source_language(text, "news", declared=declared, default='he') == expected
+
+def test_confident_detections_are_learned():
+    for _ in range(5):
+        language_detect.resolve_source_language(ENGLISH, "news", declared='es')
+    assert language_detect.resolve_source_language(SHORT, "news", declared='es') == 'en'
+
+@pytest.mark.parametrize("declared, expected", [('fr', 'fr'), (None, 'he')])
+def test_detection_off_trusts_the_declared_language(monkeypatch, declared, expected):
+    monkeypatch.setattr(language_detect, "LANGUAGE_DETECTION", False)
+    assert language_detect.resolve_source_language(ENGLISH, "news", declared=declared, default='he') == expected
+    assert language_detect.channel_languages == {}
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for task leases in the multi-process task queue (src/task_queue.py).
+Run with: python -m pytest -q test_task_queue.py
+"""
+import pytest
+
+from src import task_queue
+
+@pytest.fixture
+def tasks(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_queue, "TASK_QUEUE_PATH", str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(task_queue, "_connection", None)
+    yield task_queue
+    if task_queue._connection is not None:
+        task_queue._connection.close()
+
+def age_claims(tasks, seconds):
+    conn = tasks._get_connection()
+    conn.execute("UPDATE tasks SET claimed_at = claimed_at - ?", (seconds,))
+    conn.commit()
+
+def test_claim_takes_lowest_priority_then_oldest(tasks):
+    tasks.put_task("processing", "a", "{}", priority=1)
+    second = tasks.put_task("processing", "b", "{}", priority=0)
+    assert tasks.claim_task("processing", "w1")["id"] == second
+    assert tasks.claim_task("delivery", "w1") is None
+
+def test_expired_lease_is_requeued(tasks):
+    task_id = tasks.put_task("processing", "a", "{}")
+    tasks.claim_task("processing", "w1")
+    age_claims(tasks, 100)
+    assert tasks.requeue_expired(lease=60) == 1
+    assert tasks.claim_task("processing", "w2")["id"] == task_id
+
+@pytest.mark.parametrize("worker, renewed, requeued", [
+    ("w1", 1, 0),  # The heartbeat of the claiming worker keeps the task
+    ("w2", 0, 1),  # Another worker can't extend it
+])
+def test_renewed_lease_is_not_requeued(tasks, worker, renewed, requeued):
+    task_id = tasks.put_task("processing", "a", "{}")
+    tasks.claim_task("processing", "w1")
+    age_claims(tasks, 100)
+    assert tasks.renew_leases([task_id], worker) == renewed
+    assert tasks.requeue_expired(lease=60) == requeued
+
+def test_finished_tasks_are_not_renewed(tasks):
+    task_id = tasks.put_task("processing", "a", "{}")
+    tasks.claim_task("processing", "w1")
+    tasks.finish_task(task_id, "42")
+    assert tasks.renew_leases([task_id], "w1") == 0
+    assert tasks.get_finished([task_id]) == [{"id": task_id, "status": tasks.DONE, "result": "42", "error": None}]
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))